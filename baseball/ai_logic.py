@@ -1,15 +1,87 @@
 import random
-import itertools
-from typing import List, Tuple, Dict, Set
+import struct
+import sys
+import time
+import zlib
+from typing import List, NamedTuple, Tuple, Dict, Optional, Set
+
+import numpy as np
+from django.conf import settings
+
+from .feedback import (
+    STRATEGIES, FeedbackTable, anytime_guess, bitset_count, bitset_from_indices, bitset_from_mask, bitset_indices,
+    code_count, encode_result, full_bitset, get_feedback_table, minimax_guess, partition_counts,
+    partition_scores,
+    score_guess, select_best_guess,
+)
+from .hints import DigitOdds, accumulate_digit_odds, describe_odds, digit_odds
+from .openings import DEFAULT_DEPTH as OPENING_DEPTH, lookup_opening
+from .parallel import parallel_minimax_guess, should_parallelize
+from .symmetry import GuessCache, canonical_state, guess_representatives
+from .universe import feedback_codes, get_universe, uses_feedback_table
+
+DIFFICULTIES = ('easy', 'normal', 'hard', 'expert')
+
+# 스냅샷 형식: 버전, 자릿수, 난이도, 첫 추측, 플래그, 추측 기록, 후보 비트셋(zlib), 난수 상태
+# (버전 1은 플래그가 없고 비트셋을 압축하지 않음)
+SNAPSHOT_VERSION = 2
+_SNAPSHOT_HEADER = struct.Struct('<BBBB')
+_SNAPSHOT_FLAGS = struct.Struct('<B')
+_FLAG_ALLOW_REPEATS = 1
+_RNG_STATE = struct.Struct('<625IBd')
+
+# 정규화된 국면 -> 최소 최대 최적 추측 캐시 (작업자 프로세스의 모든 게임이 공유)
+guess_cache = GuessCache(getattr(settings, 'BASEBALL_AI_GUESS_CACHE_SIZE', 50000))
+GUESS_CACHE_MIN_WORK = 1_000_000  # (추측 수 x 후보 수)가 이보다 작으면 바로 탐색
+PRUNING_MIN_WORK = 1_000_000  # (추측 수 x 후보 수)가 이보다 작으면 동치 추측을 묶지 않고 전부 평가
+
+# 스트리밍 AI가 추측 하나를 고를 때 평가하는 정답 표본 / 추측 표본 크기
+STREAMING_SAMPLE_SECRETS = 2048
+STREAMING_SAMPLE_GUESSES = 512
+
+
+class SearchBudget(NamedTuple):
+    """난이도별 추측 탐색 예산 (None이면 제한 없음)"""
+    guesses: Optional[int]  # 한 턴에 평가하는 후보 풀 안 추측 표본 수 (풀 밖 숫자는 그 1/4)
+    samples: Optional[int]  # 그룹 크기를 셀 정답 표본 수
+    depth: Optional[int]    # 탐색으로 고르는 추측 수 - 이후에는 후보 풀에서 무작위로 고름
+
+
+# 난이도는 탐색 예산으로만 약해진다: 쉬움은 두 번째 추측까지만 아주 작은 표본으로 탐색하고
+# 그 뒤로는 남은 후보 중 무작위, 보통/어려움은 표본 크기만큼만 탐색하고 전문가만 전체 탐색
+# (스트리밍 AI는 자체 표본 크기와 예산 중 작은 값 사용)
+SEARCH_BUDGETS = {
+    'easy': SearchBudget(guesses=4, samples=16, depth=2),
+    'normal': SearchBudget(guesses=16, samples=64, depth=None),
+    'hard': SearchBudget(guesses=128, samples=512, depth=None),
+    'expert': SearchBudget(guesses=None, samples=None, depth=None),
+}
+
 
 class AdvancedAIPlayer:
     """고급 AI 플레이어 - Knuth 알고리즘 기반"""
     
-    def __init__(self, difficulty: str = 'normal'):
+    def __init__(self, difficulty: str = 'normal', strategy: Optional[str] = None,
+                 time_budget: Optional[float] = None):
         self.difficulty = difficulty
-        self.possible_numbers = set()
+        # 추측 선택 전략 (minimax: Knuth 최소 최대, expected/entropy: 제한 시간 내 기대 그룹 크기/엔트로피)
+        self.strategy = strategy or getattr(settings, 'BASEBALL_AI_STRATEGY', 'minimax')
+        if self.strategy not in STRATEGIES:
+            raise ValueError(f'알 수 없는 전략입니다: {self.strategy}')
+        self.time_budget = time_budget if time_budget is not None else getattr(
+            settings, 'BASEBALL_AI_TIME_BUDGET', None)
+        self.sample_size = getattr(settings, 'BASEBALL_AI_SAMPLE_SIZE', None)
+        self.budget = SEARCH_BUDGETS[difficulty]
+        # 게임별 난수 생성기 (스냅샷에 상태를 함께 저장)
+        self.rng = random.Random()
+        self.possible_numbers = []
         self.guess_history = []
-        self.candidate_pool = set()
+        # 후보 풀: 정규 순서(피드백 테이블) 기준 비트셋
+        self.candidate_bits = np.zeros(0, dtype=np.uint8)
+        # (추측 수, 숫자 확률) - 같은 라운드의 힌트 요청은 다시 계산하지 않음
+        self._digit_odds = None
+        # 요청 사이에 백그라운드에서 미리 계산 중인 작업 (speculation.PendingWork)
+        self.pending_work = None
         self.difficulty_multipliers = {
             'easy': 0.3,      # 30% 확률로 실수
             'normal': 0.1,    # 10% 확률로 실수
@@ -19,25 +91,19 @@ class AdvancedAIPlayer:
     
     def initialize_game(self, digit_count: int):
         """게임 초기화"""
-        self.digit_count = digit_count
-        self.possible_numbers = set()
         self.guess_history = []
+        self._digit_odds = None
+        self._attach_numbers(digit_count)
         
-        # 가능한 모든 숫자 조합 생성
-        numbers = list(range(10))
-        for combo in itertools.permutations(numbers, digit_count):
-            if combo[0] != 0:  # 첫 번째 숫자는 0이 될 수 없음
-                self.possible_numbers.add(''.join(map(str, combo)))
-        
-        self.candidate_pool = self.possible_numbers.copy()
+        self.candidate_bits = full_bitset(len(self.possible_numbers))
         
         # 난이도에 따른 초기 전략 설정
         if self.difficulty == 'easy':
             # 쉬운 난이도: 랜덤 시작
             self.first_guess = self._generate_random_guess()
         elif self.difficulty == 'normal':
-            # 보통 난이도: 123으로 시작
-            self.first_guess = '123'[:digit_count].ljust(digit_count, '0')
+            # 보통 난이도: 123으로 시작 (4자리 이상은 0, 4, 5...를 이어 붙임)
+            self.first_guess = '1230456789'[:digit_count]
         elif self.difficulty == 'hard':
             # 어려운 난이도: 최적화된 시작 숫자
             self.first_guess = self._get_optimal_first_guess(digit_count)
@@ -45,6 +111,12 @@ class AdvancedAIPlayer:
             # 전문가 난이도: Knuth 알고리즘의 최적 첫 번째 추측
             self.first_guess = self._get_knuth_optimal_guess(digit_count)
     
+    def _attach_numbers(self, digit_count: int):
+        """가능한 모든 숫자 조합 (첫 번째 숫자는 0이 될 수 없음) - 자릿수별 공유 테이블 사용"""
+        self.digit_count = digit_count
+        self.feedback_table = get_feedback_table(digit_count)
+        self.possible_numbers = self.feedback_table.numbers
+    
     def _get_optimal_first_guess(self, digit_count: int) -> str:
         """최적화된 첫 번째 추측 생성"""
         if digit_count == 3:
@@ -57,15 +129,8 @@ class AdvancedAIPlayer:
             return '1' + '0' * (digit_count - 1)
     
     def _get_knuth_optimal_guess(self, digit_count: int) -> str:
-        """Knuth 알고리즘 기반 최적 첫 번째 추측"""
-        if digit_count == 3:
-            return '112'  # Knuth의 최적 3자리 시작
-        elif digit_count == 4:
-            return '1123'  # 4자리 최적화
-        elif digit_count == 5:
-            return '11234'  # 5자리 최적화
-        else:
-            return self._get_optimal_first_guess(digit_count)
+        """Knuth 알고리즘 기반 최적 첫 번째 추측 - 전체 후보 중 최악의 그룹이 가장 작은 추측"""
+        return minimax_first_guess(self.feedback_table)
     
     def make_guess(self) -> str:
         """다음 추측 생성"""
@@ -74,59 +139,149 @@ class AdvancedAIPlayer:
             return self.first_guess
         
         # 난이도에 따른 실수 확률
-        if random.random() < self.difficulty_multipliers[self.difficulty]:
+        if self.rng.random() < self.difficulty_multipliers[self.difficulty]:
+            return self._generate_random_guess()
+        
+        # 탐색 깊이를 넘긴 뒤에는 남은 후보 중 아무 숫자나 (기록과 모순되지 않는 추측)
+        if self.budget.depth is not None and len(self.guess_history) >= self.budget.depth:
             return self._generate_random_guess()
         
         # Knuth 알고리즘 기반 최적 추측
         return self._get_optimal_guess()
     
+    def candidate_indices(self) -> np.ndarray:
+        """후보 풀의 정렬된 인덱스 배열"""
+        return bitset_indices(self.candidate_bits, len(self.possible_numbers))
+    
+    def pool_is_universe(self) -> bool:
+        """후보 풀이 아직 걸러지지 않은 공유 전체 비트셋인지"""
+        return self.candidate_bits is full_bitset(len(self.possible_numbers))
+    
+    def candidate_count(self) -> int:
+        """후보 풀 크기"""
+        return bitset_count(self.candidate_bits)
+    
+    def digit_odds(self) -> DigitOdds:
+        """현재 후보 풀의 자리별 숫자 확률 (라운드마다 한 번 계산)"""
+        if self._digit_odds is None or self._digit_odds[0] != len(self.guess_history):
+            self._digit_odds = (len(self.guess_history),
+                                digit_odds(self.feedback_table, self.candidate_indices()))
+        return self._digit_odds[1]
+    
     def _get_optimal_guess(self) -> str:
-        """Knuth 알고리즘 기반 최적 추측"""
-        if not self.candidate_pool:
+        """Knuth 알고리즘 기반 최적 추측 (후보 풀 전체에 대한 일괄 평가)"""
+        table = self.feedback_table
+        pool_indices = self.candidate_indices()
+        if not len(pool_indices):
             return self._generate_random_guess()
         
         # 후보 풀이 1개면 바로 반환
-        if len(self.candidate_pool) == 1:
-            return list(self.candidate_pool)[0]
+        if len(pool_indices) == 1:
+            return table.numbers[pool_indices[0]]
+        
+        # 예산이 있는 난이도는 표본 탐색 (오프닝 북/국면 캐시의 전체 탐색 결과는 쓰지 않음)
+        if self.budget.guesses is not None or self.budget.samples is not None:
+            return self._get_budgeted_guess(pool_indices)
+        
+        if self.strategy != 'minimax':
+            return self._get_anytime_guess(pool_indices)
+        
+        # 숫자 재명명/자리 순열로 같은 국면이 오프닝 북에 있거나 이미 계산했으면 그 추측을 되돌려 사용
+        # (탐색이 정규화보다 싼 작은 국면은 북 깊이 밖이면 정규화하지 않고, 캐시하지도 않음)
+        cacheable = len(pool_indices) * table.size >= GUESS_CACHE_MIN_WORK
+        state = None
+        if cacheable or len(self.guess_history) <= OPENING_DEPTH:
+            state = canonical_state(self.guess_history, self.digit_count)
+        if state:
+            book_guess = lookup_opening(self.digit_count, state)
+            if book_guess:
+                return book_guess
+        if state and cacheable:
+            cached_guess = guess_cache.get(state.key)
+            if cached_guess:
+                return state.symmetry.restore(cached_guess)
+        
+        guess_indices = self._guess_space(len(pool_indices))
+        
+        # 최소 최대 전략: 추측마다 피드백 코드를 모아 bincount 한 뒤 최대 그룹 크기 비교
+        # 평가량이 크면 추측 공간을 프로세스 풀에 나눠 평가 (결과는 직렬과 동일)
+        if should_parallelize(len(guess_indices), len(pool_indices)):
+            best_guess = table.numbers[parallel_minimax_guess(table, pool_indices, guess_indices)]
+        else:
+            best_guess = table.numbers[minimax_guess(table, pool_indices, guess_indices)]
+        
+        if state and cacheable:
+            guess_cache.put(state.key, state.symmetry.apply(best_guess))
+        return best_guess
+    
+    def _get_budgeted_guess(self, pool_indices: np.ndarray) -> str:
+        """탐색 예산만큼 뽑은 추측 표본 중 정답 표본을 가장 잘 나누는 추측"""
+        table = self.feedback_table
+        sampler = np.random.default_rng(self.rng.getrandbits(32))
+        secrets = sample_pool(sampler, pool_indices, self.budget.samples)
+        guesses = sample_guesses(sampler, pool_indices, table.size, self.budget.guesses)
+        scores = partition_scores(partition_counts(table, guesses, secrets), self.strategy)
+        return table.numbers[select_best_guess(guesses, scores, pool_indices)]
+    
+    def _get_anytime_guess(self, pool_indices: np.ndarray) -> str:
+        """기대 그룹 크기/엔트로피 전략 - 후보 풀 숫자부터, 그다음 풀 밖 숫자 표본을 제한 시간까지 평가"""
+        started = time.perf_counter()
+        table = self.feedback_table
+        shuffler = np.random.default_rng(self.rng.getrandbits(32))
+        
+        guess_space = self._guess_space(len(pool_indices))
+        in_pool = np.isin(guess_space, pool_indices, assume_unique=True)
+        outside = shuffler.permutation(guess_space[~in_pool])
+        if self.sample_size is not None:
+            outside = outside[:self.sample_size]
+        guess_order = np.concatenate([shuffler.permutation(guess_space[in_pool]), outside])
+        
+        deadline = started + self.time_budget if self.time_budget else None
+        return table.numbers[anytime_guess(table, pool_indices, guess_order, self.strategy, deadline)]
+    
+    def _guess_space(self, pool_size: int) -> np.ndarray:
+        """평가할 추측 인덱스 - 기록상 서로 바꿔도 같은 추측은 묶음마다 하나만 남김"""
+        table = self.feedback_table
+        if pool_size * table.size < PRUNING_MIN_WORK:
+            return np.arange(table.size)
+        return guess_representatives(table, self.guess_history)
+    
+    def _get_optimal_guess_reference(self) -> str:
+        """추측별 반복문 기반 최적 추측 (일괄 평가 결과 비교용 기준 구현)"""
+        table = self.feedback_table
+        pool_indices = self.candidate_indices().tolist()
+        if not pool_indices:
+            return self._generate_random_guess()
+        
+        if len(pool_indices) == 1:
+            return table.numbers[pool_indices[0]]
         
-        # 최소 최대 전략: 가장 많은 정보를 제공하는 추측 선택
         best_guess = None
         min_max_group_size = float('inf')
+        candidates = {table.numbers[i] for i in pool_indices}
         
-        # 모든 가능한 추측에 대해 평가
-        for guess in self.possible_numbers:
-            max_group_size = 0
-            group_counts = {}
+        # 모든 가능한 추측을 정규 순서로 평가
+        for guess_index, guess in enumerate(self.possible_numbers):
+            row = table.row(guess_index).tolist()
+            group_counts = [0] * table.code_count
+            
+            for candidate_index in pool_indices:
+                group_counts[row[candidate_index]] += 1
             
-            # 이 추측으로 가능한 모든 결과에 대해 그룹 크기 계산
-            for candidate in self.candidate_pool:
-                result = self._calculate_result(guess, candidate)
-                result_key = f"{result['strikes']}S{result['balls']}B"
-                
-                if result_key not in group_counts:
-                    group_counts[result_key] = 0
-                group_counts[result_key] += 1
-                
-                max_group_size = max(max_group_size, group_counts[result_key])
+            max_group_size = max(group_counts)
             
-            # 최대 그룹 크기가 가장 작은 추측 선택
-            if max_group_size < min_max_group_size:
+            # 최대 그룹 크기가 가장 작고, 동점이면 후보 풀 안의 숫자 우선
+            if (max_group_size < min_max_group_size or
+                    (max_group_size == min_max_group_size and
+                     guess in candidates and best_guess not in candidates)):
                 min_max_group_size = max_group_size
                 best_guess = guess
         
-        return best_guess if best_guess else list(self.candidate_pool)[0]
+        return best_guess if best_guess else table.numbers[pool_indices[0]]
     
     def _calculate_result(self, guess: str, secret: str) -> Dict[str, int]:
-        """스트라이크와 볼 계산"""
-        strikes = 0
-        balls = 0
-        
-        for i in range(len(guess)):
-            if guess[i] == secret[i]:
-                strikes += 1
-            elif guess[i] in secret:
-                balls += 1
-        
+        """스트라이크와 볼 계산 (피드백 테이블 조회)"""
+        strikes, balls = self.feedback_table.result(guess, secret)
         return {'strikes': strikes, 'balls': balls}
     
     def update_knowledge(self, guess: str, result: Dict[str, int]):
@@ -136,20 +291,20 @@ class AdvancedAIPlayer:
             'result': result
         })
         
-        # 후보 풀에서 불가능한 숫자 제거
-        impossible_numbers = set()
-        for candidate in self.candidate_pool:
-            candidate_result = self._calculate_result(guess, candidate)
-            if (candidate_result['strikes'] != result['strikes'] or 
-                candidate_result['balls'] != result['balls']):
-                impossible_numbers.add(candidate)
-        
-        self.candidate_pool -= impossible_numbers
+        # 후보 풀에서 결과가 다른 숫자 제거 (추측의 피드백 행과 한 번에 비교)
+        code = encode_result(result['strikes'], result['balls'], self.digit_count)
+        row = self.feedback_table.row_for_guess(guess)
+        self.candidate_bits = self.candidate_bits & bitset_from_mask(row == code)
     
     def _generate_random_guess(self) -> str:
         """랜덤 추측 생성"""
-        if self.candidate_pool:
-            return random.choice(list(self.candidate_pool))
+        if self.pool_is_universe():
+            # 전체 후보에서 뽑을 때는 비트셋을 풀지 않는다 (rng.choice와 같은 난수 소비)
+            return self.possible_numbers[self.rng.randrange(len(self.possible_numbers))]
+        
+        pool_indices = self.candidate_indices()
+        if len(pool_indices):
+            return self.possible_numbers[self.rng.choice(pool_indices)]
         
         # 후보 풀이 비어있으면 가능한 모든 숫자에서 선택
         numbers = list(range(1, 10))  # 0 제외
@@ -157,11 +312,11 @@ class AdvancedAIPlayer:
         
         for _ in range(self.digit_count):
             if numbers:
-                num = random.choice(numbers)
+                num = self.rng.choice(numbers)
                 result.append(str(num))
                 numbers.remove(num)
             else:
-                result.append(str(random.randint(0, 9)))
+                result.append(str(self.rng.randint(0, 9)))
         
         return ''.join(result)
     
@@ -210,22 +365,247 @@ class AdvancedAIPlayer:
             return "이 결과를 바탕으로 정답의 패턴을 분석해보세요."
     
     def _generate_expert_hint(self, guess: str, result: Dict[str, int]) -> str:
-        """전문가 난이도 힌트"""
+        """전문가 난이도 힌트 (후보 풀의 자리별 숫자 확률 요약 포함)"""
+        odds = describe_odds(self.digit_odds())
         if result['strikes'] == 0 and result['balls'] == 0:
-            return f"'{guess}'는 완전히 제외됩니다. 남은 후보 수: {len(self.candidate_pool)}개"
+            return f"'{guess}'는 완전히 제외됩니다. 남은 후보 수: {self.candidate_count()}개 ({odds})"
         elif result['strikes'] > 0:
-            return f"'{guess}'의 {result['strikes']}개 숫자는 정확합니다. 후보 풀 크기: {len(self.candidate_pool)}개"
+            return f"'{guess}'의 {result['strikes']}개 숫자는 정확합니다. 후보 풀 크기: {self.candidate_count()}개 ({odds})"
         elif result['balls'] > 0:
-            return f"'{guess}'의 {result['balls']}개 숫자는 포함됩니다. 후보 풀 크기: {len(self.candidate_pool)}개"
+            return f"'{guess}'의 {result['balls']}개 숫자는 포함됩니다. 후보 풀 크기: {self.candidate_count()}개 ({odds})"
         else:
-            return f"정보가 축적되었습니다. 후보 풀 크기: {len(self.candidate_pool)}개"
+            return f"정보가 축적되었습니다. 후보 풀 크기: {self.candidate_count()}개 ({odds})"
+    
+    def estimate_size(self) -> int:
+        """세션 저장소용 메모리 사용량 추정 (바이트, 공유 중인 전체 비트셋은 제외)"""
+        bits_size = 0 if self.pool_is_universe() else self.candidate_bits.nbytes
+        return (sys.getsizeof(self.__dict__) + bits_size
+                + _RNG_STATE.size + 400 * len(self.guess_history))
+    
+    def turn_count(self) -> int:
+        """지금까지 반영한 추측 수"""
+        return len(self.guess_history)
+    
+    def export_state(self) -> bytes:
+        """다른 작업자 프로세스에서 복원할 수 있는 압축 스냅샷"""
+        first_guess = self.first_guess.encode('ascii')
+        flags = _FLAG_ALLOW_REPEATS if getattr(self, 'allow_repeats', False) else 0
+        parts = [
+            _SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION, self.digit_count,
+                                  DIFFICULTIES.index(self.difficulty), len(first_guess)),
+            first_guess,
+            _SNAPSHOT_FLAGS.pack(flags),
+            struct.pack('<H', len(self.guess_history)),
+        ]
+        for entry in self.guess_history:
+            guess = entry['guess'].encode('ascii')
+            parts.append(struct.pack('<B', len(guess)) + guess)
+            parts.append(struct.pack('<BB', entry['result']['strikes'], entry['result']['balls']))
+        
+        # 긴 숫자 게임의 비트셋은 크지만 대부분 0이라 잘 압축된다
+        bits = zlib.compress(self.candidate_bits.tobytes(), 1)
+        parts.append(struct.pack('<I', len(bits)) + bits)
+        
+        _, internal_state, gauss_next = self.rng.getstate()
+        parts.append(_RNG_STATE.pack(*internal_state, gauss_next is not None, gauss_next or 0.0))
+        return b''.join(parts)
+    
+    @classmethod
+    def from_state(cls, data: bytes) -> 'AdvancedAIPlayer':
+        """스냅샷에서 AI 플레이어 복원"""
+        data = bytes(data)
+        version, digit_count, difficulty, first_guess_length = _SNAPSHOT_HEADER.unpack_from(data, 0)
+        if version not in (1, SNAPSHOT_VERSION):
+            raise ValueError(f'지원하지 않는 AI 스냅샷 버전입니다: {version}')
+        offset = _SNAPSHOT_HEADER.size
+        first_guess = data[offset:offset + first_guess_length].decode('ascii')
+        offset += first_guess_length
+        
+        flags = 0
+        if version >= 2:
+            (flags,) = _SNAPSHOT_FLAGS.unpack_from(data, offset)
+            offset += _SNAPSHOT_FLAGS.size
+        
+        allow_repeats = bool(flags & _FLAG_ALLOW_REPEATS)
+        if uses_feedback_table(digit_count, allow_repeats):
+            ai_player = AdvancedAIPlayer(DIFFICULTIES[difficulty])
+        else:
+            ai_player = StreamingAIPlayer(DIFFICULTIES[difficulty], allow_repeats=allow_repeats)
+        ai_player._attach_numbers(digit_count)
+        ai_player.first_guess = first_guess
+        
+        (history_length,) = struct.unpack_from('<H', data, offset)
+        offset += 2
+        for _ in range(history_length):
+            guess_length = data[offset]
+            guess = data[offset + 1:offset + 1 + guess_length].decode('ascii')
+            strikes, balls = struct.unpack_from('<BB', data, offset + 1 + guess_length)
+            offset += guess_length + 3
+            ai_player.guess_history.append({
+                'guess': guess,
+                'result': {'strikes': strikes, 'balls': balls}
+            })
+        
+        (bits_length,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        bits = data[offset:offset + bits_length]
+        if version >= 2:
+            bits = zlib.decompress(bits)
+        if ai_player.guess_history:
+            # 비트셋은 바꿔 끼우기만 하므로 읽기 전용 버퍼를 복사 없이 그대로 쓴다
+            ai_player.candidate_bits = np.frombuffer(bits, dtype=np.uint8)
+        else:
+            ai_player.candidate_bits = full_bitset(len(ai_player.possible_numbers))
+        offset += bits_length
+        
+        *internal_state, has_gauss, gauss_next = _RNG_STATE.unpack_from(data, offset)
+        ai_player.rng.setstate((3, tuple(internal_state), gauss_next if has_gauss else None))
+        return ai_player
+    
+    @staticmethod
+    def snapshot_turn_count(data: bytes) -> int:
+        """스냅샷을 전부 풀지 않고 반영된 추측 수만 읽기"""
+        data = bytes(data)
+        version, _, _, first_guess_length = _SNAPSHOT_HEADER.unpack_from(data, 0)
+        offset = _SNAPSHOT_HEADER.size + first_guess_length
+        if version >= 2:
+            offset += _SNAPSHOT_FLAGS.size
+        return struct.unpack_from('<H', data, offset)[0]
     
     def get_game_statistics(self) -> Dict[str, any]:
         """게임 통계 반환"""
         return {
             'difficulty': self.difficulty,
             'total_guesses': len(self.guess_history),
-            'candidate_pool_size': len(self.candidate_pool),
+            'candidate_pool_size': self.candidate_count(),
             'possible_numbers_size': len(self.possible_numbers),
             'efficiency': len(self.possible_numbers) / max(1, len(self.guess_history))
         }
+
+
+class StreamingAIPlayer(AdvancedAIPlayer):
+    """긴 숫자(6~10자리)와 숫자 중복 허용 게임용 AI
+    
+    피드백 테이블 대신 후보 목록(NumberUniverse)을 구간별로 풀어 후보 풀을 거르고,
+    추측은 후보 풀에서 뽑은 정답 표본에 대한 그룹 크기로 평가한다 (메모리는 비트셋 + 표본 크기).
+    """
+    
+    def __init__(self, difficulty: str = 'normal', strategy: Optional[str] = None,
+                 time_budget: Optional[float] = None, allow_repeats: bool = False):
+        super().__init__(difficulty, strategy=strategy, time_budget=time_budget)
+        self.allow_repeats = allow_repeats
+    
+    def _attach_numbers(self, digit_count: int):
+        """(자릿수, 중복 허용)별 공유 후보 목록 연결 - 숫자 목록은 만들지 않음"""
+        self.digit_count = digit_count
+        self.universe = get_universe(digit_count, self.allow_repeats)
+        self.possible_numbers = self.universe
+    
+    def _get_optimal_first_guess(self, digit_count: int) -> str:
+        """최적화된 첫 번째 추측 생성 (서로 다른 숫자를 최대한 많이)"""
+        return '1234567890'[:digit_count]
+    
+    def _get_knuth_optimal_guess(self, digit_count: int) -> str:
+        """중복 허용 게임은 숫자 하나를 겹친 추측(112, 1123, 11234), 아니면 서로 다른 숫자"""
+        if self.allow_repeats and digit_count <= 5:
+            return '11234'[:digit_count]
+        return self._get_optimal_first_guess(digit_count)
+    
+    def _calculate_result(self, guess: str, secret: str) -> Dict[str, int]:
+        strikes, balls = score_guess(guess, secret)
+        return {'strikes': strikes, 'balls': balls}
+    
+    def update_knowledge(self, guess: str, result: Dict[str, int]):
+        """추측 결과를 바탕으로 지식 업데이트 (후보 풀을 구간별로 풀어 거름)"""
+        self.guess_history.append({
+            'guess': guess,
+            'result': result
+        })
+        
+        code = encode_result(result['strikes'], result['balls'], self.digit_count)
+        guess_digits = np.array([[int(char) for char in guess]], dtype=np.int8)
+        kept = [indices[feedback_codes(guess_digits, digits)[0] == code]
+                for indices, digits in self.universe.chunks(self._pool_for_chunks())]
+        remaining = np.concatenate(kept) if kept else np.zeros(0, dtype=np.int64)
+        self.candidate_bits = bitset_from_indices(remaining, self.universe.size)
+    
+    def _pool_for_chunks(self) -> Optional[np.ndarray]:
+        """universe.chunks에 넘길 후보 인덱스 (걸러지지 않은 풀이면 None - 전체를 순서대로)"""
+        return None if self.pool_is_universe() else self.candidate_indices()
+    
+    def digit_odds(self) -> DigitOdds:
+        """현재 후보 풀의 자리별 숫자 확률 (라운드마다 한 번, 구간별로 누적)"""
+        if self._digit_odds is None or self._digit_odds[0] != len(self.guess_history):
+            chunks = (digits for _, digits in self.universe.chunks(self._pool_for_chunks()))
+            self._digit_odds = (len(self.guess_history), accumulate_digit_odds(chunks, self.digit_count))
+        return self._digit_odds[1]
+    
+    def _get_optimal_guess(self) -> str:
+        """후보 풀에서 뽑은 정답 표본을 가장 잘 나누는 추측 (동점이면 후보 풀 안의 숫자 우선)"""
+        universe = self.universe
+        pool_indices = self.candidate_indices()
+        if not len(pool_indices):
+            return self._generate_random_guess()
+        
+        if len(pool_indices) == 1:
+            return universe.number(pool_indices[0])
+        
+        sampler = np.random.default_rng(self.rng.getrandbits(32))
+        secrets = sample_pool(sampler, pool_indices,
+                              _within_budget(STREAMING_SAMPLE_SECRETS, self.budget.samples))
+        guesses = sample_guesses(sampler, pool_indices, universe.size,
+                                 _within_budget(STREAMING_SAMPLE_GUESSES, self.budget.guesses))
+        
+        codes = feedback_codes(universe.digits(guesses), universe.digits(secrets)).astype(np.int32)
+        codes_per_guess = code_count(self.digit_count)
+        codes += np.arange(len(guesses), dtype=np.int32)[:, None] * codes_per_guess
+        counts = np.bincount(codes.ravel(), minlength=len(guesses) * codes_per_guess)
+        scores = partition_scores(counts.reshape(len(guesses), codes_per_guess), self.strategy)
+        return universe.number(select_best_guess(guesses, scores, pool_indices))
+
+
+_first_guesses: Dict[int, str] = {}
+
+
+def minimax_first_guess(table: FeedbackTable) -> str:
+    """첫 추측 중 최악의 그룹이 가장 작은 추측 (자릿수별로 한 번만 계산 - 동치인 추측은 대표만 평가)"""
+    if table.digit_count not in _first_guesses:
+        guess_index = minimax_guess(table, np.arange(table.size), guess_representatives(table, []))
+        _first_guesses[table.digit_count] = table.numbers[guess_index]
+    return _first_guesses[table.digit_count]
+
+
+def sample_pool(sampler: np.random.Generator, pool_indices: np.ndarray,
+                size: Optional[int]) -> np.ndarray:
+    """후보 풀이 표본보다 크면 무작위로 size개 (중복 제거, size가 None이면 풀 전체)"""
+    if size is None or len(pool_indices) <= size:
+        return pool_indices
+    return np.unique(pool_indices[sampler.integers(0, len(pool_indices), size)])
+
+
+def sample_guesses(sampler: np.random.Generator, pool_indices: np.ndarray,
+                   universe_size: int, size: Optional[int]) -> np.ndarray:
+    """후보 풀에서 size개, 전체에서 size // 4개를 뽑은 추측 표본 (size가 None이면 전체)"""
+    if size is None:
+        return np.arange(universe_size)
+    return np.union1d(
+        sample_pool(sampler, pool_indices, size),
+        # 후보 풀 밖의 숫자도 조금 섞어 정보량이 큰 추측을 찾는다
+        sampler.integers(0, universe_size, size // 4)
+    )
+
+
+def _within_budget(size: int, limit: Optional[int]) -> int:
+    """표본 크기를 탐색 예산 이하로 제한"""
+    return size if limit is None else min(size, limit)
+
+
+def create_ai_player(difficulty: str, digit_count: int, allow_repeats: bool = False,
+                     **options) -> AdvancedAIPlayer:
+    """자릿수와 중복 허용 여부에 맞는 AI 플레이어를 만들어 게임 초기화"""
+    if uses_feedback_table(digit_count, allow_repeats):
+        ai_player = AdvancedAIPlayer(difficulty, **options)
+    else:
+        ai_player = StreamingAIPlayer(difficulty, allow_repeats=allow_repeats, **options)
+    ai_player.initialize_game(digit_count)
+    return ai_player
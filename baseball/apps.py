@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class BaseballConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'baseball'
+
+    def ready(self):
+        # 미리 계산한 오프닝 북과 전문가 정답 순위표를 올려 둔다
+        from .hard_secrets import load_all_hard_secrets
+        from .openings import load_all_opening_books
+        load_all_opening_books()
+        load_all_hard_secrets()
@@ -0,0 +1,81 @@
+from typing import Dict, List, NamedTuple, Optional
+
+import numpy as np
+from django.conf import settings
+
+from .feedback import FeedbackTable, partition_counts
+from .symmetry import GuessCache, canonical_state, guess_classes
+
+
+class GuessRanking(NamedTuple):
+    """한 국면에서 모든 합법 추측의 점수 분포 (점수 = 그룹 크기 제곱합 = 기대 그룹 크기 x 후보 수)"""
+    scores: np.ndarray      # 서로 다른 점수 (오름차순)
+    cumulative: np.ndarray  # 그 점수 이하인 추측 수
+    best_worst_case: int
+    pool_size: int
+
+    @property
+    def total(self) -> int:
+        return int(self.cumulative[-1])
+
+    def rank(self, score: int) -> int:
+        """점수가 더 좋은(작은) 추측 수 + 1 (동점은 같은 순위)"""
+        position = int(np.searchsorted(self.scores, score, side='left'))
+        return 1 + (int(self.cumulative[position - 1]) if position else 0)
+
+
+# 정규화된 국면 -> GuessRanking (작업자 프로세스의 모든 게임이 공유, 첫 턴 국면은 자릿수마다 하나)
+ranking_cache = GuessCache(getattr(settings, 'BASEBALL_GUESS_RANKING_CACHE_SIZE', 256))
+
+
+def build_ranking(table: FeedbackTable, pool_indices: np.ndarray, guess_history: List[Dict]) -> GuessRanking:
+    """모든 합법 추측을 후보 풀에 대해 평가 - 대칭으로 같은 추측은 대표만 평가하고 묶음 크기만큼 센다"""
+    representatives, sizes = guess_classes(table, guess_history)
+    counts = partition_counts(table, representatives, pool_indices).astype(np.int64)
+    squares = (counts * counts).sum(axis=1)
+
+    scores, inverse = np.unique(squares, return_inverse=True)
+    cumulative = np.cumsum(np.bincount(inverse, weights=sizes).astype(np.int64))
+    return GuessRanking(scores, cumulative, int(counts.max(axis=1).min()), len(pool_indices))
+
+
+def get_ranking(table: FeedbackTable, pool_indices: np.ndarray, guess_history: List[Dict]) -> GuessRanking:
+    """국면별 추측 점수 분포 (정규화한 국면으로 캐시 - 대칭인 국면은 분포가 같음)"""
+    state = canonical_state(guess_history, table.digit_count)
+    if state:
+        key = state.key
+    else:
+        key = (table.digit_count, tuple(sorted(
+            (entry['guess'], entry['result']['strikes'], entry['result']['balls']) for entry in guess_history
+        )))
+
+    ranking = ranking_cache.get(key)
+    if ranking is None:
+        ranking = build_ranking(table, pool_indices, guess_history)
+        ranking_cache.put(key, ranking)
+    return ranking
+
+
+def score_guess_quality(table: FeedbackTable, pool_indices: np.ndarray, guess_history: List[Dict],
+                        guess: str, ranking: Optional[GuessRanking] = None) -> Optional[Dict]:
+    """사람의 추측이 지금 후보 풀을 얼마나 잘 나누는지 - 최악/기대 그룹 크기와 모든 합법 추측 중 순위
+
+    ranking은 이 국면의 점수 분포를 미리 계산해 두었을 때 넘긴다 (없으면 여기서 조회/계산).
+    """
+    if not len(pool_indices):
+        return None
+
+    if ranking is None:
+        ranking = get_ranking(table, pool_indices, guess_history)
+    counts = np.bincount(table.row_for_guess(guess)[pool_indices], minlength=table.code_count).astype(np.int64)
+    score = int((counts * counts).sum())
+    pool_size = len(pool_indices)
+    return {
+        'poolSize': pool_size,
+        'worstCase': int(counts.max()),
+        'expectedSize': score / pool_size,
+        'rank': ranking.rank(score),
+        'legalGuesses': ranking.total,
+        'bestWorstCase': ranking.best_worst_case,
+        'bestExpectedSize': float(ranking.scores[0]) / pool_size,
+    }
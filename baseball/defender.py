@@ -0,0 +1,56 @@
+import zlib
+from typing import Iterable, NamedTuple
+
+import numpy as np
+
+from .feedback import (
+    FeedbackTable, bitset_from_mask, bitset_indices, decode_result, full_bitset, score_guess,
+)
+
+
+class DefenderAnswer(NamedTuple):
+    """악당 수비의 답과 답한 뒤 남은 정답 후보"""
+    strikes: int
+    balls: int
+    pool_bits: np.ndarray
+    pool_size: int
+
+
+def initial_pool(table: FeedbackTable) -> bytes:
+    """모든 숫자가 정답 후보인 수비 상태"""
+    return pack_pool(full_bitset(table.size))
+
+
+def pack_pool(pool_bits: np.ndarray) -> bytes:
+    """후보 비트셋을 DB 저장용 바이트로 (zlib)"""
+    return zlib.compress(pool_bits.tobytes(), 1)
+
+
+def unpack_pool(data: bytes) -> np.ndarray:
+    """DB에 저장한 수비 상태를 후보 비트셋으로"""
+    return np.frombuffer(zlib.decompress(bytes(data)), dtype=np.uint8)
+
+
+def answer_guess(table: FeedbackTable, pool_bits: np.ndarray, guess: str) -> DefenderAnswer:
+    """정답을 정하지 않고, 추측의 피드백 그룹 중 후보가 가장 많이 남는 그룹으로 답함 (Absurdle 방식)
+
+    동점이면 피드백 코드가 작은 쪽(스트라이크, 그다음 볼이 적은 답)을 고른다. 맞힘 코드는
+    가장 크므로 남은 후보가 추측한 숫자 하나뿐일 때만 선택된다.
+    """
+    pool_mask = np.unpackbits(pool_bits, count=table.size).astype(bool)
+    row = table.row_for_guess(guess)
+    counts = np.bincount(row[pool_mask], minlength=table.code_count)
+    code = int(counts.argmax())
+    strikes, balls = decode_result(code, table.digit_count)
+    return DefenderAnswer(strikes, balls, bitset_from_mask(pool_mask & (row == code)), int(counts[code]))
+
+
+def commit_secret(table: FeedbackTable, pool_bits: np.ndarray) -> str:
+    """게임이 끝날 때 공개할 정답 - 남은 후보 중 정규 순서로 가장 앞선 숫자 (지금까지의 모든 답과 일치)"""
+    return table.numbers[int(bitset_indices(pool_bits, table.size)[0])]
+
+
+def verify_answers(secret: str, guesses: Iterable) -> bool:
+    """공개한 정답으로 기록된 추측(BaseballGuess)을 다시 채점해 모든 답이 맞는지 확인 (감사용)"""
+    return all(score_guess(guess.guess_number, secret) == (guess.strikes, guess.balls)
+               for guess in guesses)
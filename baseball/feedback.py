@@ -0,0 +1,313 @@
+import itertools
+import threading
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from .universe import TABLE_MAX_DIGITS
+
+# 전체 피드백 행렬을 미리 만들어 둘 최대 크기 (바이트, int8 기준)
+# 4자리(4536 x 4536 ≈ 20MB)까지는 행렬 전체를, 5자리 이상은 행 단위로 계산한다.
+FULL_MATRIX_LIMIT = 32 * 1024 * 1024
+
+# 한 번에 계산하는 (추측 x 정답) 블록의 최대 원소 수
+BLOCK_ELEMENTS = 1 << 22
+
+# 0~1023 (10비트 숫자 마스크)의 비트 수
+_POPCOUNT = np.array([bin(i).count('1') for i in range(1 << 10)], dtype=np.int8)
+
+
+def encode_result(strikes: int, balls: int, digit_count: int) -> int:
+    """(스트라이크, 볼)을 int8 피드백 코드로 변환"""
+    return strikes * (digit_count + 1) + balls
+
+
+def decode_result(code: int, digit_count: int) -> Tuple[int, int]:
+    """피드백 코드를 (스트라이크, 볼)로 변환"""
+    strikes, balls = divmod(int(code), digit_count + 1)
+    return strikes, balls
+
+
+def code_count(digit_count: int) -> int:
+    """가능한 피드백 코드 수"""
+    return (digit_count + 1) ** 2
+
+
+def score_guess(guess: str, secret: str) -> Tuple[int, int]:
+    """스트라이크와 볼 계산 (테이블 밖의 숫자용 기본 구현)"""
+    strikes = 0
+    balls = 0
+
+    for i in range(len(guess)):
+        if guess[i] == secret[i]:
+            strikes += 1
+        elif guess[i] in secret:
+            balls += 1
+
+    return strikes, balls
+
+
+class FeedbackTable:
+    """자릿수별 스트라이크/볼 피드백 테이블
+
+    첫 자리가 0이 아닌 중복 없는 숫자를 사전 순으로 나열한 것을 정규 순서로 삼고,
+    (추측 인덱스, 정답 인덱스) 쌍마다 int8 피드백 코드를 제공한다.
+    모든 게임이 공유하므로 만든 뒤에는 바꾸지 않는다 (배열은 읽기 전용).
+    """
+
+    def __init__(self, digit_count: int):
+        self.digit_count = digit_count
+        self.code_count = code_count(digit_count)
+
+        combos = [combo for combo in itertools.permutations(range(10), digit_count)
+                  if combo[0] != 0]
+        self.numbers: Tuple[str, ...] = tuple(''.join(map(str, combo)) for combo in combos)
+        self.index: Dict[str, int] = {number: i for i, number in enumerate(self.numbers)}
+        self.size = len(self.numbers)
+
+        self.digits = np.array(combos, dtype=np.int8).reshape(self.size, digit_count)
+        self.masks = np.bitwise_or.reduce(
+            np.left_shift(1, self.digits.astype(np.int16)), axis=1
+        ).astype(np.int16)
+        self.digits.setflags(write=False)
+        self.masks.setflags(write=False)
+
+        self._matrix: Optional[np.ndarray] = None
+        if self.size * self.size <= FULL_MATRIX_LIMIT:
+            everything = np.arange(self.size)
+            self._matrix = self.compute(everything, everything)
+            self._matrix.setflags(write=False)
+
+    def compute(self, guess_indices: np.ndarray, secret_indices: np.ndarray) -> np.ndarray:
+        """추측 x 정답 블록의 피드백 코드를 직접 계산"""
+        guess_indices = np.asarray(guess_indices)
+        secret_indices = np.asarray(secret_indices)
+        result = np.empty((len(guess_indices), len(secret_indices)), dtype=np.int8)
+        if not len(secret_indices):
+            return result
+
+        secret_digits = self.digits[secret_indices]
+        secret_masks = self.masks[secret_indices]
+        step = max(1, BLOCK_ELEMENTS // len(secret_indices))
+
+        for start in range(0, len(guess_indices), step):
+            chunk = guess_indices[start:start + step]
+            guess_digits = self.digits[chunk]
+
+            strikes = np.zeros((len(chunk), len(secret_indices)), dtype=np.int8)
+            for position in range(self.digit_count):
+                strikes += guess_digits[:, position, None] == secret_digits[None, :, position]
+
+            # 공통 숫자 수 - 스트라이크 = 볼 이므로 코드 = 자릿수 * S + 공통 숫자 수
+            common = _POPCOUNT[self.masks[chunk][:, None] & secret_masks[None, :]]
+            result[start:start + len(chunk)] = strikes * self.digit_count + common
+
+        return result
+
+    def codes(self, guess_indices: np.ndarray, secret_indices: np.ndarray) -> np.ndarray:
+        """추측 x 정답 블록의 피드백 코드 (행렬이 있으면 조회, 없으면 계산)"""
+        if self._matrix is not None:
+            return self._matrix[np.ix_(np.asarray(guess_indices), np.asarray(secret_indices))]
+        return self.compute(guess_indices, secret_indices)
+
+    def row(self, guess_index: int) -> np.ndarray:
+        """한 추측에 대한 모든 정답의 피드백 코드"""
+        if self._matrix is not None:
+            return self._matrix[guess_index]
+        return self.compute(np.array([guess_index]), np.arange(self.size))[0]
+
+    def row_for_guess(self, guess: str) -> np.ndarray:
+        """임의의 추측 문자열(중복 숫자 포함)에 대한 모든 정답의 피드백 코드"""
+        guess_index = self.index.get(guess)
+        if guess_index is not None:
+            return self.row(guess_index)
+
+        strikes = np.zeros(self.size, dtype=np.int8)
+        balls = np.zeros(self.size, dtype=np.int8)
+        for position, char in enumerate(guess):
+            digit = int(char)
+            hit = self.digits[:, position] == digit
+            strikes += hit
+            balls += ~hit & ((self.masks >> digit) & 1).astype(bool)
+
+        return strikes * (self.digit_count + 1) + balls
+
+    def result(self, guess: str, secret: str) -> Tuple[int, int]:
+        """두 숫자의 (스트라이크, 볼)"""
+        guess_index = self.index.get(guess)
+        secret_index = self.index.get(secret)
+        if guess_index is None or secret_index is None:
+            return score_guess(guess, secret)
+
+        if self._matrix is not None:
+            code = self._matrix[guess_index, secret_index]
+        else:
+            code = self.compute(np.array([guess_index]), np.array([secret_index]))[0, 0]
+        return decode_result(code, self.digit_count)
+
+
+_full_bitsets: Dict[int, np.ndarray] = {}
+
+
+def full_bitset(size: int) -> np.ndarray:
+    """모든 후보가 켜진 비트셋 (정규 순서 기준, 8개씩 uint8로 묶음)
+
+    크기별로 하나를 읽기 전용으로 공유하므로 새 게임의 후보 풀은 복사 없이 시작한다.
+    후보를 거를 때는 제자리 연산(&=) 대신 새 비트셋을 만들어 바꿔 끼운다.
+    """
+    bits = _full_bitsets.get(size)
+    if bits is None:
+        bits = np.packbits(np.ones(size, dtype=bool))
+        bits.setflags(write=False)
+        bits = _full_bitsets.setdefault(size, bits)
+    return bits
+
+
+def bitset_from_mask(mask: np.ndarray) -> np.ndarray:
+    """불리언 마스크를 비트셋으로 변환"""
+    return np.packbits(mask)
+
+
+def bitset_from_indices(indices: np.ndarray, size: int) -> np.ndarray:
+    """켜진 후보의 인덱스 배열을 비트셋으로 변환"""
+    mask = np.zeros(size, dtype=bool)
+    mask[indices] = True
+    return np.packbits(mask)
+
+
+def bitset_indices(bits: np.ndarray, size: int) -> np.ndarray:
+    """비트셋에서 켜진 후보의 정렬된 인덱스 배열"""
+    return np.flatnonzero(np.unpackbits(bits, count=size))
+
+
+def bitset_count(bits: np.ndarray) -> int:
+    """비트셋에서 켜진 후보 수"""
+    return int(_POPCOUNT[bits].sum())
+
+
+def partition_counts(table: FeedbackTable, guess_indices: np.ndarray,
+                     pool_indices: np.ndarray) -> np.ndarray:
+    """각 추측이 후보 풀을 피드백 코드별로 나누는 그룹 크기 (추측 수 x 코드 수)"""
+    guess_indices = np.asarray(guess_indices)
+    pool_indices = np.asarray(pool_indices)
+    counts = np.zeros((len(guess_indices), table.code_count), dtype=np.int32)
+    if not len(pool_indices):
+        return counts
+
+    step = max(1, BLOCK_ELEMENTS // len(pool_indices))
+    for start in range(0, len(guess_indices), step):
+        chunk = guess_indices[start:start + step]
+        codes = table.codes(chunk, pool_indices).astype(np.int32)
+        # 추측마다 코드 구간을 달리해 한 번의 bincount로 모든 그룹 크기를 센다
+        codes += np.arange(len(chunk), dtype=np.int32)[:, None] * table.code_count
+        counts[start:start + len(chunk)] = np.bincount(
+            codes.ravel(), minlength=len(chunk) * table.code_count
+        ).reshape(len(chunk), table.code_count)
+
+    return counts
+
+
+def select_best_guess(guess_indices: np.ndarray, scores: np.ndarray,
+                      pool_indices: np.ndarray) -> int:
+    """점수가 가장 낮은 추측 선택 (동점이면 후보 풀 안의 숫자, 그다음 정규 순서 우선)"""
+    guess_indices = np.asarray(guess_indices)
+    best = guess_indices[scores == scores.min()]
+    in_pool = best[np.isin(best, pool_indices)]
+    return int(in_pool.min() if len(in_pool) else best.min())
+
+
+def minimax_guess(table: FeedbackTable, pool_indices: np.ndarray,
+                  guess_indices: Optional[np.ndarray] = None) -> int:
+    """최대 그룹 크기가 가장 작은 추측 인덱스 (Knuth 최소 최대 전략)"""
+    if guess_indices is None:
+        guess_indices = np.arange(table.size)
+    max_group_sizes = partition_counts(table, guess_indices, pool_indices).max(axis=1)
+    return select_best_guess(guess_indices, max_group_sizes, pool_indices)
+
+
+STRATEGIES = ('minimax', 'expected', 'entropy')
+
+
+def partition_scores(counts: np.ndarray, strategy: str) -> np.ndarray:
+    """그룹 크기로 추측 점수 계산 (낮을수록 좋음)
+
+    minimax: 최대 그룹 크기, expected: 그룹 크기 제곱합 (= 기대 그룹 크기 x 후보 수),
+    entropy: sum(c log c) (작을수록 결과 분포의 엔트로피가 큼)
+    """
+    if strategy == 'minimax':
+        return counts.max(axis=1)
+    if strategy == 'expected':
+        counts = counts.astype(np.int64)
+        return (counts * counts).sum(axis=1)
+    if strategy == 'entropy':
+        safe = np.where(counts > 0, counts, 1).astype(np.float64)
+        return (counts * np.log(safe)).sum(axis=1)
+    raise ValueError(f'알 수 없는 전략입니다: {strategy}')
+
+
+def anytime_guess(table: FeedbackTable, pool_indices: np.ndarray, guess_order: np.ndarray,
+                  strategy: str = 'expected', deadline: Optional[float] = None) -> int:
+    """우선순위 순서대로 추측을 평가하다가 제한 시각(perf_counter 기준)이 지나면 지금까지의 최선 반환
+
+    점수가 같으면 후보 풀 안의 숫자, 그다음 우선순위가 앞선 추측을 고른다.
+    첫 구간은 제한 시각과 관계없이 항상 평가한다.
+    """
+    pool_indices = np.asarray(pool_indices)
+    guess_order = np.asarray(guess_order)
+    in_pool = np.zeros(table.size, dtype=bool)
+    in_pool[pool_indices] = True
+
+    best_key = None
+    best_index = int(guess_order[0])
+    step = max(1, BLOCK_ELEMENTS // max(1, len(pool_indices)))
+
+    for start in range(0, len(guess_order), step):
+        chunk = guess_order[start:start + step]
+        scores = partition_scores(partition_counts(table, chunk, pool_indices), strategy)
+        outside = ~in_pool[chunk]
+        best = np.lexsort((np.arange(len(chunk)), outside, scores))[0]
+
+        key = (scores[best], outside[best], start + best)
+        if best_key is None or key < best_key:
+            best_key = key
+            best_index = int(chunk[best])
+
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+
+    return best_index
+
+
+_tables: Dict[int, FeedbackTable] = {}
+_tables_lock = threading.Lock()
+
+
+def get_feedback_table(digit_count: int) -> FeedbackTable:
+    """자릿수별 공유 피드백 테이블 (프로세스당 한 번 생성)"""
+    table = _tables.get(digit_count)
+    if table is None:
+        with _tables_lock:
+            table = _tables.get(digit_count)
+            if table is None:
+                table = FeedbackTable(digit_count)
+                _tables[digit_count] = table
+    return table
+
+
+def preload_tables(digit_counts: Iterable[int]):
+    """자릿수별 피드백 테이블과 전체 후보 비트셋을 미리 생성
+
+    gunicorn --preload로 마스터 프로세스에서 불러 두면 fork한 작업자들이 같은 메모리를
+    복사 없이 공유하고, 자릿수별 첫 게임도 테이블 생성을 기다리지 않는다.
+    """
+    for digit_count in digit_counts:
+        if 1 <= digit_count <= TABLE_MAX_DIGITS:
+            full_bitset(get_feedback_table(digit_count).size)
+
+
+def calculate_result(guess: str, secret: str) -> Tuple[int, int]:
+    """스트라이크와 볼 계산 (피드백 테이블 조회, 테이블이 없는 긴 숫자는 직접 계산)"""
+    if len(guess) != len(secret) or not 1 <= len(guess) <= TABLE_MAX_DIGITS:
+        return score_guess(guess, secret)
+    return get_feedback_table(len(guess)).result(guess, secret)
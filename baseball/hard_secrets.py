@@ -0,0 +1,127 @@
+import math
+import os
+import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .ai_logic import AdvancedAIPlayer
+from .feedback import get_feedback_table
+from .openings import load_all_opening_books
+from .parallel import fork_context
+
+# 미리 계산한 정답 순위표 파일 위치 (hard_secrets_<자릿수>.npy)
+HARD_SECRETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'hard_secrets')
+
+# 순위를 매길 때 상대하는 AI 난이도
+RANKING_DIFFICULTY = 'expert'
+
+# 전문가 정답으로 쓰는 순위표 상위 비율
+HARDEST_SHARE = 0.05
+
+# 순위 계산에서 작업자 한 번에 맡기는 정답 수
+RANKING_CHUNK_SIZE = 500
+
+
+def hard_secrets_path(digit_count: int) -> str:
+    """정답 순위표 파일 경로"""
+    return os.path.join(HARD_SECRETS_DIR, f'hard_secrets_{digit_count}.npy')
+
+
+def solve_counts(digit_count: int, start: int, stop: int) -> np.ndarray:
+    """정규 순서 start~stop 정답을 AI가 맞히는 데 든 추측 수 (못 맞히면 최대 추측 수 + 1)"""
+    # selfplay가 정답 생성기(이 모듈을 씀)를 가져오므로 순환 import를 피해 여기서 가져온다
+    from .selfplay import MAX_GUESSES, play_game
+
+    table = get_feedback_table(digit_count)
+    counts = np.empty(stop - start, dtype=np.int16)
+    for offset, index in enumerate(range(start, stop)):
+        # 같은 시드로 두어 순위표를 다시 만들어도 같은 결과
+        result = play_game(RANKING_DIFFICULTY, digit_count, table.numbers[index], seed=0)
+        counts[offset] = result.guesses if result.solved else MAX_GUESSES + 1
+    return counts
+
+
+def build_hard_secret_table(digit_count: int, workers: int = 1) -> np.ndarray:
+    """모든 정답을 AI와 대국시켜 오래 걸린 순서로 정렬한 (정답 인덱스, 추측 수) 표
+
+    추측 수가 같으면 AI의 첫 추측 뒤에 남는 후보가 많은 정답, 그다음 정규 순서가 앞선다.
+    workers가 1보다 크면 fork한 작업자들이 나눠 처리한다.
+    """
+    table = get_feedback_table(digit_count)
+    load_all_opening_books()
+    ranges = [(start, min(start + RANKING_CHUNK_SIZE, table.size))
+              for start in range(0, table.size, RANKING_CHUNK_SIZE)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=fork_context()) as executor:
+            futures = [executor.submit(solve_counts, digit_count, start, stop) for start, stop in ranges]
+            counts = np.concatenate([future.result() for future in futures])
+    else:
+        counts = np.concatenate([solve_counts(digit_count, start, stop) for start, stop in ranges])
+
+    ai_player = AdvancedAIPlayer(RANKING_DIFFICULTY)
+    ai_player.initialize_game(digit_count)
+    first_codes = table.row_for_guess(ai_player.first_guess)
+    first_pool_sizes = np.bincount(first_codes, minlength=table.code_count)[first_codes]
+
+    order = np.lexsort((np.arange(table.size), -first_pool_sizes, -counts.astype(np.int32)))
+    return np.stack([order, counts[order]], axis=1).astype(np.int32 if table.size > 32767 else np.int16)
+
+
+def save_hard_secret_table(digit_count: int, ranked: np.ndarray) -> str:
+    """정답 순위표를 파일로 저장"""
+    os.makedirs(HARD_SECRETS_DIR, exist_ok=True)
+    path = hard_secrets_path(digit_count)
+    np.save(path, ranked)
+    return path
+
+
+def hardest_count(ranked: np.ndarray, share: float = HARDEST_SHARE) -> int:
+    """순위표 상위 share 비율에 드는 정답 수"""
+    return max(1, math.ceil(len(ranked) * share))
+
+
+_tables: Dict[int, Optional[Tuple[np.ndarray, int]]] = {}
+_tables_lock = threading.Lock()
+
+
+def load_hard_secrets(digit_count: int) -> Optional[Tuple[np.ndarray, int]]:
+    """정답 순위표와 전문가 정답으로 쓸 상위 정답 수 (파일이 없으면 None)"""
+    if digit_count not in _tables:
+        with _tables_lock:
+            if digit_count not in _tables:
+                path = hard_secrets_path(digit_count)
+                if os.path.exists(path):
+                    ranked = np.load(path, mmap_mode='r')
+                    _tables[digit_count] = (ranked, hardest_count(ranked))
+                else:
+                    _tables[digit_count] = None
+    return _tables[digit_count]
+
+
+def load_all_hard_secrets() -> int:
+    """저장된 모든 정답 순위표를 메모리 매핑 (서버 시작 시 호출)"""
+    if not os.path.isdir(HARD_SECRETS_DIR):
+        return 0
+
+    loaded = 0
+    for filename in sorted(os.listdir(HARD_SECRETS_DIR)):
+        name, ext = os.path.splitext(filename)
+        parts = name.split('_')
+        if ext != '.npy' or len(parts) != 3 or parts[:2] != ['hard', 'secrets']:
+            continue
+        if load_hard_secrets(int(parts[2])) is not None:
+            loaded += 1
+    return loaded
+
+
+def pick_hard_secret(digit_count: int, rng: Optional[random.Random] = None) -> Optional[str]:
+    """AI가 가장 오래 걸린 정답 중 하나 (순위표가 없는 자릿수는 None) - 요청마다 탐색 없이 O(1)"""
+    loaded = load_hard_secrets(digit_count)
+    if loaded is None:
+        return None
+    ranked, count = loaded
+    return get_feedback_table(digit_count).numbers[int(ranked[(rng or random).randrange(count), 0])]
@@ -0,0 +1,73 @@
+from typing import Iterable, List, NamedTuple
+
+import numpy as np
+
+from .feedback import FeedbackTable
+
+# 자리별 유력 숫자로 보여주려면 2위 숫자보다 이만큼 (확률 차이) 높아야 한다
+LIKELY_MARGIN = 0.05
+
+
+class DigitOdds(NamedTuple):
+    """후보 풀 기준 숫자 확률 (후보가 모두 같은 확률이라고 가정)"""
+    positions: np.ndarray   # (자릿수, 10) - 자리별로 각 숫자가 올 확률
+    presence: np.ndarray    # (10,) - 정답에 각 숫자가 들어 있을 확률
+    pool_size: int
+
+    @property
+    def certain_in(self) -> List[int]:
+        """모든 후보에 들어 있는 숫자"""
+        return [digit for digit in range(10) if self.pool_size and self.presence[digit] == 1.0]
+
+    @property
+    def certain_out(self) -> List[int]:
+        """어떤 후보에도 없는 숫자"""
+        return [digit for digit in range(10) if self.pool_size and self.presence[digit] == 0.0]
+
+
+def accumulate_digit_odds(digit_chunks: Iterable[np.ndarray], digit_count: int) -> DigitOdds:
+    """후보 숫자 배열 구간들의 (자리, 숫자) 빈도와 숫자 포함 빈도를 bincount로 모아 확률로 변환"""
+    position_counts = np.zeros((digit_count, 10), dtype=np.int64)
+    presence_counts = np.zeros(10, dtype=np.int64)
+    pool_size = 0
+    for digits in digit_chunks:
+        # 자리 p의 숫자 v를 p * 10 + v 칸으로 보내 모든 자리를 한 번에 센다
+        cells = digits.astype(np.int64) + np.arange(digit_count) * 10
+        position_counts += np.bincount(cells.ravel(), minlength=digit_count * 10).reshape(digit_count, 10)
+
+        masks = np.bitwise_or.reduce(np.left_shift(1, digits.astype(np.int16)), axis=1)
+        presence_counts += ((masks[:, None] >> np.arange(10)) & 1).sum(axis=0)
+        pool_size += len(digits)
+
+    if not pool_size:
+        return DigitOdds(np.zeros((digit_count, 10)), np.zeros(10), 0)
+    return DigitOdds(position_counts / pool_size, presence_counts / pool_size, pool_size)
+
+
+def digit_odds(table: FeedbackTable, pool_indices: np.ndarray) -> DigitOdds:
+    """피드백 테이블 후보 풀의 숫자 확률"""
+    return accumulate_digit_odds([table.digits[pool_indices]], table.digit_count)
+
+
+def describe_odds(odds: DigitOdds) -> str:
+    """전문가 힌트용 요약 - 확정/제외 숫자와 자리별로 가장 유력한 숫자"""
+    if not odds.pool_size:
+        return "남은 후보 없음"
+
+    parts = []
+    if odds.certain_in:
+        parts.append(f"확실히 포함: {', '.join(map(str, odds.certain_in))}")
+    if odds.certain_out:
+        parts.append(f"확실히 제외: {', '.join(map(str, odds.certain_out))}")
+
+    # 동률에 가까운 자리는 argmax가 고른 숫자에 의미가 없으므로 건너뛴다
+    likely = []
+    for position, row in enumerate(odds.positions):
+        runner_up, top = np.sort(row)[-2:]
+        if top - runner_up < LIKELY_MARGIN:
+            continue
+        digit = int(row.argmax())
+        likely.append(f"{position + 1}번째 {digit}({row[digit]:.0%})")
+    if likely:
+        parts.append(f"유력: {' '.join(likely)}")
+    return ' / '.join(parts) if parts else "아직 유력한 숫자 없음"
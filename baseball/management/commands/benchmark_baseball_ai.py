@@ -0,0 +1,131 @@
+import json
+import sys
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from baseball.ai_logic import DIFFICULTIES
+from baseball.feedback import STRATEGIES, get_feedback_table
+from baseball.selfplay import play_game, summarize
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def peak_memory_mb():
+    """프로세스 최대 상주 메모리 (MB, 측정 불가하면 None)"""
+    if resource is None:
+        return None
+    # ru_maxrss 단위는 macOS가 바이트, Linux 등 나머지는 KB
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss / (1024 * 1024) if sys.platform == 'darwin' else max_rss / 1024
+
+
+class Command(BaseCommand):
+    help = '숫자야구 AI를 모든 정답에 대해 자가 대국시켜 추측 수와 속도를 측정합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--digits', type=int, nargs='+', default=[3, 4, 5],
+                            help='측정할 자릿수 (기본: 3 4 5)')
+        parser.add_argument('--difficulty', nargs='+', choices=DIFFICULTIES, default=list(DIFFICULTIES),
+                            help='측정할 난이도 (기본: 전체)')
+        parser.add_argument('--limit', type=int, default=0,
+                            help='자릿수별 정답 수 제한 (0이면 모든 정답, 기본: 0)')
+        parser.add_argument('--strategy', choices=STRATEGIES,
+                            help='추측 선택 전략 (기본: 설정값 BASEBALL_AI_STRATEGY)')
+        parser.add_argument('--time-budget', type=float,
+                            help='expected/entropy 전략의 턴당 제한 시간 (초)')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='난수 시드 (정답마다 시드 + 정답 번호 사용)')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+        parser.add_argument('--baseline', help='비교할 이전 결과 JSON 파일')
+        parser.add_argument('--latency-tolerance', type=float, default=0.1,
+                            help='기준 대비 허용하는 p95 지연 증가율 (기본: 0.1 = 10%%)')
+
+    def handle(self, *args, **options):
+        report = []
+
+        for digit_count in options['digits']:
+            secrets = get_feedback_table(digit_count).numbers
+            if options['limit']:
+                # 정규 순서에서 고르게 뽑아 자릿수 분포를 유지
+                step = max(1, len(secrets) // options['limit'])
+                secrets = secrets[::step][:options['limit']]
+
+            for difficulty in options['difficulty']:
+                started = time.perf_counter()
+                results = [
+                    play_game(difficulty, digit_count, secret, seed=options['seed'] + number,
+                              strategy=options['strategy'], time_budget=options['time_budget'])
+                    for number, secret in enumerate(secrets)
+                ]
+                elapsed = time.perf_counter() - started
+
+                turn_ms = np.array([seconds for result in results for seconds in result.turn_seconds]) * 1000
+                row = {
+                    'digitCount': digit_count,
+                    'difficulty': difficulty,
+                    **summarize(results),
+                    'turnMsP50': float(np.percentile(turn_ms, 50)),
+                    'turnMsP95': float(np.percentile(turn_ms, 95)),
+                    'turnMsP99': float(np.percentile(turn_ms, 99)),
+                    'turnMsMax': float(turn_ms.max()),
+                    'gamesPerSecond': len(results) / elapsed if elapsed else 0.0,
+                    'peakMemoryMb': peak_memory_mb(),
+                }
+                report.append(row)
+                self.stdout.write(self._format_row(row))
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+        if options['baseline']:
+            self._compare(report, options['baseline'], options['latency_tolerance'])
+
+    def _format_row(self, row):
+        memory = f"{row['peakMemoryMb']:.0f}MB" if row['peakMemoryMb'] is not None else '-'
+        return (
+            f"{row['digitCount']}자리 {row['difficulty']:<6} "
+            f"{row['games']}판 (해결 {row['solved']}) "
+            f"평균 {row['averageGuesses']:.3f}회 / 최악 {row['worstGuesses']}회 | "
+            f"턴 p50 {row['turnMsP50']:.2f}ms p95 {row['turnMsP95']:.2f}ms p99 {row['turnMsP99']:.2f}ms "
+            f"CPU {row['cpuMsPerTurn']:.2f}ms/턴 | "
+            f"{row['gamesPerSecond']:.1f}판/초 | 최대 메모리 {memory}"
+        )
+
+    def _compare(self, report, baseline_path, latency_tolerance):
+        """이전 결과와 비교해 더 약해지거나 느려진 항목 표시"""
+        try:
+            with open(baseline_path) as f:
+                baseline = {(row['digitCount'], row['difficulty']): row for row in json.load(f)}
+        except (OSError, ValueError) as e:
+            raise CommandError(f'기준 결과를 읽을 수 없습니다: {e}')
+
+        regressions = 0
+        for row in report:
+            before = baseline.get((row['digitCount'], row['difficulty']))
+            if before is None or before['games'] != row['games']:
+                continue
+
+            weaker = (row['averageGuesses'] > before['averageGuesses'] or
+                      row['worstGuesses'] > before['worstGuesses'])
+            slower = row['turnMsP95'] > before['turnMsP95'] * (1 + latency_tolerance)
+            label = f"{row['digitCount']}자리 {row['difficulty']}"
+            message = (
+                f"{label}: 평균 {before['averageGuesses']:.3f} -> {row['averageGuesses']:.3f}회, "
+                f"p95 {before['turnMsP95']:.2f} -> {row['turnMsP95']:.2f}ms, "
+                f"CPU {before.get('cpuMsPerTurn', 0.0):.2f} -> {row['cpuMsPerTurn']:.2f}ms/턴, "
+                f"{before['gamesPerSecond']:.1f} -> {row['gamesPerSecond']:.1f}판/초"
+            )
+            if weaker or slower:
+                regressions += 1
+                self.stdout.write(self.style.WARNING(f'{message} (퇴보)'))
+            else:
+                self.stdout.write(self.style.SUCCESS(message))
+
+        if regressions:
+            raise CommandError(f'기준보다 약하거나 느린 항목이 {regressions}개 있습니다.')
@@ -0,0 +1,28 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from baseball.hard_secrets import RANKING_DIFFICULTY, build_hard_secret_table, hardest_count, save_hard_secret_table
+
+
+class Command(BaseCommand):
+    help = '모든 정답을 숫자야구 AI와 대국시켜 오래 걸린 순서의 정답 순위표를 미리 계산해 저장합니다 (전문가 정답용).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--digits', type=int, nargs='+', default=[3, 4, 5],
+                            help='계산할 자릿수 (기본: 3 4 5)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='작업자 프로세스 수 (기본: CPU 수)')
+
+    def handle(self, *args, **options):
+        for digit_count in options['digits']:
+            started = time.perf_counter()
+            ranked = build_hard_secret_table(digit_count, options['workers'])
+            path = save_hard_secret_table(digit_count, ranked)
+            count = hardest_count(ranked)
+            self.stdout.write(self.style.SUCCESS(
+                f'{digit_count}자리 ({RANKING_DIFFICULTY} AI 기준): 최악 {ranked[0, 1]}회, '
+                f'전문가 정답 {count}개 ({ranked[count - 1, 1]}회 이상), '
+                f'{ranked.nbytes / 1024:.1f}KB, {time.perf_counter() - started:.1f}초 -> {path}'
+            ))
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from baseball.openings import DEFAULT_DEPTH, build_opening_book, save_opening_book
+
+
+class Command(BaseCommand):
+    help = '숫자야구 AI의 오프닝 북(정규화된 국면별 최적 추측)을 미리 계산해 저장합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--digits', type=int, nargs='+', default=[3, 4, 5],
+                            help='계산할 자릿수 (기본: 3 4 5)')
+        parser.add_argument('--depth', type=int, default=DEFAULT_DEPTH,
+                            help=f'북에 저장할 국면의 최대 추측 기록 수 (기본: {DEFAULT_DEPTH})')
+
+    def handle(self, *args, **options):
+        for digit_count in options['digits']:
+            started = time.perf_counter()
+            book = build_opening_book(digit_count, options['depth'])
+            path = save_opening_book(digit_count, book)
+            self.stdout.write(self.style.SUCCESS(
+                f'{digit_count}자리: 국면 {len(book)}개, {time.perf_counter() - started:.1f}초 -> {path}'
+            ))
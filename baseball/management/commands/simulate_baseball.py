@@ -0,0 +1,35 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from baseball.ai_logic import DIFFICULTIES
+from baseball.selfplay import simulate
+
+
+class Command(BaseCommand):
+    help = '실제 정답 생성기로 숫자야구 AI를 대량 자가 대국시켜 난이도별 추측 수 분포를 NDJSON으로 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--games', type=int, default=1000,
+                            help='난이도/자릿수마다 시뮬레이션할 게임 수 (기본: 1000)')
+        parser.add_argument('--digits', type=int, nargs='+', default=[3, 4, 5],
+                            help='시뮬레이션할 자릿수 (기본: 3 4 5)')
+        parser.add_argument('--difficulty', nargs='+', choices=DIFFICULTIES, default=list(DIFFICULTIES),
+                            help='시뮬레이션할 난이도 (기본: 전체)')
+        parser.add_argument('--mistake-rate', type=float,
+                            help='difficulty_multipliers 대신 쓸 실수 확률 (조정 실험용)')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='작업자 프로세스 수 (기본: CPU 수)')
+        parser.add_argument('--seed', type=int, default=0,
+                            help='난수 시드 (같은 시드면 작업자 수와 무관하게 같은 결과)')
+
+    def handle(self, *args, **options):
+        if options['games'] < 1:
+            raise CommandError('--games는 1 이상이어야 합니다.')
+
+        for row in simulate(options['difficulty'], options['digits'], options['games'],
+                            seed=options['seed'], workers=options['workers'],
+                            mistake_rate=options['mistake_rate']):
+            self.stdout.write(json.dumps(row, ensure_ascii=False))
+            self.stdout.flush()
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:06
+
+from django.db import migrations, models
+
+
+def mark_ai_guesses(apps, schema_editor):
+    # 기존 기록은 AI 힌트 문구로 AI의 추측을 구분한다
+    BaseballGuess = apps.get_model('baseball', 'BaseballGuess')
+    BaseballGuess.objects.filter(ai_hint='AI의 추측입니다.').update(is_ai_guess=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('baseball', '0002_aiplayer_remove_baseballgame_ai_hints_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseballgame',
+            name='ai_state',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='baseballguess',
+            name='is_ai_guess',
+            field=models.BooleanField(default=False, help_text='AI의 추측 여부'),
+        ),
+        migrations.RunPython(mark_ai_guesses, migrations.RunPython.noop),
+    ]
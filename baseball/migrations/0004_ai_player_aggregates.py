@@ -0,0 +1,49 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:19
+
+from django.db import migrations, models
+
+
+def merge_ai_players(apps, schema_editor):
+    # 난이도마다 한 행만 남기고, 평균 라운드는 라운드 합계로 바꿔 합친다
+    AIPlayer = apps.get_model('baseball', 'AIPlayer')
+    merged = {}
+    for ai_player in AIPlayer.objects.order_by('id'):
+        sum_rounds = round(ai_player.average_rounds * ai_player.total_games)
+        keeper = merged.get(ai_player.difficulty)
+        if keeper is None:
+            ai_player.sum_rounds = sum_rounds
+            ai_player.save()
+            merged[ai_player.difficulty] = ai_player
+            continue
+
+        keeper.win_count += ai_player.win_count
+        keeper.loss_count += ai_player.loss_count
+        keeper.total_games += ai_player.total_games
+        keeper.sum_rounds += sum_rounds
+        keeper.save()
+        ai_player.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('baseball', '0003_ai_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='aiplayer',
+            name='sum_rounds',
+            field=models.IntegerField(default=0, help_text='종료된 게임의 라운드 합계'),
+        ),
+        migrations.RunPython(merge_ai_players, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='aiplayer',
+            name='average_rounds',
+        ),
+        migrations.AlterField(
+            model_name='aiplayer',
+            name='difficulty',
+            field=models.CharField(choices=[('easy', '쉬움'), ('normal', '보통'), ('hard', '어려움'), ('expert', '전문가')], max_length=10, unique=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('baseball', '0004_ai_player_aggregates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseballgame',
+            name='allow_repeats',
+            field=models.BooleanField(default=False, help_text='숫자 중복 허용 여부'),
+        ),
+    ]
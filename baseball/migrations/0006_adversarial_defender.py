@@ -0,0 +1,28 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('baseball', '0005_allow_repeats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseballgame',
+            name='adversarial',
+            field=models.BooleanField(default=False, help_text='악당 수비 모드 (정답을 끝날 때 정함)'),
+        ),
+        migrations.AddField(
+            model_name='baseballgame',
+            name='defender_pool',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='baseballguess',
+            name='candidates_left',
+            field=models.IntegerField(blank=True, help_text='악당 수비 모드에서 이 답 뒤에 남은 정답 후보 수', null=True),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.23 on 2026-10-17 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('baseball', '0006_adversarial_defender'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseballgame',
+            name='board_count',
+            field=models.IntegerField(default=1, help_text='동시에 맞힐 정답 수 (여러 판 모드)'),
+        ),
+        migrations.AddField(
+            model_name='baseballgame',
+            name='board_secrets',
+            field=models.CharField(blank=True, help_text='여러 판 모드의 판별 정답 (쉼표 구분)', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='baseballguess',
+            name='board_results',
+            field=models.JSONField(blank=True, help_text='여러 판 모드의 판별 [스트라이크, 볼] (strikes/balls는 합계)', null=True),
+        ),
+    ]
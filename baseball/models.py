@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import F
 from django.utils import timezone
 import random
 
@@ -19,6 +20,10 @@ class BaseballGame(models.Model):
     # 게임 기본 정보
     secret_number = models.CharField(max_length=10, help_text="정답 숫자")
     digit_count = models.IntegerField(default=3, help_text="자릿수")
+    allow_repeats = models.BooleanField(default=False, help_text="숫자 중복 허용 여부")
+    adversarial = models.BooleanField(default=False, help_text="악당 수비 모드 (정답을 끝날 때 정함)")
+    board_count = models.IntegerField(default=1, help_text="동시에 맞힐 정답 수 (여러 판 모드)")
+    board_secrets = models.CharField(max_length=64, blank=True, help_text="여러 판 모드의 판별 정답 (쉼표 구분)")
     difficulty = models.CharField(max_length=10, choices=DIFFICULTY_CHOICES, default='normal')
     game_status = models.CharField(max_length=10, choices=GAME_STATUS_CHOICES, default='waiting')
     
@@ -31,6 +36,12 @@ class BaseballGame(models.Model):
     player_id = models.CharField(max_length=100, null=True, blank=True)
     ai_opponent = models.BooleanField(default=True)
     
+    # AI 상태 스냅샷 (어느 작업자 프로세스에서든 AI를 복원하기 위함)
+    ai_state = models.BinaryField(null=True, blank=True, editable=False)
+    
+    # 악당 수비 모드의 남은 정답 후보 (zlib 압축 비트셋, 끝나면 이 중 하나를 정답으로 공개)
+    defender_pool = models.BinaryField(null=True, blank=True, editable=False)
+    
     # 게임 결과
     winner = models.CharField(max_length=50, null=True, blank=True)
     secret_number_revealed = models.BooleanField(default=False)
@@ -75,6 +86,9 @@ class BaseballGuess(models.Model):
     balls = models.IntegerField(default=0, help_text="볼 수")
     round_number = models.IntegerField(help_text="라운드 번호")
     ai_hint = models.TextField(blank=True, help_text="AI 힌트")
+    is_ai_guess = models.BooleanField(default=False, help_text="AI의 추측 여부")
+    candidates_left = models.IntegerField(null=True, blank=True, help_text="악당 수비 모드에서 이 답 뒤에 남은 정답 후보 수")
+    board_results = models.JSONField(null=True, blank=True, help_text="여러 판 모드의 판별 [스트라이크, 볼] (strikes/balls는 합계)")
     created_at = models.DateTimeField(default=timezone.now)
     
     class Meta:
@@ -84,13 +98,13 @@ class BaseballGuess(models.Model):
         return f"Guess {self.guess_number} - {self.strikes}S {self.balls}B (Round {self.round_number})"
 
 class AIPlayer(models.Model):
-    """AI 플레이어 정보"""
+    """AI 플레이어 정보 (난이도별 누적 통계 한 행)"""
     name = models.CharField(max_length=50, default="AI Player")
-    difficulty = models.CharField(max_length=10, choices=BaseballGame.DIFFICULTY_CHOICES)
+    difficulty = models.CharField(max_length=10, choices=BaseballGame.DIFFICULTY_CHOICES, unique=True)
     win_count = models.IntegerField(default=0)
     loss_count = models.IntegerField(default=0)
     total_games = models.IntegerField(default=0)
-    average_rounds = models.FloatField(default=0.0)
+    sum_rounds = models.IntegerField(default=0, help_text="종료된 게임의 라운드 합계")
     
     class Meta:
         ordering = ['-total_games']
@@ -98,16 +112,27 @@ class AIPlayer(models.Model):
     def __str__(self):
         return f"{self.name} ({self.difficulty})"
     
+    @property
+    def average_rounds(self):
+        """게임당 평균 라운드"""
+        return self.sum_rounds / self.total_games if self.total_games else 0.0
+    
+    @property
+    def win_rate(self):
+        """승률 (%)"""
+        return (self.win_count / self.total_games) * 100 if self.total_games else 0.0
+    
     def update_stats(self, won, rounds):
-        """통계 업데이트"""
-        self.total_games += 1
-        if won:
-            self.win_count += 1
-        else:
-            self.loss_count += 1
-        
-        # 평균 라운드 업데이트
-        if self.total_games > 0:
-            self.average_rounds = ((self.average_rounds * (self.total_games - 1)) + rounds) / self.total_games
-        
-        self.save()
+        """통계 업데이트 (F 식으로 DB에서 더하므로 동시에 끝난 게임도 빠짐없이 반영)"""
+        AIPlayer.objects.filter(pk=self.pk).update(
+            total_games=F('total_games') + 1,
+            win_count=F('win_count') + int(won),
+            loss_count=F('loss_count') + int(not won),
+            sum_rounds=F('sum_rounds') + rounds,
+        )
+    
+    @classmethod
+    def record_game(cls, difficulty, won, rounds):
+        """난이도별 행에 게임 결과 반영 (행이 없으면 생성)"""
+        ai_player, _ = cls.objects.get_or_create(difficulty=difficulty)
+        ai_player.update_stats(won, rounds)
@@ -0,0 +1,167 @@
+import random
+import sys
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ai_logic import SEARCH_BUDGETS, sample_guesses, sample_pool
+from .feedback import BLOCK_ELEMENTS, FeedbackTable, encode_result, get_feedback_table, select_best_guess
+
+# 한 게임에서 동시에 맞힐 수 있는 최대 정답 수
+MAX_BOARDS = 4
+
+# 한 턴의 평가량 (추측 수 x 모든 판의 후보 수 합) 상한 - 넘으면 추측을 표본으로 줄인다
+MAX_TURN_WORK = 20_000_000
+
+
+def generate_board_secrets(digit_count: int, board_count: int,
+                           rng: Optional[random.Random] = None) -> List[str]:
+    """판마다 서로 다른 정답 (첫 자리가 0이 아닌 중복 없는 숫자에서 고르게)"""
+    return (rng or random).sample(get_feedback_table(digit_count).numbers, board_count)
+
+
+def score_boards(guess: str, secrets: Sequence[str]) -> List[Tuple[int, int]]:
+    """추측 하나를 모든 판의 정답과 비교한 (스트라이크, 볼) 목록"""
+    table = get_feedback_table(len(guess))
+    return [table.result(guess, secret) for secret in secrets]
+
+
+def board_partition_counts(table: FeedbackTable, guess_indices: np.ndarray,
+                           pools: Sequence[np.ndarray]) -> np.ndarray:
+    """추측마다 판별 피드백 그룹 크기 (추측 수 x 판 수 x 코드 수)를 한 번에 계산
+
+    후보 풀이 같은 판(게임 초반이나 지금까지 결과가 같았던 판)은 한 번만 세고, 서로 다른 풀은
+    이어 붙여 추측 구간마다 피드백 코드 조회 한 번과 bincount 한 번으로 모든 판을 함께 센다.
+    """
+    guess_indices = np.asarray(guess_indices)
+    unique_pools = {}
+    board_slots = [unique_pools.setdefault(pool.tobytes(), (len(unique_pools), pool))[0] for pool in pools]
+    distinct = [pool for _, pool in unique_pools.values()]
+
+    secrets = np.concatenate(distinct)
+    offsets = np.repeat(np.arange(len(distinct), dtype=np.int32) * table.code_count,
+                        [len(pool) for pool in distinct])
+    bins = len(distinct) * table.code_count
+
+    counts = np.zeros((len(guess_indices), len(distinct), table.code_count), dtype=np.int32)
+    step = max(1, BLOCK_ELEMENTS // max(1, len(secrets)))
+    for start in range(0, len(guess_indices), step):
+        chunk = guess_indices[start:start + step]
+        codes = table.codes(chunk, secrets).astype(np.int32) + offsets
+        codes += np.arange(len(chunk), dtype=np.int32)[:, None] * bins
+        counts[start:start + len(chunk)] = np.bincount(
+            codes.ravel(), minlength=len(chunk) * bins
+        ).reshape(len(chunk), len(distinct), table.code_count)
+
+    return counts[:, board_slots]
+
+
+class MultiBoardAIPlayer:
+    """여러 판 모드 AI - 판마다 후보 풀을 두고 모든 판의 최악 그룹 크기 합이 가장 작은 추측을 고름
+
+    사람과 AI의 모든 추측은 판별 결과가 공개되므로 둘 다 반영하고, 표본 추출 난수는 턴 수로 시드를 정해
+    DB의 추측 기록만으로 언제든 같은 상태를 복원할 수 있다 (스냅샷 없음).
+    """
+
+    def __init__(self, difficulty: str, digit_count: int, board_count: int):
+        self.difficulty = difficulty
+        self.digit_count = digit_count
+        self.board_count = board_count
+        self.table = get_feedback_table(digit_count)
+        self.budget = SEARCH_BUDGETS[difficulty]
+        self.first_guess = '1234567890'[:digit_count]
+        # 판별 후보 인덱스 (정렬됨, 걸러낼 때마다 새 배열로 바꿔 끼움)
+        everything = np.arange(self.table.size)
+        self.pools: List[np.ndarray] = [everything] * board_count
+        # AI가 직접 맞힌 판
+        self.solved = [False] * board_count
+        self.guess_history = []
+        self.pending_work = None
+
+    def turn_count(self) -> int:
+        """반영한 추측 수 (사람 + AI)"""
+        return len(self.guess_history)
+
+    def update_knowledge(self, guess: str, results: Sequence[Tuple[int, int]], is_ai_guess: bool = False):
+        """추측의 판별 결과 반영 - 피드백 행은 한 번만 구해 모든 판이 함께 쓴다"""
+        row = self.table.row_for_guess(guess)
+        for board, (strikes, balls) in enumerate(results):
+            pool = self.pools[board]
+            self.pools[board] = pool[row[pool] == encode_result(strikes, balls, self.digit_count)]
+            if is_ai_guess and strikes == self.digit_count:
+                self.solved[board] = True
+
+        self.guess_history.append({
+            'guess': guess,
+            'results': [list(result) for result in results],
+            'is_ai_guess': is_ai_guess
+        })
+
+    def open_pools(self) -> List[np.ndarray]:
+        """AI가 아직 맞히지 않은 판의 후보 풀"""
+        return [pool for pool, solved in zip(self.pools, self.solved) if not solved and len(pool)]
+
+    def make_guess(self) -> str:
+        """다음 추측 - 답이 하나 남은 판이 있으면 그 답, 아니면 모든 판을 함께 가장 잘 나누는 추측"""
+        pools = self.open_pools()
+        if not self.guess_history or not pools:
+            return self.first_guess
+
+        table = self.table
+        for pool in pools:
+            if len(pool) == 1:
+                return table.numbers[pool[0]]
+
+        # 탐색 깊이를 넘긴 뒤에는 후보가 가장 적은 판의 첫 후보 (기록과 모순되지 않는 추측)
+        ai_turns = sum(entry['is_ai_guess'] for entry in self.guess_history)
+        if self.budget.depth is not None and ai_turns >= self.budget.depth:
+            return table.numbers[min(pools, key=len)[0]]
+
+        sampler = np.random.default_rng(self.turn_count())
+        if self.budget.samples is not None:
+            pools = [sample_pool(sampler, pool, self.budget.samples) for pool in pools]
+        union = np.unique(np.concatenate(pools))
+
+        guesses = sample_guesses(sampler, union, table.size, self.budget.guesses)
+        work_per_guess = sum(len(pool) for pool in pools)
+        limit = max(1, MAX_TURN_WORK // work_per_guess)
+        if len(guesses) > limit:
+            # 평가량 상한 - 후보 풀 안의 숫자를 먼저, 그다음 풀 밖 숫자를 무작위로 limit개
+            in_pool = np.isin(guesses, union, assume_unique=True)
+            ranked = np.concatenate([sampler.permutation(guesses[in_pool]),
+                                     sampler.permutation(guesses[~in_pool])])
+            guesses = np.sort(ranked[:limit])
+
+        counts = board_partition_counts(table, guesses, pools)
+        scores = counts.max(axis=2).sum(axis=1)
+        return table.numbers[select_best_guess(guesses, scores, union)]
+
+    def get_hint(self, guess: str, results: Sequence[Tuple[int, int]]) -> str:
+        """판별 남은 후보 수 요약"""
+        parts = []
+        for board, ((strikes, balls), pool) in enumerate(zip(results, self.pools), start=1):
+            remaining = '정답' if strikes == self.digit_count else f'후보 {len(pool)}개'
+            parts.append(f'{board}판 {strikes}S {balls}B ({remaining})')
+        return ' / '.join(parts)
+
+    def estimate_size(self) -> int:
+        """세션 저장소용 메모리 사용량 추정 (바이트)"""
+        return (sys.getsizeof(self.__dict__) + sum(pool.nbytes for pool in self.pools)
+                + 400 * len(self.guess_history))
+
+    def get_game_statistics(self) -> Dict[str, any]:
+        """게임 통계 반환"""
+        return {
+            'difficulty': self.difficulty,
+            'boards': self.board_count,
+            'total_guesses': len(self.guess_history),
+            'candidate_pool_sizes': [len(pool) for pool in self.pools],
+            'solved_boards': sum(self.solved),
+        }
+
+
+def replay_board_guesses(ai_player: MultiBoardAIPlayer, guesses) -> MultiBoardAIPlayer:
+    """기록된 추측(BaseballGuess, 라운드 순)을 차례로 반영해 AI 상태 복원"""
+    for guess in guesses:
+        ai_player.update_knowledge(guess.guess_number, guess.board_results, guess.is_ai_guess)
+    return ai_player
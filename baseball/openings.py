@@ -0,0 +1,130 @@
+import os
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .feedback import FeedbackTable, decode_result, encode_result, get_feedback_table, minimax_guess
+from .symmetry import CanonicalState, canonical_state, guess_classes, guess_representatives
+
+# 미리 계산한 오프닝 북 파일 위치 (openings_<자릿수>.npy)
+OPENINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'openings')
+
+# 북에 저장하는 국면의 최대 추측 기록 수
+# 웹 게임의 AI는 사람의 추측만 기록하므로 실제로 쓰이는 것은 사람의 첫 추측 뒤(깊이 1) 국면뿐이고,
+# 깊이 2 국면은 AI가 자기 추측을 이어 두는 자체 대국(벤치마크, 시뮬레이션, 정답 순위표)에서 쓰인다.
+DEFAULT_DEPTH = 2
+
+
+def opening_path(digit_count: int) -> str:
+    """오프닝 북 파일 경로"""
+    return os.path.join(OPENINGS_DIR, f'openings_{digit_count}.npy')
+
+
+def _history(history: List[Dict], guess: str, code: int, digit_count: int) -> List[Dict]:
+    """기록 뒤에 (추측, 결과 코드)를 더한 새 기록"""
+    strikes, balls = decode_result(code, digit_count)
+    return history + [{'guess': guess, 'result': {'strikes': strikes, 'balls': balls}}]
+
+
+def best_book_guess(table: FeedbackTable, guess_history: List[Dict], pool: np.ndarray) -> str:
+    """국면의 최소 최대 최적 추측 (AI 탐색과 같은 결과 - 동치인 추측은 대표만 평가)"""
+    return table.numbers[minimax_guess(table, pool, guess_representatives(table, guess_history))]
+
+
+def build_opening_book(digit_count: int, depth: int = DEFAULT_DEPTH) -> Dict[str, str]:
+    """정규화된 국면 키 -> 정규 좌표의 최적 추측
+
+    첫 추측은 어떤 숫자든 (동치인 추측 묶음마다 하나씩) 모든 결과를 담아 사람이 먼저 추측한
+    게임에서도 쓰이게 하고, 그 뒤로는 depth까지 북 자신의 추측을 따라간다.
+    """
+    table = get_feedback_table(digit_count)
+    win_code = encode_result(digit_count, 0, digit_count)
+    book: Dict[str, str] = {}
+    queue = deque(([], table.numbers[guess], np.arange(table.size))
+                  for guess in guess_classes(table, [])[0])
+
+    while queue:
+        history, guess, pool = queue.popleft()
+        row = table.row_for_guess(guess)[pool]
+        for code in np.unique(row):
+            child_pool = pool[row == code]
+            if code == win_code or len(child_pool) < 2:
+                continue
+            child_history = _history(history, guess, int(code), digit_count)
+            state = canonical_state(child_history, digit_count)
+            if state is None or state.key in book:
+                continue
+
+            child_guess = best_book_guess(table, child_history, child_pool)
+            book[state.key] = state.symmetry.apply(child_guess)
+            if len(child_history) < depth:
+                queue.append((child_history, child_guess, child_pool))
+
+    return book
+
+
+def book_array(digit_count: int, book: Dict[str, str]) -> np.ndarray:
+    """국면 키 순으로 정렬한 (키, 정규 좌표 추측 인덱스) 배열 - 이진 탐색으로 조회"""
+    table = get_feedback_table(digit_count)
+    keys = sorted(book)
+    width = max((len(key) for key in keys), default=1)
+    index_type = np.int32 if table.size > 32767 else np.int16
+    entries = np.empty(len(keys), dtype=[('key', f'S{width}'), ('guess', index_type)])
+    entries['key'] = [key.encode('ascii') for key in keys]
+    entries['guess'] = [table.index[book[key]] for key in keys]
+    return entries
+
+
+def save_opening_book(digit_count: int, book: Dict[str, str]) -> str:
+    """오프닝 북을 정렬된 배열 파일로 저장"""
+    os.makedirs(OPENINGS_DIR, exist_ok=True)
+    path = opening_path(digit_count)
+    np.save(path, book_array(digit_count, book))
+    return path
+
+
+_books: Dict[int, Optional[np.ndarray]] = {}
+_books_lock = threading.Lock()
+
+
+def load_opening_book(digit_count: int) -> Optional[np.ndarray]:
+    """오프닝 북을 메모리 매핑해 불러오기 (없으면 None)"""
+    if digit_count not in _books:
+        with _books_lock:
+            if digit_count not in _books:
+                path = opening_path(digit_count)
+                _books[digit_count] = np.load(path, mmap_mode='r') if os.path.exists(path) else None
+    return _books[digit_count]
+
+
+def load_all_opening_books() -> int:
+    """저장된 모든 오프닝 북을 메모리 매핑 (서버 시작 시 호출)"""
+    if not os.path.isdir(OPENINGS_DIR):
+        return 0
+
+    loaded = 0
+    for filename in sorted(os.listdir(OPENINGS_DIR)):
+        name, ext = os.path.splitext(filename)
+        parts = name.split('_')
+        if ext != '.npy' or len(parts) != 2 or parts[0] != 'openings':
+            continue
+        if load_opening_book(int(parts[1])) is not None:
+            loaded += 1
+    return loaded
+
+
+def lookup_opening(digit_count: int, state: CanonicalState) -> Optional[str]:
+    """정규화된 국면이 북에 있으면 원래 좌표로 되돌린 다음 추측을 반환"""
+    book = load_opening_book(digit_count)
+    if book is None or not len(book):
+        return None
+
+    keys = book['key']
+    key = state.key.encode('ascii')
+    position = int(np.searchsorted(keys, key))
+    if position == len(keys) or keys[position] != key:
+        return None
+    book_guess = get_feedback_table(digit_count).numbers[int(book['guess'][position])]
+    return state.symmetry.restore(book_guess)
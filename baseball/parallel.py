@@ -0,0 +1,113 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from .feedback import FeedbackTable, get_feedback_table, partition_counts
+
+# 작업자 한 명당 나눠 줄 추측 구간 수 (작업량 편차 완화)
+CHUNKS_PER_WORKER = 4
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_workers = 0
+_executor_lock = threading.Lock()
+
+
+def worker_count() -> int:
+    """설정된 병렬 작업자 수 (0 또는 1이면 직렬 평가)"""
+    workers = getattr(settings, 'BASEBALL_AI_WORKERS', 0)
+    if workers < 0:
+        workers = os.cpu_count() or 1
+    return workers
+
+
+def should_parallelize(guess_count: int, pool_size: int) -> bool:
+    """평가량이 병렬 처리 비용보다 클 때만 병렬 모드 사용"""
+    threshold = getattr(settings, 'BASEBALL_AI_PARALLEL_THRESHOLD', 20_000_000)
+    return worker_count() > 1 and guess_count * pool_size >= threshold
+
+
+def fork_context():
+    """가능하면 fork 컨텍스트 - 부모의 피드백 테이블을 복사 없이 읽기 전용으로 공유한다
+
+    스레드가 없는 관리 명령 프로세스 전용. 웹 작업자 안에서는 server_context를 쓴다.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else None)
+
+
+def server_context():
+    """웹 작업자용 forkserver 컨텍스트 (없으면 spawn)
+
+    gunicorn 작업자는 요청 스레드와 추측 미리 계산 스레드가 돌고 있어, 그 상태로 fork하면
+    다른 스레드가 쥔 잠금이 자식에 복사되어 멈출 수 있다. 그래서 깨끗한 프로세스에서 자식을
+    시작하고, 자식은 첫 작업에서 피드백 테이블을 다시 만든다 (병렬 탐색을 쓰는 5자리 테이블은
+    행렬 없이 숫자 배열뿐이라 0.1초 안팎).
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if 'forkserver' not in methods:
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """프로세스 풀 (처음 사용할 때 생성, 작업자 수가 바뀌면 다시 생성)"""
+    global _executor, _executor_workers
+
+    workers = worker_count()
+    with _executor_lock:
+        if _executor is None or _executor_workers != workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False)
+            _executor = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=server_context(),
+            )
+            _executor_workers = workers
+    return _executor
+
+
+def shutdown_executor():
+    """프로세스 풀 종료"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+        _executor = None
+        _executor_workers = 0
+
+
+def _best_in_chunk(digit_count: int, guess_indices: np.ndarray,
+                   pool_indices: np.ndarray) -> Tuple[int, int, int]:
+    """구간 안의 최적 추측을 (최대 그룹 크기, 풀 밖 여부, 인덱스) 키로 반환"""
+    table = get_feedback_table(digit_count)
+    scores = partition_counts(table, guess_indices, pool_indices).max(axis=1)
+    outside = (~np.isin(guess_indices, pool_indices)).astype(np.int64)
+    order = np.lexsort((guess_indices, outside, scores))
+    best = order[0]
+    return int(scores[best]), int(outside[best]), int(guess_indices[best])
+
+
+def parallel_minimax_guess(table: FeedbackTable, pool_indices: np.ndarray,
+                           guess_indices: Optional[np.ndarray] = None) -> int:
+    """추측 공간을 프로세스 풀에 나눠 평가하는 최소 최대 전략
+
+    구간별 최적 추측을 (최대 그룹 크기, 풀 밖 여부, 인덱스) 순으로 비교해 합치므로
+    직렬 모드(feedback.minimax_guess)와 항상 같은 추측을 고른다.
+    """
+    if guess_indices is None:
+        guess_indices = np.arange(table.size)
+    pool_indices = np.asarray(pool_indices)
+
+    executor = get_executor()
+    chunks = np.array_split(np.asarray(guess_indices), worker_count() * CHUNKS_PER_WORKER)
+    futures = [executor.submit(_best_in_chunk, table.digit_count, chunk, pool_indices)
+               for chunk in chunks if len(chunk)]
+
+    return min(future.result() for future in futures)[2]
@@ -0,0 +1,83 @@
+import random
+from typing import Optional
+
+from .hard_secrets import pick_hard_secret
+
+
+def generate_secret_number(digit_count: int, difficulty: str, allow_repeats: bool = False,
+                           rng: Optional[random.Random] = None) -> str:
+    """난이도에 따른 정답 숫자 생성 (rng를 주면 그 난수 생성기만 사용, 없으면 모듈 random)"""
+    rng = rng or random
+    if allow_repeats:
+        # 중복 허용 게임: 첫 자리만 0이 아니면 모든 숫자가 같은 확률
+        return generate_repeated_number(digit_count, rng)
+    
+    if difficulty == 'easy':
+        # 쉬운 난이도: 연속된 숫자나 예측 가능한 패턴
+        if digit_count == 3:
+            patterns = ['123', '234', '345', '456', '567', '678', '789']
+        elif digit_count == 4:
+            patterns = ['1234', '2345', '3456', '4567', '5678', '6789']
+        elif digit_count == 5:
+            patterns = ['12345', '23456', '34567', '45678', '56789']
+        else:
+            patterns = ['1234567890'[start:start + digit_count] for start in range(11 - digit_count)]
+        
+        return rng.choice(patterns)
+    
+    elif difficulty == 'normal':
+        # 보통 난이도: 랜덤하지만 예측 가능한 패턴
+        return generate_random_number(digit_count, rng)
+    
+    elif difficulty == 'hard':
+        # 어려운 난이도: 복잡한 패턴
+        return generate_complex_number(digit_count, rng)
+    
+    else:  # expert
+        # 전문가 난이도: AI가 가장 오래 걸린 정답 순위표에서 (순위표가 없는 자릿수는 랜덤)
+        return pick_hard_secret(digit_count, rng) or generate_random_number(digit_count, rng)
+
+def generate_random_number(digit_count: int, rng: Optional[random.Random] = None) -> str:
+    """기본 랜덤 숫자 생성"""
+    rng = rng or random
+    numbers = list(range(1, 10))  # 0 제외
+    result = []
+    
+    for _ in range(digit_count):
+        num = rng.choice(numbers)
+        result.append(str(num))
+        numbers.remove(num)
+        if not numbers:  # 10자리는 마지막 자리에 0 사용
+            numbers.append(0)
+    
+    return ''.join(result)
+
+def generate_repeated_number(digit_count: int, rng: Optional[random.Random] = None) -> str:
+    """숫자 중복을 허용하는 랜덤 숫자 생성"""
+    rng = rng or random
+    return str(rng.randint(1, 9)) + ''.join(str(rng.randint(0, 9)) for _ in range(digit_count - 1))
+
+def generate_complex_number(digit_count: int, rng: Optional[random.Random] = None) -> str:
+    """복잡한 패턴의 숫자 생성"""
+    rng = rng or random
+    # 홀수와 짝수를 섞어서 생성
+    odds = [1, 3, 5, 7, 9]
+    evens = [0, 2, 4, 6, 8]
+    
+    result = []
+    for i in range(digit_count):
+        if i == 0:  # 첫 번째는 0이 될 수 없음
+            num = rng.choice(odds)
+        else:
+            if rng.random() < 0.6:  # 60% 확률로 홀수
+                num = rng.choice(odds)
+            else:
+                num = rng.choice(evens)
+        
+        if num in result:
+            # 중복되면 아직 쓰지 않은 숫자 중에서 선택
+            num = rng.choice([n for n in (odds + evens) if n not in result])
+        
+        result.append(num)
+    
+    return ''.join(map(str, result))
@@ -0,0 +1,163 @@
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+from .ai_logic import AdvancedAIPlayer
+from .feedback import get_feedback_table
+from .openings import load_all_opening_books
+from .parallel import fork_context
+from .secret_numbers import generate_secret_number
+
+# 자가 대국에서 허용하는 최대 추측 수 (BaseballGame.max_rounds 기본값과 동일)
+MAX_GUESSES = 20
+
+# 일괄 시뮬레이션에서 작업자 한 번에 맡기는 게임 수
+SIMULATION_CHUNK_SIZE = 500
+
+
+class GameResult(NamedTuple):
+    """자가 대국 한 판의 결과"""
+    secret: str
+    guesses: int
+    solved: bool
+    turn_seconds: List[float]
+    turn_cpu_seconds: List[float]
+
+
+def play_game(difficulty: str, digit_count: int, secret: str,
+              seed: Optional[int] = None, max_guesses: int = MAX_GUESSES,
+              strategy: Optional[str] = None, time_budget: Optional[float] = None,
+              mistake_rate: Optional[float] = None) -> GameResult:
+    """AI 혼자 정답을 맞힐 때까지 추측 (추측마다 경과 시간과 CPU 시간 기록)"""
+    ai_player = AdvancedAIPlayer(difficulty, strategy=strategy, time_budget=time_budget)
+    if seed is not None:
+        ai_player.rng.seed(seed)
+    if mistake_rate is not None:
+        ai_player.difficulty_multipliers[difficulty] = mistake_rate
+    ai_player.initialize_game(digit_count)
+    table = get_feedback_table(digit_count)
+
+    turn_seconds = []
+    turn_cpu_seconds = []
+    for turn in range(1, max_guesses + 1):
+        started = time.perf_counter()
+        cpu_started = time.process_time()
+        guess = ai_player.make_guess()
+        strikes, balls = table.result(guess, secret)
+        ai_player.update_knowledge(guess, {'strikes': strikes, 'balls': balls})
+        turn_cpu_seconds.append(time.process_time() - cpu_started)
+        turn_seconds.append(time.perf_counter() - started)
+
+        if strikes == digit_count:
+            return GameResult(secret, turn, True, turn_seconds, turn_cpu_seconds)
+
+    return GameResult(secret, max_guesses, False, turn_seconds, turn_cpu_seconds)
+
+
+def summarize(results: List[GameResult]) -> Dict[str, float]:
+    """추측 수 분포와 턴당 평균 CPU 시간 요약"""
+    guesses = [result.guesses for result in results]
+    cpu_seconds = [seconds for result in results for seconds in result.turn_cpu_seconds]
+    return {
+        'games': len(results),
+        'solved': sum(result.solved for result in results),
+        'averageGuesses': sum(guesses) / len(guesses) if guesses else 0.0,
+        'worstGuesses': max(guesses) if guesses else 0,
+        'cpuMsPerTurn': sum(cpu_seconds) / len(cpu_seconds) * 1000 if cpu_seconds else 0.0,
+    }
+
+
+class SimulationJob(NamedTuple):
+    """일괄 시뮬레이션의 작업 단위 (같은 시드면 작업자 수와 무관하게 같은 결과)"""
+    difficulty: str
+    digit_count: int
+    games: int
+    seed: int
+    mistake_rate: Optional[float]
+
+
+def job_seed(seed: int, digit_count: int, difficulty: str, chunk: int) -> int:
+    """(시드, 자릿수, 난이도, 구간 번호)에서 유도한 작업 시드 - 다른 조합을 더하거나 빼도 바뀌지 않음"""
+    return random.Random(f'{seed}/{digit_count}/{difficulty}/{chunk}').getrandbits(64)
+
+
+def simulate_chunk(job: SimulationJob) -> Counter:
+    """실제 정답 생성기로 뽑은 정답을 자가 대국해 추측 수 분포 반환 (못 맞히면 0)"""
+    # 작업 전용 난수 생성기로 정답과 AI 시드를 뽑는다 (모듈 random을 다시 시드하면 같은
+    # 프로세스에서 만드는 실제 게임의 정답까지 예측할 수 있게 됨)
+    rng = random.Random(job.seed)
+    distribution = Counter()
+    for _ in range(job.games):
+        secret = generate_secret_number(job.digit_count, job.difficulty, rng=rng)
+        result = play_game(job.difficulty, job.digit_count, secret,
+                           seed=rng.getrandbits(32), mistake_rate=job.mistake_rate)
+        distribution[result.guesses if result.solved else 0] += 1
+    return distribution
+
+
+def simulate(difficulties: Sequence[str], digit_counts: Sequence[int], games: int,
+             seed: int = 0, workers: int = 1, mistake_rate: Optional[float] = None) -> Iterator[Dict]:
+    """난이도/자릿수마다 games판을 시뮬레이션하고 끝나는 순서대로 분포 요약을 내보냄
+
+    공유 피드백 테이블과 오프닝 북을 미리 올린 뒤 fork한 작업자들이 나눠 처리한다.
+    workers가 음수면 CPU 수만큼 사용한다.
+    """
+    if workers < 0:
+        workers = os.cpu_count() or 1
+    jobs = []
+    for digit_count in digit_counts:
+        get_feedback_table(digit_count)
+        for difficulty in difficulties:
+            for chunk, start in enumerate(range(0, games, SIMULATION_CHUNK_SIZE)):
+                jobs.append(SimulationJob(difficulty, digit_count, min(SIMULATION_CHUNK_SIZE, games - start),
+                                          job_seed(seed, digit_count, difficulty, chunk), mistake_rate))
+    load_all_opening_books()
+
+    remaining = Counter((job.digit_count, job.difficulty) for job in jobs)
+    distributions = {key: Counter() for key in remaining}
+
+    executor = None
+    futures = []
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=fork_context())
+        futures = [executor.submit(simulate_chunk, job) for job in jobs]
+        results = (future.result() for future in futures)
+    else:
+        results = map(simulate_chunk, jobs)
+
+    try:
+        for job, distribution in zip(jobs, results):
+            key = (job.digit_count, job.difficulty)
+            distributions[key].update(distribution)
+            remaining[key] -= 1
+            if not remaining[key]:
+                yield summarize_distribution(job.difficulty, job.digit_count, distributions.pop(key),
+                                             mistake_rate)
+    finally:
+        # 소비자가 중간에 멈추면 (스트리밍 연결 종료 등) 남은 작업은 시작하지 않음
+        for future in futures:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown()
+
+
+def summarize_distribution(difficulty: str, digit_count: int, distribution: Counter,
+                           mistake_rate: Optional[float] = None) -> Dict:
+    """추측 수 분포 요약 (0은 최대 추측 수 안에 못 맞힌 게임)"""
+    games = sum(distribution.values())
+    unsolved = distribution.get(0, 0)
+    solved_guesses = [(guesses, count) for guesses, count in sorted(distribution.items()) if guesses]
+    solved = games - unsolved
+    return {
+        'digitCount': digit_count,
+        'difficulty': difficulty,
+        'mistakeRate': mistake_rate,
+        'games': games,
+        'solved': solved,
+        'unsolved': unsolved,
+        'averageGuesses': sum(guesses * count for guesses, count in solved_guesses) / solved if solved else 0.0,
+        'distribution': {str(guesses): count for guesses, count in solved_guesses},
+    }
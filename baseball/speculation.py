@@ -0,0 +1,73 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+
+from . import coaching
+from .ai_logic import AdvancedAIPlayer
+from .universe import uses_feedback_table
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class PendingWork(NamedTuple):
+    """미리 계산 중인 작업 (계산을 시작한 시점의 추측 기록 수로 유효성 확인)"""
+    turn_count: int
+    future: Future
+
+
+def speculation_workers() -> int:
+    """미리 계산용 스레드 수 (0이면 미리 계산하지 않고 요청 안에서 계산)"""
+    return getattr(settings, 'BASEBALL_AI_SPECULATION_WORKERS', 1)
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """미리 계산용 스레드 풀 (처음 사용할 때 생성 - gunicorn --preload로 fork한 뒤 작업자마다 따로 생김)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=speculation_workers(),
+                                           thread_name_prefix='baseball-speculation')
+    return _executor
+
+
+def can_rank(ai_player) -> bool:
+    """사람 추측 평가(coaching)를 쓰는 AI인지 - 피드백 테이블이 있는 한 판 게임만"""
+    return (isinstance(ai_player, AdvancedAIPlayer)
+            and uses_feedback_table(ai_player.digit_count, getattr(ai_player, 'allow_repeats', False)))
+
+
+def speculate(ai_player: AdvancedAIPlayer):
+    """사람의 다음 추측과 무관한 작업을 백그라운드에서 미리 계산 (결과는 AI 객체에 보관)
+
+    AI의 다음 추측은 사람의 이번 추측 결과까지 반영한 뒤 요청 안에서 정한다. 미리 계산하는 것은
+    사람 추측을 평가할 때 쓰는 지금 국면의 점수 분포로, 지금의 후보 풀과 기록만으로 정해진다.
+    """
+    if speculation_workers() <= 0 or not can_rank(ai_player):
+        return
+    cancel(ai_player)
+    # 요청 스레드가 기록에 추측을 더해도 영향이 없도록 복사본을 넘긴다
+    future = get_executor().submit(coaching.get_ranking, ai_player.feedback_table,
+                                   ai_player.candidate_indices(), list(ai_player.guess_history))
+    ai_player.pending_work = PendingWork(ai_player.turn_count(), future)
+
+
+def take_ranking(ai_player: AdvancedAIPlayer) -> Optional[coaching.GuessRanking]:
+    """미리 계산한 지금 국면의 점수 분포 (계산 중이면 끝날 때까지 기다림, 없거나 국면이 바뀌었으면 None)"""
+    pending = ai_player.pending_work
+    ai_player.pending_work = None
+    # 아직 시작하지 않았으면 취소하고 호출자가 직접 계산한다
+    if pending is None or pending.future.cancel():
+        return None
+    ranking = pending.future.result()
+    return ranking if pending.turn_count == ai_player.turn_count() else None
+
+
+def cancel(ai_player: AdvancedAIPlayer):
+    """미리 계산 취소 (게임이 끝났거나 AI를 버릴 때 - 이미 실행 중이면 결과만 버림)"""
+    pending = ai_player.pending_work
+    ai_player.pending_work = None
+    if pending is not None:
+        pending.future.cancel()
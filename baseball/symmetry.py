@@ -0,0 +1,215 @@
+import itertools
+import math
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .feedback import FeedbackTable, encode_result
+
+# 정규화할 때 시도하는 (자리 순열 x 추측 순서) 조합의 상한 - 넘으면 캐시를 쓰지 않는다
+MAX_CANONICAL_CANDIDATES = 5000
+
+
+class Symmetry(NamedTuple):
+    """자리 순열과 숫자 재명명 (첫 자리와 숫자 0은 항상 고정)"""
+    positions: Tuple[int, ...]
+    digits: Dict[str, str]
+
+    def apply(self, number: str) -> str:
+        """원래 좌표의 숫자를 정규 좌표로 변환"""
+        return ''.join(self.digits[number[position]] for position in self.positions)
+
+    def restore(self, number: str) -> str:
+        """정규 좌표의 숫자를 원래 좌표로 되돌리기"""
+        inverse_digits = {label: digit for digit, label in self.digits.items()}
+        result = [''] * len(self.positions)
+        for index, position in enumerate(self.positions):
+            result[position] = inverse_digits[number[index]]
+        return ''.join(result)
+
+
+class CanonicalState(NamedTuple):
+    """정규화된 국면 키와 원래 국면에서 정규 좌표로 가는 대칭 변환"""
+    key: str
+    symmetry: Symmetry
+
+
+def _history_groups(guess_history: List[Dict], digit_count: int) -> List[List[Tuple[int, str]]]:
+    """(결과 코드, 추측) 쌍을 결과 코드별로 묶기"""
+    pairs = sorted(
+        (encode_result(entry['result']['strikes'], entry['result']['balls'], digit_count), entry['guess'])
+        for entry in guess_history
+    )
+    return [list(group) for _, group in itertools.groupby(pairs, key=lambda pair: pair[0])]
+
+
+def canonical_state(guess_history: List[Dict], digit_count: int) -> Optional[CanonicalState]:
+    """(추측, 결과) 기록을 숫자 재명명과 자리 순열에 대해 정규화
+
+    같은 결과 코드끼리의 추측 순서와 첫 자리를 제외한 자리 순열을 모두 시도하고,
+    숫자는 처음 나온 순서대로 1부터 다시 붙인 뒤 사전 순으로 가장 작은 표현을 키로 삼는다.
+    숫자 0과 첫 자리는 '첫 자리는 0이 아님' 규칙 때문에 고정한다.
+    """
+    groups = _history_groups(guess_history, digit_count)
+
+    candidates = math.factorial(digit_count - 1)
+    for group in groups:
+        candidates *= math.factorial(len(group))
+    if candidates > MAX_CANONICAL_CANDIDATES:
+        return None
+
+    best = None
+    for rest in itertools.permutations(range(1, digit_count)):
+        positions = (0,) + rest
+        for ordering in itertools.product(*[itertools.permutations(group) for group in groups]):
+            mapping = {'0': '0'}
+            parts = []
+            for group in ordering:
+                for code, guess in group:
+                    chars = []
+                    for position in positions:
+                        digit = guess[position]
+                        if digit not in mapping:
+                            mapping[digit] = str(len(mapping))
+                        chars.append(mapping[digit])
+                    parts.append(f"{code}:{''.join(chars)}")
+
+            key = '|'.join(parts)
+            if best is None or key < best[0]:
+                best = (key, positions, mapping)
+
+    key, positions, mapping = best
+    # 기록에 나오지 않은 숫자는 서로 바꿔도 같은 국면이므로 남은 이름을 차례로 붙인다
+    for digit in '123456789':
+        if digit not in mapping:
+            mapping[digit] = str(len(mapping))
+
+    return CanonicalState(f'{digit_count}/{key}', Symmetry(positions, mapping))
+
+
+def history_stabilizer(guess_history: List[Dict], digit_count: int) -> List[Tuple[Tuple[int, ...], List[int]]]:
+    """추측 기록을 그대로 두는 (자리 순열, 숫자 재명명) 목록
+
+    기록에 나온 숫자에 대한 재명명만 구하고 나머지 숫자는 그대로 둔다. 조합이 너무 많으면
+    항등 변환만 반환한다 (나오지 않은 숫자끼리의 교환은 guess_representatives가 따로 처리).
+    """
+    identity = (tuple(range(digit_count)), list(range(10)))
+    groups = _history_groups(guess_history, digit_count)
+
+    candidates = math.factorial(digit_count - 1)
+    for group in groups:
+        candidates *= math.factorial(len(group))
+    if candidates > MAX_CANONICAL_CANDIDATES:
+        return [identity]
+
+    originals = [guess for group in groups for _, guess in group]
+    elements = []
+    for rest in itertools.permutations(range(1, digit_count)):
+        positions = (0,) + rest
+        for ordering in itertools.product(*[itertools.permutations(group) for group in groups]):
+            targets = [guess for group in ordering for _, guess in group]
+
+            # 변환된 추측[p] = 재명명(원래 추측[positions[p]])이 짝지은 기록 추측과 같아야 한다
+            mapping = {0: 0}
+            consistent = True
+            for original, target in zip(originals, targets):
+                for index, position in enumerate(positions):
+                    source, image = int(original[position]), int(target[index])
+                    if mapping.setdefault(source, image) != image:
+                        consistent = False
+                        break
+                if not consistent:
+                    break
+
+            if consistent and len(set(mapping.values())) == len(mapping):
+                digits = list(range(10))
+                for source, image in mapping.items():
+                    digits[source] = image
+                elements.append((positions, digits))
+
+    return elements or [identity]
+
+
+def guess_representatives(table: FeedbackTable, guess_history: List[Dict]) -> np.ndarray:
+    """기록이 남긴 대칭으로 서로 같은 추측을 묶고, 묶음마다 정규 순서가 가장 앞선 추측만 반환
+
+    기록에 나오지 않은 0 이외의 숫자는 서로 바꿔도 되고, 기록을 보존하는 자리 순열/숫자
+    재명명도 적용한다. 같은 묶음의 추측은 후보 풀 분할 결과와 풀 포함 여부가 같으므로
+    대표만 평가해도 전체를 평가한 것과 같은 추측이 선택된다.
+    """
+    return guess_classes(table, guess_history)[0]
+
+
+def guess_classes(table: FeedbackTable, guess_history: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """(묶음별 대표 추측 인덱스 - 정규 순서, 묶음 크기) - 묶는 기준은 guess_representatives와 같음"""
+    digit_count = table.digit_count
+    mentioned = {int(digit) for entry in guess_history for digit in entry['guess']}
+    free_digits = np.array([digit for digit in range(1, 10) if digit not in mentioned], dtype=np.int8)
+    is_free = np.zeros(10, dtype=bool)
+    is_free[free_digits] = True
+    place_values = 10 ** np.arange(digit_count - 1, -1, -1, dtype=np.int64)
+
+    keys = None
+    for positions, digit_map in history_stabilizer(guess_history, digit_count):
+        transformed = np.array(digit_map, dtype=np.int8)[table.digits[:, positions]]
+
+        # 나오지 않은 숫자는 등장 순서대로 가장 작은 것부터 다시 붙인다
+        free = is_free[transformed]
+        if len(free_digits):
+            rank = np.cumsum(free, axis=1) - free
+            transformed = np.where(free, free_digits[np.minimum(rank, len(free_digits) - 1)], transformed)
+
+        element_keys = transformed.astype(np.int64) @ place_values
+        keys = element_keys if keys is None else np.minimum(keys, element_keys)
+
+    _, first_indices, sizes = np.unique(keys, return_index=True, return_counts=True)
+    order = np.argsort(first_indices)
+    return first_indices[order], sizes[order]
+
+
+class GuessCache:
+    """정규화된 국면 -> 최적 추측(또는 국면별 계산 결과) LRU 캐시 (작업자 프로세스의 모든 게임이 공유)"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Hashable, Any]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            guess = self._entries.get(key)
+            if guess is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return guess
+
+    def put(self, key: Hashable, guess: Any):
+        with self._lock:
+            self._entries[key] = guess
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, float]:
+        """항목 수와 적중률"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'maxEntries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hitRate': self.hits / lookups if lookups else 0.0,
+            }
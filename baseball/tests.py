@@ -1,3 +1,994 @@
-from django.test import TestCase
+import json
+import math
+import random
+from typing import Optional
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+
+from . import coaching, defender, hard_secrets, speculation
+from .ai_logic import DIFFICULTIES, AdvancedAIPlayer, StreamingAIPlayer, create_ai_player, guess_cache
+from .feedback import (
+    anytime_guess, bitset_count, bitset_from_indices, bitset_indices, calculate_result, code_count,
+    decode_result, encode_result, full_bitset, get_feedback_table, minimax_guess, partition_counts,
+    partition_scores, score_guess,
+)
+from .hints import describe_odds, digit_odds
+from .models import AIPlayer, BaseballGame, BaseballGuess
+from .multiboard import MultiBoardAIPlayer
+from .openings import load_opening_book, lookup_opening
+from .parallel import parallel_minimax_guess, shutdown_executor
+from .secret_numbers import generate_secret_number
+from .selfplay import play_game, simulate
+from .symmetry import Symmetry, canonical_state, guess_classes, guess_representatives
+from .universe import NumberUniverse, get_universe
+from .views import LEADERBOARD_CACHE_KEY, ai_players, load_ai_player, validate_guess
+
+
+def sampled_players(digit_count: int, games: int, guesses: int, seed: int):
+    """무작위 정답과 무작위 추측으로 후보 풀을 좁힌 전문가 AI들 (후보가 2개 이상 남은 것만)"""
+    rng = random.Random(seed)
+    table = get_feedback_table(digit_count)
+    players = []
+    for _ in range(games):
+        secret = rng.choice(table.numbers)
+        ai_player = AdvancedAIPlayer('expert')
+        ai_player.rng.seed(rng.random())
+        ai_player.initialize_game(digit_count)
+        for _ in range(guesses):
+            guess = rng.choice(table.numbers)
+            strikes, balls = table.result(guess, secret)
+            ai_player.update_knowledge(guess, {'strikes': strikes, 'balls': balls})
+        if ai_player.candidate_count() > 1:
+            players.append(ai_player)
+    return players
+
+
+def play_turns(ai_player: AdvancedAIPlayer, secret: str, turns: int):
+    """AI 자신의 추측으로 turns번 진행 (중간에 맞히면 멈춤)"""
+    for _ in range(turns):
+        guess = ai_player.make_guess()
+        strikes, balls = score_guess(guess, secret)
+        ai_player.update_knowledge(guess, {'strikes': strikes, 'balls': balls})
+        if strikes == len(secret):
+            return
+
+
+def worst_group(table, pool_indices, guess: str) -> int:
+    """추측이 후보 풀을 나눈 가장 큰 그룹 크기"""
+    return int(partition_counts(table, [table.index[guess]], pool_indices).max())
+
+
+# (자릿수, 무작위 추측 수) - 4자리는 기준 구현이 느려 후보 풀을 더 좁힌다
+SAMPLED_POOLS = ((3, 1), (3, 2), (4, 2), (4, 3))
+
+
+class FeedbackTableTests(TestCase):
+    """미리 계산한 피드백 코드가 문자열 비교 기준 구현(score_guess)과 같은지"""
+
+    def assertMatchesScoreGuess(self, table, guess_indices, secret_indices):
+        codes = table.codes(guess_indices, secret_indices)
+        for row, guess_index in zip(codes.tolist(), guess_indices):
+            guess = table.numbers[guess_index]
+            expected = [encode_result(*score_guess(guess, table.numbers[secret_index]), table.digit_count)
+                        for secret_index in secret_indices]
+            self.assertEqual(row, expected, guess)
+
+    def test_three_digit_matrix_matches_every_pair(self):
+        table = get_feedback_table(3)
+        everything = list(range(table.size))
+        self.assertMatchesScoreGuess(table, everything, everything)
+
+    def test_sampled_pairs_match_for_four_and_five_digits(self):
+        rng = random.Random(1)
+        # 4자리는 전체 행렬 조회, 5자리는 행렬 없이 블록 단위 계산
+        for digit_count in (4, 5):
+            table = get_feedback_table(digit_count)
+            guesses = rng.sample(range(table.size), 40)
+            secrets = rng.sample(range(table.size), 300)
+            with self.subTest(digit_count=digit_count):
+                self.assertMatchesScoreGuess(table, guesses, secrets)
+                self.assertEqual(table.row(guesses[0])[secrets].tolist(),
+                                 table.codes(guesses[:1], secrets)[0].tolist())
+
+    def test_repeated_digit_guess_row_matches_score_guess(self):
+        table = get_feedback_table(4)
+        for guess in ('1111', '1123', '9009'):
+            row = table.row_for_guess(guess).tolist()
+            with self.subTest(guess=guess):
+                self.assertEqual(row, [encode_result(*score_guess(guess, secret), 4) for secret in table.numbers])
+
+    def test_calculate_result_falls_back_outside_table(self):
+        self.assertEqual(calculate_result('1234', '4231'), score_guess('1234', '4231'))
+        self.assertEqual(calculate_result('1123', '1231'), score_guess('1123', '1231'))
+        self.assertEqual(calculate_result('1234567', '7654321'), score_guess('1234567', '7654321'))
+        for code in range(code_count(4)):
+            self.assertEqual(encode_result(*decode_result(code, 4), 4), code)
+
+
+class MinimaxGuessTests(TestCase):
+    """일괄 평가한 최소 최대 추측이 추측별 반복문 기준 구현과 같은지"""
+
+    def test_vectorized_guess_matches_reference(self):
+        for digit_count, guesses in SAMPLED_POOLS:
+            table = get_feedback_table(digit_count)
+            for ai_player in sampled_players(digit_count, 6, guesses, seed=digit_count * 10 + guesses):
+                pool = ai_player.candidate_indices()
+                expected = ai_player._get_optimal_guess_reference()
+                with self.subTest(digit_count=digit_count, history=ai_player.guess_history):
+                    self.assertEqual(table.numbers[minimax_guess(table, pool)], expected)
+                    # 오프닝 북/국면 캐시를 거친 추측은 대칭인 다른 숫자일 수 있어 분할 결과로 비교
+                    guess = ai_player._get_optimal_guess()
+                    self.assertEqual(worst_group(table, pool, guess), worst_group(table, pool, expected))
+                    self.assertEqual(table.index[guess] in set(pool.tolist()),
+                                     table.index[expected] in set(pool.tolist()))
+
+    @override_settings(BASEBALL_AI_WORKERS=2)
+    def test_parallel_guess_matches_serial(self):
+        self.addCleanup(shutdown_executor)
+        for digit_count, guesses in SAMPLED_POOLS:
+            table = get_feedback_table(digit_count)
+            for ai_player in sampled_players(digit_count, 4, guesses, seed=digit_count * 100 + guesses):
+                pool = ai_player.candidate_indices()
+                with self.subTest(digit_count=digit_count, history=ai_player.guess_history):
+                    self.assertEqual(parallel_minimax_guess(table, pool), minimax_guess(table, pool))
+
+
+class CandidatePoolTests(TestCase):
+    """비트셋 후보 풀이 문자열 집합으로 거른 결과와 같은지"""
+
+    def test_bitset_round_trip(self):
+        rng = np.random.default_rng(0)
+        for size in (1, 7, 8, 648, 4536):
+            indices = np.unique(rng.integers(0, size, max(1, size // 3)))
+            bits = bitset_from_indices(indices, size)
+            with self.subTest(size=size):
+                self.assertEqual(bits.nbytes, (size + 7) // 8)
+                self.assertEqual(bitset_indices(bits, size).tolist(), indices.tolist())
+                self.assertEqual(bitset_count(bits), len(indices))
+
+    def test_filtering_matches_set_of_strings(self):
+        rng = random.Random(3)
+        for digit_count in (3, 4):
+            table = get_feedback_table(digit_count)
+            secret = rng.choice(table.numbers)
+            ai_player = create_ai_player('expert', digit_count)
+            expected = set(table.numbers)
+            for guess in rng.sample(table.numbers, 3) + ['1123'[:digit_count]]:
+                strikes, balls = score_guess(guess, secret)
+                ai_player.update_knowledge(guess, {'strikes': strikes, 'balls': balls})
+                expected = {number for number in expected if score_guess(guess, number) == (strikes, balls)}
+                with self.subTest(digit_count=digit_count, guess=guess):
+                    self.assertEqual({table.numbers[i] for i in ai_player.candidate_indices()}, expected)
+                    self.assertEqual(ai_player.candidate_count(), len(expected))
+                    self.assertEqual(ai_player.candidate_bits.nbytes, (table.size + 7) // 8)
+
+
+class SharedUniverseTests(TestCase):
+    """게임들이 자릿수별 테이블과 전체 비트셋을 복사 없이 공유하고, 거를 때 건드리지 않는지"""
+
+    def test_tables_and_universes_are_shared(self):
+        self.assertIs(get_feedback_table(4), get_feedback_table(4))
+        self.assertIs(get_universe(7), get_universe(7))
+        self.assertIsNot(get_universe(4), get_universe(4, allow_repeats=True))
+        table = get_feedback_table(4)
+        self.assertIsInstance(table.numbers, tuple)
+        self.assertFalse(full_bitset(table.size).flags.writeable)
+
+        first, second = create_ai_player('hard', 4), create_ai_player('expert', 4)
+        self.assertIs(first.possible_numbers, table.numbers)
+        self.assertIs(first.candidate_bits, second.candidate_bits)
+        self.assertIs(first.candidate_bits, full_bitset(table.size))
+        self.assertTrue(first.pool_is_universe())
+        self.assertIs(create_ai_player('expert', 7).possible_numbers, get_universe(7))
+
+    def test_filtering_leaves_shared_bitset_untouched(self):
+        for digit_count, allow_repeats in ((4, False), (6, False), (4, True)):
+            ai_player = create_ai_player('expert', digit_count, allow_repeats=allow_repeats)
+            shared = ai_player.candidate_bits
+            untouched = shared.copy()
+            ai_player.update_knowledge('1234567'[:digit_count], {'strikes': 1, 'balls': 1})
+            with self.subTest(digit_count=digit_count, allow_repeats=allow_repeats):
+                self.assertIsNot(ai_player.candidate_bits, shared)
+                self.assertFalse(ai_player.pool_is_universe())
+                self.assertEqual(shared.tolist(), untouched.tolist())
+                self.assertEqual(bitset_count(shared), len(ai_player.possible_numbers))
+                self.assertTrue(create_ai_player('expert', digit_count, allow_repeats=allow_repeats).pool_is_universe())
+
+    def test_size_estimate_excludes_shared_bitset(self):
+        ai_player = create_ai_player('expert', 8)
+        fresh = ai_player.estimate_size()
+        self.assertLess(fresh, ai_player.candidate_bits.nbytes)
+        ai_player.update_knowledge('12345678', {'strikes': 0, 'balls': 2})
+        self.assertGreaterEqual(ai_player.estimate_size() - fresh, ai_player.candidate_bits.nbytes)
+
+        # 추측 전 스냅샷은 전체 비트셋을 다시 공유
+        restored = AdvancedAIPlayer.from_state(create_ai_player('expert', 8).export_state())
+        self.assertTrue(restored.pool_is_universe())
+
+
+class SnapshotTests(TestCase):
+    """export_state/from_state 스냅샷 왕복"""
+
+    def assertSameState(self, restored: AdvancedAIPlayer, original: AdvancedAIPlayer):
+        self.assertIs(type(restored), type(original))
+        self.assertEqual(restored.difficulty, original.difficulty)
+        self.assertEqual(restored.digit_count, original.digit_count)
+        self.assertEqual(restored.first_guess, original.first_guess)
+        self.assertEqual(restored.guess_history, original.guess_history)
+        self.assertEqual(restored.candidate_indices().tolist(), original.candidate_indices().tolist())
+
+    def test_round_trip_keeps_state_and_next_guess(self):
+        for difficulty in DIFFICULTIES:
+            for digit_count, secret in ((3, '947'), (4, '5062')):
+                ai_player = create_ai_player(difficulty, digit_count)
+                ai_player.rng.seed(digit_count)
+                play_turns(ai_player, secret, 2)
+                data = ai_player.export_state()
+                with self.subTest(difficulty=difficulty, digit_count=digit_count):
+                    restored = AdvancedAIPlayer.from_state(data)
+                    self.assertSameState(restored, ai_player)
+                    self.assertEqual(AdvancedAIPlayer.snapshot_turn_count(data), ai_player.turn_count())
+                    # 난수 상태까지 복원되어 다음 추측(실수 포함)이 같아야 한다
+                    self.assertEqual(restored.make_guess(), ai_player.make_guess())
+
+    def test_round_trip_before_first_guess(self):
+        ai_player = create_ai_player('expert', 4)
+        restored = AdvancedAIPlayer.from_state(ai_player.export_state())
+        self.assertSameState(restored, ai_player)
+        self.assertEqual(restored.candidate_count(), get_feedback_table(4).size)
+
+    def test_round_trip_streaming_player(self):
+        ai_player = create_ai_player('hard', 4, allow_repeats=True)
+        ai_player.rng.seed(7)
+        play_turns(ai_player, '1130', 3)
+        restored = AdvancedAIPlayer.from_state(ai_player.export_state())
+        self.assertIsInstance(restored, StreamingAIPlayer)
+        self.assertTrue(restored.allow_repeats)
+        self.assertSameState(restored, ai_player)
+        self.assertEqual(restored.make_guess(), ai_player.make_guess())
+
+
+class OpeningBookTests(TestCase):
+    """메모리 매핑한 오프닝 북이 사람의 어떤 첫 추측 뒤에도 탐색과 같은 품질의 추측을 주는지"""
+
+    def test_book_is_sorted_memory_map(self):
+        for digit_count in (3, 4, 5):
+            book = load_opening_book(digit_count)
+            with self.subTest(digit_count=digit_count):
+                self.assertIsInstance(book, np.memmap)
+                self.assertTrue((book['key'][:-1] < book['key'][1:]).all())
+
+    def test_first_move_positions_are_in_book(self):
+        for digit_count in (3, 4):
+            table = get_feedback_table(digit_count)
+            for ai_player in sampled_players(digit_count, 8, 1, seed=digit_count):
+                pool = ai_player.candidate_indices()
+                guess = lookup_opening(digit_count, canonical_state(ai_player.guess_history, digit_count))
+                searched = table.numbers[minimax_guess(table, pool)]
+                with self.subTest(digit_count=digit_count, history=ai_player.guess_history):
+                    self.assertIsNotNone(guess)
+                    self.assertEqual(worst_group(table, pool, guess), worst_group(table, pool, searched))
+
+    def test_unknown_position_misses(self):
+        ai_player = sampled_players(3, 1, 3, seed=4)[0]
+        self.assertIsNone(lookup_opening(3, canonical_state(ai_player.guess_history, 3)))
+
+
+class AnytimeStrategyTests(TestCase):
+    """기대 그룹 크기/엔트로피 전략의 점수, 제한 시간 동작과 실제 대국 성능"""
+
+    def brute_force_guess(self, table, pool, guess_order, strategy: str) -> int:
+        """추측마다 그룹 크기를 세어 (점수, 풀 밖 여부, 우선순위) 순으로 최선"""
+        pool_set = set(pool.tolist())
+        best_key, best_index = None, None
+        for order, guess_index in enumerate(guess_order.tolist()):
+            groups = {}
+            for secret_index in pool.tolist():
+                code = table.codes([guess_index], [secret_index])[0, 0]
+                groups[code] = groups.get(code, 0) + 1
+            sizes = list(groups.values())
+            if strategy == 'expected':
+                score = sum(size * size for size in sizes)
+            else:
+                score = sum(size * math.log(size) for size in sizes)
+            key = (round(score, 9), guess_index not in pool_set, order)
+            if best_key is None or key < best_key:
+                best_key, best_index = key, guess_index
+        return best_index
+
+    def test_partition_scores(self):
+        counts = np.array([[3, 1, 0], [2, 2, 0]])
+        self.assertEqual(partition_scores(counts, 'minimax').tolist(), [3, 2])
+        self.assertEqual(partition_scores(counts, 'expected').tolist(), [10, 8])
+        self.assertTrue(np.allclose(partition_scores(counts, 'entropy'), [3 * math.log(3), 4 * math.log(2)]))
+        with self.assertRaises(ValueError):
+            partition_scores(counts, 'greedy')
+
+    def test_unbounded_search_matches_brute_force(self):
+        table = get_feedback_table(3)
+        order_rng = np.random.default_rng(2)
+        for ai_player in sampled_players(3, 4, 2, seed=20):
+            pool = ai_player.candidate_indices()
+            guess_order = order_rng.permutation(table.size)
+            for strategy in ('expected', 'entropy'):
+                with self.subTest(history=ai_player.guess_history, strategy=strategy):
+                    self.assertEqual(anytime_guess(table, pool, guess_order, strategy),
+                                     self.brute_force_guess(table, pool, guess_order, strategy))
+
+    def test_expired_deadline_returns_best_of_first_chunk(self):
+        table = get_feedback_table(3)
+        ai_player = sampled_players(3, 1, 1, seed=21)[0]
+        pool = ai_player.candidate_indices()
+        guess_order = np.random.default_rng(3).permutation(table.size)
+        # 구간 하나에 추측 10개씩
+        with mock.patch('baseball.feedback.BLOCK_ELEMENTS', len(pool) * 10):
+            guess = anytime_guess(table, pool, guess_order, 'expected', deadline=0.0)
+        self.assertEqual(guess, self.brute_force_guess(table, pool, guess_order[:10], 'expected'))
+
+    def test_strategies_solve_sampled_secrets(self):
+        for digit_count in (3, 4):
+            table = get_feedback_table(digit_count)
+            secrets = table.numbers[::table.size // 20]
+            for strategy in ('expected', 'entropy'):
+                results = [play_game('expert', digit_count, secret, seed=0, strategy=strategy) for secret in secrets]
+                with self.subTest(digit_count=digit_count, strategy=strategy):
+                    self.assertTrue(all(result.solved for result in results))
+                    self.assertLessEqual(max(result.guesses for result in results), 7)
+
+
+class CanonicalCacheTests(TestCase):
+    """숫자 재명명/자리 순열로 같은 국면은 캐시된 추측을 원래 좌표로 되돌려 쓰는지"""
+
+    # 첫 자리와 숫자 0은 고정
+    SYMMETRY = Symmetry((0, 3, 1, 2), dict(zip('0123456789', '0729416358')))
+
+    def setUp(self):
+        guess_cache.clear()
+        self.addCleanup(guess_cache.clear)
+
+    def relabelled(self, ai_player: AdvancedAIPlayer) -> AdvancedAIPlayer:
+        """같은 결과를 받은 변환된 추측 기록의 AI"""
+        other = AdvancedAIPlayer('expert')
+        other.initialize_game(ai_player.digit_count)
+        for entry in ai_player.guess_history:
+            other.update_knowledge(self.SYMMETRY.apply(entry['guess']), dict(entry['result']))
+        return other
+
+    # 오프닝 북 밖(추측 3개)의 작은 국면도 캐시하도록 문턱을 없앤다
+    @mock.patch('baseball.ai_logic.GUESS_CACHE_MIN_WORK', 0)
+    def test_relabelled_position_restores_cached_guess(self):
+        table = get_feedback_table(4)
+        for ai_player in sampled_players(4, 5, 3, seed=10):
+            other = self.relabelled(ai_player)
+            pool = other.candidate_indices()
+            with self.subTest(history=ai_player.guess_history):
+                self.assertEqual(canonical_state(other.guess_history, 4).key,
+                                 canonical_state(ai_player.guess_history, 4).key)
+                self.assertEqual(sorted(table.numbers[i] for i in pool),
+                                 sorted(self.SYMMETRY.apply(table.numbers[i])
+                                        for i in ai_player.candidate_indices()))
+
+                ai_player.make_guess()
+                hits = guess_cache.hits
+                guess = other.make_guess()
+                self.assertEqual(guess_cache.hits, hits + 1)
+
+                # 되돌린 추측은 변환된 국면을 직접 탐색한 추측과 같은 분할 품질이어야 한다
+                searched = table.numbers[minimax_guess(table, pool)]
+                self.assertEqual(worst_group(table, pool, guess), worst_group(table, pool, searched))
+                self.assertEqual(table.index[guess] in set(pool.tolist()),
+                                 table.index[searched] in set(pool.tolist()))
+
+    def test_small_positions_are_not_cached(self):
+        for ai_player in sampled_players(3, 3, 3, seed=11):
+            ai_player.make_guess()
+        self.assertEqual(guess_cache.stats()['entries'], 0)
+
+
+class GuessRankingTests(TestCase):
+    """사람 추측 평가의 점수 분포가 모든 추측을 직접 평가한 결과와 같고, 대칭인 국면에서 캐시가 맞게 쓰이는지"""
+
+    def setUp(self):
+        coaching.ranking_cache.clear()
+        self.addCleanup(coaching.ranking_cache.clear)
+
+    def brute_force_scores(self, table, pool) -> np.ndarray:
+        """모든 합법 추측의 그룹 크기 제곱합 (동치 추측 묶음 없이 문자열 채점)"""
+        secrets = [table.numbers[i] for i in pool]
+        scores = []
+        for guess in table.numbers:
+            counts = np.bincount([encode_result(*score_guess(guess, secret), table.digit_count)
+                                  for secret in secrets], minlength=table.code_count)
+            scores.append(int((counts * counts).sum()))
+        return np.array(scores)
+
+    def test_ranking_matches_brute_force(self):
+        table = get_feedback_table(3)
+        for ai_player in sampled_players(3, 6, 2, seed=30):
+            pool = ai_player.candidate_indices()
+            scores = self.brute_force_scores(table, pool)
+            worst = partition_counts(table, np.arange(table.size), pool).max(axis=1)
+            ranking = coaching.build_ranking(table, pool, ai_player.guess_history)
+            with self.subTest(history=ai_player.guess_history):
+                self.assertEqual(ranking.total, table.size)
+                self.assertEqual(ranking.scores.tolist(), sorted(set(scores.tolist())))
+                self.assertEqual(ranking.best_worst_case, int(worst.min()))
+                for guess_index in range(0, table.size, 7):
+                    score = int(scores[guess_index])
+                    self.assertEqual(ranking.rank(score), 1 + int((scores < score).sum()))
+
+    def test_relabelled_position_reuses_cached_ranking(self):
+        table = get_feedback_table(4)
+        symmetry = CanonicalCacheTests.SYMMETRY
+        for ai_player in sampled_players(4, 3, 3, seed=31):
+            history = [{'guess': symmetry.apply(entry['guess']), 'result': dict(entry['result'])}
+                       for entry in ai_player.guess_history]
+            pool = np.array(sorted(table.index[symmetry.apply(table.numbers[i])]
+                                   for i in ai_player.candidate_indices()))
+            guesses = ('1234', '5678', table.numbers[pool[0]])
+            with self.subTest(history=ai_player.guess_history):
+                coaching.get_ranking(table, ai_player.candidate_indices(), ai_player.guess_history)
+                hits = coaching.ranking_cache.hits
+                cached = [coaching.score_guess_quality(table, pool, history, guess) for guess in guesses]
+                self.assertEqual(coaching.ranking_cache.hits, hits + len(guesses))
+
+                # 캐시 없이 변환된 국면을 직접 평가한 결과와 같아야 한다
+                coaching.ranking_cache.clear()
+                self.assertEqual([coaching.score_guess_quality(table, pool, history, guess) for guess in guesses],
+                                 cached)
+
+
+class SpeculationTests(TestCase):
+    """응답 뒤 미리 계산한 국면 점수 분포를 다음 추측 평가에 쓰고, 국면이 바뀌면 버리는지"""
+
+    def setUp(self):
+        coaching.ranking_cache.clear()
+        self.addCleanup(coaching.ranking_cache.clear)
+
+    def test_prefetched_ranking_is_used_for_same_position(self):
+        ai_player = sampled_players(4, 1, 2, seed=40)[0]
+        speculation.speculate(ai_player)
+        ai_player.pending_work.future.result()
+        ranking = speculation.take_ranking(ai_player)
+        self.assertIsNone(ai_player.pending_work)
+        expected = coaching.build_ranking(ai_player.feedback_table, ai_player.candidate_indices(),
+                                          ai_player.guess_history)
+        self.assertEqual(ranking.scores.tolist(), expected.scores.tolist())
+        self.assertEqual(ranking.cumulative.tolist(), expected.cumulative.tolist())
+        self.assertEqual(ranking.best_worst_case, expected.best_worst_case)
+
+    def test_prefetched_ranking_is_dropped_after_new_guess(self):
+        ai_player = sampled_players(4, 1, 2, seed=41)[0]
+        speculation.speculate(ai_player)
+        ai_player.update_knowledge('1234', {'strikes': 0, 'balls': 0})
+        self.assertIsNone(speculation.take_ranking(ai_player))
+
+    @override_settings(BASEBALL_AI_SPECULATION_WORKERS=0)
+    def test_disabled_speculation_leaves_no_work(self):
+        ai_player = sampled_players(4, 1, 2, seed=42)[0]
+        speculation.speculate(ai_player)
+        self.assertIsNone(ai_player.pending_work)
+        self.assertIsNone(speculation.take_ranking(ai_player))
+
+
+class GuessPruningTests(TestCase):
+    """동치인 추측을 묶어 대표만 평가한 탐색이 전체 탐색과 같은 추측을 고르는지"""
+
+    def test_pruned_search_matches_full_search(self):
+        for digit_count, guesses in SAMPLED_POOLS + ((4, 1),):
+            table = get_feedback_table(digit_count)
+            for ai_player in sampled_players(digit_count, 4, guesses, seed=digit_count * 1000 + guesses):
+                pool = ai_player.candidate_indices()
+                representatives = guess_representatives(table, ai_player.guess_history)
+                with self.subTest(digit_count=digit_count, history=ai_player.guess_history):
+                    self.assertEqual(minimax_guess(table, pool, representatives), minimax_guess(table, pool))
+
+    def test_classes_cover_every_guess(self):
+        for ai_player in sampled_players(4, 3, 2, seed=5):
+            table = ai_player.feedback_table
+            representatives, sizes = guess_classes(table, ai_player.guess_history)
+            self.assertEqual(int(sizes.sum()), table.size)
+            self.assertEqual(len(set(representatives.tolist())), len(representatives))
+
+
+class AIStatsTests(TestCase):
+    """난이도별 누적 통계 행과 순위표 평균 라운드"""
+
+    def setUp(self):
+        cache.delete(LEADERBOARD_CACHE_KEY)
+        self.addCleanup(cache.delete, LEADERBOARD_CACHE_KEY)
+
+    def test_record_game_accumulates_in_one_row(self):
+        results = [(True, 7), (False, 20), (True, 5), (True, 9)]
+        for won, rounds in results:
+            AIPlayer.record_game('hard', won, rounds)
+
+        self.assertEqual(AIPlayer.objects.filter(difficulty='hard').count(), 1)
+        ai_player = AIPlayer.objects.get(difficulty='hard')
+        self.assertEqual((ai_player.total_games, ai_player.win_count, ai_player.loss_count), (4, 3, 1))
+        self.assertEqual(ai_player.sum_rounds, 41)
+        self.assertEqual(ai_player.average_rounds, 41 / 4)
+        self.assertEqual(ai_player.win_rate, 75.0)
+
+    def test_stale_instances_do_not_lose_updates(self):
+        AIPlayer.record_game('normal', True, 6)
+        # 같은 행을 먼저 읽어 둔 두 요청이 차례로 결과를 반영해도 둘 다 남아야 한다 (save()였다면 하나가 덮어씀)
+        first = AIPlayer.objects.get(difficulty='normal')
+        second = AIPlayer.objects.get(difficulty='normal')
+        first.update_stats(False, 10)
+        second.update_stats(True, 8)
+
+        ai_player = AIPlayer.objects.get(difficulty='normal')
+        self.assertEqual((ai_player.total_games, ai_player.win_count, ai_player.sum_rounds), (3, 2, 24))
+
+    def test_leaderboard_reports_aggregated_averages(self):
+        for won, rounds in [(True, 6), (True, 8), (False, 20)]:
+            AIPlayer.record_game('expert', won, rounds)
+        AIPlayer.record_game('easy', False, 12)
+
+        leaderboard = self.client.get(reverse('baseball:ai_leaderboard')).json()['leaderboard']
+        rows = {row['difficulty']: row for row in leaderboard}
+        self.assertEqual([row['difficulty'] for row in leaderboard], ['expert', 'easy'])
+        self.assertEqual(rows['expert']['totalGames'], 3)
+        self.assertAlmostEqual(rows['expert']['averageRounds'], 34 / 3)
+        self.assertAlmostEqual(rows['expert']['winRate'], 200 / 3)
+        self.assertEqual(rows['easy']['averageRounds'], 12)
+
+
+class AIPlayerMigrationTests(TransactionTestCase):
+    """0004 마이그레이션이 난이도별 중복 행을 라운드 합계로 합치는지"""
+
+    migrate_from = [('baseball', '0003_ai_state')]
+    migrate_to = [('baseball', '0004_ai_player_aggregates')]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicate_rows_are_merged(self):
+        old_apps = self.migrate(self.migrate_from)
+        OldAIPlayer = old_apps.get_model('baseball', 'AIPlayer')
+        OldAIPlayer.objects.create(difficulty='hard', win_count=3, loss_count=1, total_games=4, average_rounds=7.5)
+        OldAIPlayer.objects.create(difficulty='hard', win_count=1, loss_count=1, total_games=2, average_rounds=9.0)
+        OldAIPlayer.objects.create(difficulty='easy', win_count=0, loss_count=1, total_games=1, average_rounds=20.0)
+
+        new_apps = self.migrate(self.migrate_to)
+        NewAIPlayer = new_apps.get_model('baseball', 'AIPlayer')
+        rows = {row.difficulty: row for row in NewAIPlayer.objects.all()}
+        self.assertEqual(sorted(rows), ['easy', 'hard'])
+        hard = rows['hard']
+        self.assertEqual((hard.win_count, hard.loss_count, hard.total_games, hard.sum_rounds), (4, 2, 6, 48))
+        self.assertEqual(rows['easy'].sum_rounds, 20)
+
+
+class DigitOddsTests(TestCase):
+    """후보 풀의 자리별 숫자 확률과 전문가 힌트 요약"""
+
+    def brute_force_odds(self, numbers):
+        """후보 숫자 문자열을 하나씩 세어 만든 (자리별 확률, 포함 확률)"""
+        digit_count = len(numbers[0])
+        positions = [[sum(number[p] == str(d) for number in numbers) / len(numbers) for d in range(10)]
+                     for p in range(digit_count)]
+        presence = [sum(str(d) in number for number in numbers) / len(numbers) for d in range(10)]
+        return positions, presence
+
+    def test_odds_match_brute_force(self):
+        for digit_count, guesses in SAMPLED_POOLS:
+            table = get_feedback_table(digit_count)
+            for ai_player in sampled_players(digit_count, 3, guesses, seed=digit_count + guesses):
+                numbers = [table.numbers[i] for i in ai_player.candidate_indices()]
+                positions, presence = self.brute_force_odds(numbers)
+                odds = ai_player.digit_odds()
+                with self.subTest(digit_count=digit_count, history=ai_player.guess_history):
+                    self.assertEqual(odds.pool_size, len(numbers))
+                    self.assertTrue(np.allclose(odds.positions, positions))
+                    self.assertTrue(np.allclose(odds.presence, presence))
+                    self.assertEqual(odds.certain_in, [d for d in range(10) if presence[d] == 1.0])
+                    self.assertEqual(odds.certain_out, [d for d in range(10) if presence[d] == 0.0])
+
+    def test_streaming_odds_match_table_odds(self):
+        table_player = create_ai_player('expert', 4)
+        streaming_player = StreamingAIPlayer('expert')
+        streaming_player.initialize_game(4)
+        for guess in ('1234', '5678'):
+            strikes, balls = score_guess(guess, '2815')
+            for ai_player in (table_player, streaming_player):
+                ai_player.update_knowledge(guess, {'strikes': strikes, 'balls': balls})
+        self.assertTrue(np.allclose(streaming_player.digit_odds().positions, table_player.digit_odds().positions))
+        self.assertTrue(np.allclose(streaming_player.digit_odds().presence, table_player.digit_odds().presence))
+
+    def test_odds_are_cached_per_round(self):
+        ai_player = create_ai_player('expert', 3)
+        ai_player.update_knowledge('123', {'strikes': 0, 'balls': 1})
+        odds = ai_player.digit_odds()
+        self.assertIs(ai_player.digit_odds(), odds)
+        ai_player.update_knowledge('456', {'strikes': 1, 'balls': 0})
+        self.assertIsNot(ai_player.digit_odds(), odds)
+        self.assertEqual(ai_player.digit_odds().pool_size, ai_player.candidate_count())
+
+    def test_description(self):
+        table = get_feedback_table(3)
+        # 정답 후보 '123', '124', '125': 1과 2는 확정, 첫째/둘째 자리는 확실, 셋째 자리는 동률이라 생략
+        odds = digit_odds(table, np.array([table.index[number] for number in ('123', '124', '125')]))
+        description = describe_odds(odds)
+        self.assertIn('확실히 포함: 1, 2', description)
+        self.assertIn('확실히 제외: 0, 6, 7, 8, 9', description)
+        self.assertIn('유력: 1번째 1(100%) 2번째 2(100%)', description)
+        self.assertNotIn('3번째', description)
+        self.assertEqual(describe_odds(digit_odds(table, np.array([], dtype=np.int64))), '남은 후보 없음')
+
+
+class SimulationTests(TestCase):
+    """일괄 자가 대국의 재현성과 API 제한"""
+
+    def test_simulation_leaves_global_random_untouched(self):
+        state = random.getstate()
+        list(simulate(['normal'], [3], 5, seed=1))
+        self.assertEqual(random.getstate(), state)
+
+    def test_results_do_not_depend_on_other_jobs(self):
+        alone = list(simulate(['hard'], [3], 30, seed=2))
+        together = [row for row in simulate(['easy', 'hard'], [3], 30, seed=2) if row['difficulty'] == 'hard']
+        self.assertEqual(together, alone)
+        self.assertNotEqual(list(simulate(['hard'], [3], 30, seed=3)), alone)
+
+    def test_endpoint_requires_staff_and_caps_games(self):
+        url = reverse('baseball:simulate_ai')
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.force_login(User.objects.create_user('staff', is_staff=True))
+        self.assertEqual(self.client.get(url, {'games': 100, 'digits': 3}).status_code, 400)
+        response = self.client.get(url, {'games': 5, 'digits': 3, 'difficulty': 'expert'})
+        self.assertEqual(response.status_code, 200)
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        self.assertEqual([(row['digitCount'], row['difficulty'], row['games']) for row in rows], [(3, 'expert', 5)])
+
+
+class HardSecretTests(TestCase):
+    """전문가 정답 순위표가 모든 정답의 순열이고, 고른 정답이 순위표 상위에서만 나오는지"""
+
+    def test_tables_rank_every_secret_hardest_first(self):
+        for digit_count in (3, 4, 5):
+            table = get_feedback_table(digit_count)
+            ranked, count = hard_secrets.load_hard_secrets(digit_count)
+            with self.subTest(digit_count=digit_count):
+                self.assertEqual(sorted(ranked[:, 0].tolist()), list(range(table.size)))
+                self.assertTrue(np.all(np.diff(ranked[:, 1].astype(np.int32)) <= 0))
+                self.assertEqual(count, math.ceil(table.size * hard_secrets.HARDEST_SHARE))
+
+    def test_stored_counts_match_current_ai(self):
+        ranked, count = hard_secrets.load_hard_secrets(3)
+        for position in (0, count - 1, len(ranked) // 2, len(ranked) - 1):
+            index, guesses = int(ranked[position, 0]), int(ranked[position, 1])
+            with self.subTest(position=position):
+                self.assertEqual(hard_secrets.solve_counts(3, index, index + 1).tolist(), [guesses])
+
+    def test_picked_secrets_come_from_the_top_of_the_table(self):
+        rng = random.Random(24)
+        for digit_count in (3, 4, 5):
+            table = get_feedback_table(digit_count)
+            ranked, count = hard_secrets.load_hard_secrets(digit_count)
+            hardest = {table.numbers[i] for i in ranked[:count, 0]}
+            picked = {hard_secrets.pick_hard_secret(digit_count, rng) for _ in range(200)}
+            with self.subTest(digit_count=digit_count):
+                self.assertLessEqual(picked, hardest)
+                self.assertGreater(len(picked), 1)
+                for secret in picked:
+                    self.assertTrue(validate_guess(secret, digit_count)['valid'], secret)
+                self.assertIn(generate_secret_number(digit_count, 'expert', rng=rng), hardest)
+
+        self.assertIsNone(hard_secrets.pick_hard_secret(7, rng))
+
+
+class NumberUniverseTests(TestCase):
+    """계산으로 푸는 후보 목록의 인덱스 <-> 숫자 변환이 전단사인지"""
+
+    def assertBijective(self, universe, indices):
+        numbers = [universe.number(index) for index in indices]
+        self.assertEqual([universe.index(number) for number in numbers], list(indices))
+        self.assertEqual([''.join(map(str, row)) for row in universe.digits(np.array(indices))], numbers)
+        # 정규 순서는 숫자 크기 순
+        self.assertEqual(numbers, sorted(numbers))
+        self.assertTrue(all(number[0] != '0' and len(number) == universe.digit_count for number in numbers))
+        if not universe.allow_repeats:
+            self.assertTrue(all(len(set(number)) == len(number) for number in numbers))
+
+    def test_small_universes_are_enumerated_exactly(self):
+        for digit_count in (3, 4):
+            universe = NumberUniverse(digit_count)
+            with self.subTest(digit_count=digit_count):
+                self.assertEqual(len(universe), get_feedback_table(digit_count).size)
+                self.assertEqual([universe.number(i) for i in range(len(universe))],
+                                 list(get_feedback_table(digit_count).numbers))
+                self.assertBijective(universe, range(len(universe)))
+
+        universe = NumberUniverse(4, allow_repeats=True)
+        self.assertEqual(len(universe), 9000)
+        self.assertEqual([universe.number(i) for i in range(len(universe))], [str(n) for n in range(1000, 10000)])
+
+    def test_large_universes_round_trip_sampled_indices(self):
+        rng = np.random.default_rng(4)
+        for digit_count, allow_repeats in ((6, False), (8, False), (10, False), (7, True)):
+            universe = get_universe(digit_count, allow_repeats)
+            indices = sorted(set(rng.integers(0, len(universe), 500).tolist()) | {0, len(universe) - 1})
+            with self.subTest(digit_count=digit_count, allow_repeats=allow_repeats):
+                self.assertBijective(universe, indices)
+
+        self.assertEqual(get_universe(10).number(0), '1023456789')
+        self.assertEqual(get_universe(10).number(len(get_universe(10)) - 1), '9876543210')
+
+    def test_invalid_numbers_have_no_index(self):
+        universe = get_universe(6)
+        for number in ('012345', '112345', '12345', '1234567', '12a456'):
+            with self.subTest(number=number):
+                self.assertIsNone(universe.index(number))
+        self.assertEqual(get_universe(6, allow_repeats=True).index('112345'), 12345)
+
+    def test_chunks_cover_selected_indices(self):
+        universe = get_universe(6)
+        indices = np.arange(0, len(universe), 7)
+        with mock.patch('baseball.universe.CHUNK_SIZE', 1000):
+            chunks = list(universe.chunks(indices))
+        self.assertEqual(np.concatenate([chunk for chunk, _ in chunks]).tolist(), indices.tolist())
+        for chunk, digits in chunks[:3]:
+            self.assertEqual(digits.tolist(), universe.digits(chunk).tolist())
+
+
+class StreamingSolveTests(TestCase):
+    """스트리밍 AI가 긴 숫자와 중복 허용 정답을 정해진 추측 수 안에 맞히는지"""
+
+    def solve(self, difficulty: str, digit_count: int, secret: str, seed: int, allow_repeats: bool = False):
+        ai_player = create_ai_player(difficulty, digit_count, allow_repeats=allow_repeats)
+        self.assertIsInstance(ai_player, StreamingAIPlayer)
+        ai_player.rng.seed(seed)
+        play_turns(ai_player, secret, 12)
+        return ai_player.guess_history
+
+    def assertSolvedWithin(self, history, secret: str, turns: int):
+        self.assertEqual(history[-1]['guess'], secret)
+        self.assertLessEqual(len(history), turns)
+
+    def test_six_digit_secrets(self):
+        universe = get_universe(6)
+        rng = random.Random(6)
+        for seed in range(4):
+            secret = universe.number(rng.randrange(len(universe)))
+            with self.subTest(secret=secret):
+                self.assertSolvedWithin(self.solve('expert', 6, secret, seed), secret, 9)
+
+    def test_repeated_digit_secrets(self):
+        for digit_count, secret in ((3, '999'), (4, '1111'), (4, '1000'), (4, '7337'), (5, '12121')):
+            for difficulty in ('hard', 'expert'):
+                with self.subTest(secret=secret, difficulty=difficulty):
+                    history = self.solve(difficulty, digit_count, secret, seed=len(secret), allow_repeats=True)
+                    self.assertSolvedWithin(history, secret, 10)
+                    # 추측한 숫자는 모두 중복 허용 후보 목록 안의 숫자
+                    universe = get_universe(digit_count, allow_repeats=True)
+                    self.assertTrue(all(universe.index(entry['guess']) is not None for entry in history))
+
+
+class GameClientMixin:
+    """API로 게임을 시작하고 추측하는 도우미"""
+
+    def post(self, name: str, **data):
+        return self.client.post(reverse(name), json.dumps(data), content_type='application/json')
+
+    def start_game(self, secret: Optional[str] = None, **options) -> dict:
+        """게임 시작 (secret을 주면 정답을 고정)"""
+        options = {'playerName': '테스터', 'digitCount': 3, 'difficulty': 'normal', **options}
+        started = self.post('baseball:start_game', **options).json()
+        if secret:
+            BaseballGame.objects.filter(id=started['gameId']).update(secret_number=secret)
+        return started
+
+    def guess(self, game: dict, guess_number: str, round_number: Optional[int] = None):
+        data = {'gameId': game['gameId'], 'playerId': game['playerId'], 'guessNumber': guess_number}
+        if round_number is not None:
+            data['roundNumber'] = round_number
+        return self.post('baseball:make_guess', **data)
+
+
+class SessionEvictionTests(GameClientMixin, TestCase):
+    """세션 저장소에서 밀려난 AI는 DB 스냅샷으로 복원되어 게임이 이어지는지"""
+
+    def setUp(self):
+        ai_players.clear()
+        self.addCleanup(ai_players.clear)
+
+    def test_evicted_ai_is_restored_from_database(self):
+        game = self.start_game(secret='987')
+        self.assertEqual(self.guess(game, '123', round_number=1).status_code, 200)
+        evicted = ai_players.stats()['evicted']
+
+        # 상한을 1바이트로 낮추면 새 게임의 AI만 남고 앞 게임의 AI는 밀려난다
+        with mock.patch.object(ai_players, 'max_bytes', 1):
+            self.start_game(secret='456')
+        self.assertEqual(ai_players.stats()['evicted'], evicted + 1)
+        self.assertIsNone(ai_players.get(game['playerId']))
+
+        response = self.guess(game, '456', round_number=3)
+        self.assertEqual(response.status_code, 200)
+        restored = ai_players.get(game['playerId'])
+        player_guesses = BaseballGuess.objects.filter(game_id=game['gameId'], is_ai_guess=False)
+        self.assertEqual([entry['guess'] for entry in restored.guess_history],
+                         list(player_guesses.order_by('round_number').values_list('guess_number', flat=True)))
+
+
+class TurnReplayTests(GameClientMixin, TestCase):
+    """재전송된 라운드는 기록된 결과로 응답하고, 다른 추측이면 409"""
+
+    def test_replayed_round_returns_recorded_result(self):
+        game = self.start_game(secret='987')
+        first = self.guess(game, '123', round_number=1)
+        self.assertEqual(first.status_code, 200)
+        recorded = BaseballGuess.objects.filter(game_id=game['gameId']).count()
+
+        replayed = self.guess(game, '123', round_number=1)
+        self.assertEqual(replayed.status_code, 200)
+        for key in ('strikes', 'balls', 'currentRound', 'aiGuess'):
+            self.assertEqual(replayed.json().get(key), first.json().get(key))
+        self.assertEqual(BaseballGuess.objects.filter(game_id=game['gameId']).count(), recorded)
+
+    def test_different_guess_for_recorded_round_conflicts(self):
+        game = self.start_game(secret='987')
+        self.assertEqual(self.guess(game, '123', round_number=1).status_code, 200)
+        current_round = BaseballGame.objects.get(id=game['gameId']).current_round
+
+        response = self.guess(game, '456', round_number=1)
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(response.json()['success'])
+        self.assertEqual(BaseballGame.objects.get(id=game['gameId']).current_round, current_round)
+
+    def test_non_integer_round_number_is_rejected(self):
+        game = self.start_game(secret='987')
+        for round_number in ('abc', [1]):
+            with self.subTest(round_number=round_number):
+                self.assertEqual(self.guess(game, '123', round_number=round_number).status_code, 400)
+        self.assertFalse(BaseballGuess.objects.filter(game_id=game['gameId']).exists())
+
+
+class GameStatusETagTests(GameClientMixin, TestCase):
+    """게임 상태 조회의 ETag 재검증"""
+
+    def status(self, game: dict, **headers):
+        return self.client.get(reverse('baseball:game_status', args=[game['gameId']]), **headers)
+
+    def test_matching_etag_returns_not_modified(self):
+        game = self.start_game(secret='987')
+        first = self.status(game)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['Cache-Control'], 'no-cache')
+
+        cached = self.status(game, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(cached['ETag'], first['ETag'])
+        self.assertEqual(cached.content, b'')
+
+    def test_new_guess_changes_etag(self):
+        game = self.start_game(secret='987')
+        etag = self.status(game)['ETag']
+        self.guess(game, '123', round_number=1)
+
+        response = self.status(game, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.json()['game']['guesses'][0]['guessNumber'], '123')
+
+    def test_etag_depends_on_since_round(self):
+        game = self.start_game(secret='987')
+        self.guess(game, '123', round_number=1)
+        etag = self.status(game)['ETag']
+        url = reverse('baseball:game_status', args=[game['gameId']])
+        response = self.client.get(url, {'since_round': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(guess['roundNumber'] > 1 for guess in response.json()['game']['guesses']))
+
+
+class DefenderAuditTests(GameClientMixin, TestCase):
+    """악당 수비 모드 - 끝날 때 공개한 정답이 기록된 모든 답과 일치하는지"""
+
+    def play_to_end(self, digit_count: int):
+        """기록과 맞는 후보 중 첫 숫자로 계속 추측해 게임을 끝까지 진행 (AI 추측의 답도 반영)
+
+        끝난 게임과 마지막 응답을 반환한다.
+        """
+        table = get_feedback_table(digit_count)
+        game = self.start_game(digitCount=digit_count, difficulty='expert', adversarial=True)
+        candidates = list(table.numbers)
+        round_number = 1
+        while True:
+            guess_number = candidates[0]
+            response = self.guess(game, guess_number, round_number=round_number)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            answers = [(guess_number, data['strikes'], data['balls'])]
+            if 'aiGuess' in data:
+                answers.append((data['aiGuess']['guess'], data['aiGuess']['strikes'], data['aiGuess']['balls']))
+            if data['gameOver'] or data.get('aiGuess', {}).get('gameOver'):
+                return BaseballGame.objects.get(id=game['gameId']), data
+            for guess, strikes, balls in answers:
+                candidates = [number for number in candidates if score_guess(guess, number) == (strikes, balls)]
+            self.assertTrue(candidates)
+            # 마지막 답 뒤 남은 후보 수 (AI가 추측했으면 AI 추측에 대한 답 뒤)
+            self.assertEqual(data.get('aiGuess', data)['candidatesLeft'], len(candidates))
+            round_number = data['currentRound']
+
+    def test_revealed_secret_matches_every_recorded_answer(self):
+        for digit_count in (3, 4):
+            with self.subTest(digit_count=digit_count):
+                game, data = self.play_to_end(digit_count)
+                self.assertEqual(game.game_status, 'finished')
+                self.assertEqual(data['secretNumber'], game.secret_number)
+                self.assertTrue(data['answersVerified'])
+                guesses = list(game.guesses.all())
+                self.assertTrue(guesses)
+                for guess in guesses:
+                    self.assertEqual(score_guess(guess.guess_number, game.secret_number),
+                                     (guess.strikes, guess.balls), guess.guess_number)
+
+    def test_audit_detects_a_wrong_answer(self):
+        game, _ = self.play_to_end(3)
+        guesses = list(game.guesses.all())
+        self.assertTrue(defender.verify_answers(game.secret_number, guesses))
+        guesses[0].balls += 1
+        self.assertFalse(defender.verify_answers(game.secret_number, guesses))
+
+
+class MultiBoardReplayTests(GameClientMixin, TestCase):
+    """여러 판 모드 AI를 DB의 추측 기록만으로 같은 상태로 복원하는지"""
+
+    SECRETS = '987,654,321'
+
+    def play(self, guesses) -> dict:
+        """정답을 고정한 3판 게임에서 guesses를 차례로 추측"""
+        game = self.start_game(boardCount=3)
+        BaseballGame.objects.filter(id=game['gameId']).update(board_secrets=self.SECRETS)
+        round_number = 1
+        for guess_number in guesses:
+            response = self.guess(game, guess_number, round_number=round_number)
+            self.assertEqual(response.status_code, 200)
+            round_number = response.json()['currentRound']
+        return game
+
+    def test_replayed_guesses_rebuild_the_same_ai(self):
+        game = self.play(['123', '456', '780'])
+        cached = ai_players.get(game['playerId'])
+        self.assertIsInstance(cached, MultiBoardAIPlayer)
+
+        restored = load_ai_player(BaseballGame.objects.get(id=game['gameId']))
+        self.assertEqual(restored.guess_history, cached.guess_history)
+        self.assertEqual(restored.solved, cached.solved)
+        for restored_pool, cached_pool in zip(restored.pools, cached.pools):
+            self.assertEqual(restored_pool.tolist(), cached_pool.tolist())
+        self.assertEqual(restored.make_guess(), cached.make_guess())
+
+    def test_evicted_ai_continues_from_the_database(self):
+        game = self.play(['123'])
+        ai_players.pop(game['playerId'])
+        current_round = BaseballGame.objects.get(id=game['gameId']).current_round
+        response = self.guess(game, '456', round_number=current_round)
+        self.assertEqual(response.status_code, 200)
+        # 복원된 AI는 사람과 AI의 모든 추측을 반영한 상태여야 한다
+        restored = ai_players.get(game['playerId'])
+        self.assertEqual(restored.turn_count(), BaseballGame.objects.get(id=game['gameId']).current_round - 1)
+
+    def test_replayed_round_returns_board_results(self):
+        game = self.play([])
+        first = self.guess(game, '123', round_number=1)
+        replayed = self.guess(game, '123', round_number=1)
+        self.assertEqual(replayed.status_code, 200)
+        self.assertEqual(replayed.json()['boardResults'], first.json()['boardResults'])
+        self.assertEqual(first.json()['boardResults'], [list(score_guess('123', secret))
+                                                        for secret in self.SECRETS.split(',')])
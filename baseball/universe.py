@@ -0,0 +1,160 @@
+import math
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+# 피드백 테이블(전체 숫자 목록과 행렬)을 쓰는 최대 자릿수 - 이보다 길거나 중복을 허용하면 스트리밍
+TABLE_MAX_DIGITS = 5
+MAX_DIGITS = 10
+
+# 스트리밍으로 훑을 수 있는 최대 후보 수 (중복 허용 7자리 = 900만)
+MAX_UNIVERSE_SIZE = 10_000_000
+
+# 한 번에 숫자로 풀어 계산하는 후보 수
+CHUNK_SIZE = 1 << 18
+
+
+def _nth_unused_table() -> np.ndarray:
+    """(이미 쓴 숫자 마스크, k) -> 남은 숫자 중 k번째로 작은 숫자"""
+    table = np.zeros((1 << 10, 10), dtype=np.int16)
+    for used in range(1 << 10):
+        unused = [digit for digit in range(10) if not used >> digit & 1]
+        table[used, :len(unused)] = unused
+    return table
+
+
+_NTH_UNUSED = _nth_unused_table()
+
+
+def universe_size(digit_count: int, allow_repeats: bool = False) -> int:
+    """첫 자리가 0이 아닌 숫자의 개수"""
+    if allow_repeats:
+        return 9 * 10 ** (digit_count - 1)
+    return 9 * math.perm(9, digit_count - 1)
+
+
+def is_supported(digit_count: int, allow_repeats: bool = False) -> bool:
+    """게임으로 열 수 있는 (자릿수, 중복 허용) 조합인지"""
+    return (3 <= digit_count <= MAX_DIGITS and
+            universe_size(digit_count, allow_repeats) <= MAX_UNIVERSE_SIZE)
+
+
+def uses_feedback_table(digit_count: int, allow_repeats: bool = False) -> bool:
+    """전체 피드백 테이블을 미리 만들어 정확한 탐색을 하는 조합인지"""
+    return not allow_repeats and digit_count <= TABLE_MAX_DIGITS
+
+
+def feedback_codes(guess_digits: np.ndarray, secret_digits: np.ndarray) -> np.ndarray:
+    """추측 x 정답 숫자 배열의 피드백 코드 (중복 숫자 포함, score_guess와 같은 규칙)"""
+    digit_count = secret_digits.shape[1]
+    secret_masks = np.bitwise_or.reduce(
+        np.left_shift(1, secret_digits.astype(np.int16)), axis=1
+    )
+
+    strikes = np.zeros((len(guess_digits), len(secret_digits)), dtype=np.int8)
+    balls = np.zeros_like(strikes)
+    for position in range(digit_count):
+        guess_column = guess_digits[:, position, None].astype(np.int16)
+        hit = guess_column == secret_digits[None, :, position]
+        strikes += hit
+        balls += ~hit & ((secret_masks[None, :] >> guess_column) & 1).astype(bool)
+
+    return strikes * (digit_count + 1) + balls
+
+
+class NumberUniverse:
+    """자릿수별 후보 숫자 전체를 정규 순서로 나열한 가상 목록
+
+    숫자 목록을 만들지 않고 인덱스 <-> 숫자를 계산으로 변환하므로 10자리(약 326만 개)도
+    필요한 구간만 CHUNK_SIZE씩 풀어 쓴다. 중복을 허용하지 않으면 정규 순서는 피드백 테이블과 같다.
+    """
+
+    def __init__(self, digit_count: int, allow_repeats: bool = False):
+        self.digit_count = digit_count
+        self.allow_repeats = allow_repeats
+        self.size = universe_size(digit_count, allow_repeats)
+
+        if allow_repeats:
+            self._place_values = 10 ** np.arange(digit_count - 1, -1, -1, dtype=np.int64)
+        else:
+            # 첫 자리가 0인 순열은 사전 순으로 맨 앞에 모여 있으므로 그만큼 건너뛴다
+            self._offset = math.perm(9, digit_count - 1)
+            self._radices = np.array(
+                [math.perm(9 - position, digit_count - 1 - position) for position in range(digit_count)],
+                dtype=np.int64
+            )
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> str:
+        return self.number(index)
+
+    def digits(self, indices: np.ndarray) -> np.ndarray:
+        """인덱스 배열을 (개수 x 자릿수) int8 숫자 배열로 변환"""
+        indices = np.asarray(indices, dtype=np.int64)
+        if self.allow_repeats:
+            values = indices + 10 ** (self.digit_count - 1)
+            return (values[:, None] // self._place_values % 10).astype(np.int8)
+
+        ranks = indices + self._offset
+        result = np.empty((len(indices), self.digit_count), dtype=np.int8)
+        used = np.zeros(len(indices), dtype=np.int16)
+        for position in range(self.digit_count):
+            # 남은 숫자 중 choice번째 (레머 코드)
+            choice = ranks // self._radices[position] % (10 - position)
+            digit = _NTH_UNUSED[used, choice]
+            result[:, position] = digit
+            used |= np.left_shift(1, digit)
+        return result
+
+    def number(self, index: int) -> str:
+        """인덱스의 숫자 문자열"""
+        return ''.join(map(str, self.digits(np.array([index]))[0]))
+
+    def index(self, number: str) -> Optional[int]:
+        """숫자 문자열의 인덱스 (후보가 아니면 None)"""
+        if (len(number) != self.digit_count or not number.isdigit() or number[0] == '0' or
+                (not self.allow_repeats and len(set(number)) != len(number))):
+            return None
+        if self.allow_repeats:
+            return int(number) - 10 ** (self.digit_count - 1)
+
+        rank = 0
+        used = set()
+        for position, char in enumerate(number):
+            digit = int(char)
+            choice = digit - sum(1 for other in used if other < digit)
+            rank += choice * int(self._radices[position])
+            used.add(digit)
+        return rank - self._offset
+
+    def chunks(self, indices: Optional[np.ndarray] = None) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        """(인덱스, 숫자 배열) 구간을 차례로 생성 (indices가 없으면 전체)"""
+        if indices is None:
+            for start in range(0, self.size, CHUNK_SIZE):
+                chunk = np.arange(start, min(start + CHUNK_SIZE, self.size), dtype=np.int64)
+                yield chunk, self.digits(chunk)
+            return
+
+        for start in range(0, len(indices), CHUNK_SIZE):
+            chunk = np.asarray(indices[start:start + CHUNK_SIZE], dtype=np.int64)
+            yield chunk, self.digits(chunk)
+
+
+_universes: Dict[Tuple[int, bool], NumberUniverse] = {}
+_universes_lock = threading.Lock()
+
+
+def get_universe(digit_count: int, allow_repeats: bool = False) -> NumberUniverse:
+    """(자릿수, 중복 허용)별 공유 후보 목록"""
+    key = (digit_count, allow_repeats)
+    universe = _universes.get(key)
+    if universe is None:
+        with _universes_lock:
+            universe = _universes.get(key)
+            if universe is None:
+                universe = NumberUniverse(digit_count, allow_repeats)
+                _universes[key] = universe
+    return universe
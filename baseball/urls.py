@@ -11,4 +11,6 @@ urlpatterns = [
     path('restart/', views.restart_game, name='restart_game'),
     path('history/', views.game_history, name='game_history'),
     path('ai-stats/', views.get_ai_statistics, name='ai_statistics'),
+    path('ai-leaderboard/', views.ai_leaderboard, name='ai_leaderboard'),
+    path('ai-simulate/', views.simulate_ai, name='simulate_ai'),
 ]
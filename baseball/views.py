@@ -1,19 +1,55 @@
 from django.shortcuts import render, redirect
-from django.http import JsonResponse
+from django.http import HttpResponseNotModified, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
 import json
 import random
 import uuid
+from typing import Optional, Tuple
 from django.utils import timezone
+from django.utils.http import parse_etags
+from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
 
 from .models import BaseballGame, BaseballGuess, AIPlayer
-from .ai_logic import AdvancedAIPlayer
+from .ai_logic import AdvancedAIPlayer, create_ai_player, guess_cache
+from . import coaching, defender, feedback, speculation
+from .multiboard import MAX_BOARDS, MultiBoardAIPlayer, generate_board_secrets, replay_board_guesses, score_boards
+from .secret_numbers import generate_secret_number
+from .selfplay import simulate
+from .universe import MAX_DIGITS, is_supported, uses_feedback_table
+from game_collection.session_registry import create_registry
 
-# AI 플레이어 인스턴스들을 저장하는 전역 딕셔너리
-ai_players = {}
+# AI 플레이어 세션 저장소 (DB 스냅샷의 프로세스별 캐시, 유휴/메모리 초과 시 축출)
+ai_players = create_registry('baseball')
+
+LEADERBOARD_CACHE_KEY = 'baseball:ai_leaderboard'
+
+def get_ai_player(game: BaseballGame) -> AdvancedAIPlayer:
+    """게임의 AI 플레이어 조회 - 캐시에 없거나 다른 작업자가 진행했으면 DB에서 복원"""
+    def is_fresh(ai_player: AdvancedAIPlayer) -> bool:
+        if game.board_count > 1:
+            return ai_player.turn_count() == game.current_round - 1
+        return (not game.ai_state or
+                ai_player.turn_count() == AdvancedAIPlayer.snapshot_turn_count(game.ai_state))
+    
+    return ai_players.get_or_load(game.player_id, lambda: load_ai_player(game), is_fresh)
+
+def load_ai_player(game: BaseballGame) -> AdvancedAIPlayer:
+    """DB 스냅샷에서 AI 복원 (스냅샷이 없으면 플레이어의 추측 기록을 다시 반영해 재구성)"""
+    if game.board_count > 1:
+        # 여러 판 모드 AI는 턴 수로 시드를 정한 난수만 쓰므로 모든 추측 기록을 다시 반영하면 같은 상태가 된다
+        ai_player = MultiBoardAIPlayer(game.difficulty, game.digit_count, game.board_count)
+        return replay_board_guesses(ai_player, game.guesses.order_by('round_number'))
+    if game.ai_state:
+        return AdvancedAIPlayer.from_state(game.ai_state)
+    
+    ai_player = create_ai_player(game.difficulty, game.digit_count, game.allow_repeats)
+    for guess in game.guesses.filter(is_ai_guess=False).order_by('round_number'):
+        ai_player.update_knowledge(guess.guess_number, {'strikes': guess.strikes, 'balls': guess.balls})
+    return ai_player
 
 def index(request):
     """숫자야구 게임 메인 페이지"""
@@ -27,12 +63,34 @@ def start_game(request):
         data = json.loads(request.body)
         digit_count = int(data.get('digitCount', 3))
         difficulty = data.get('difficulty', 'normal')
+        allow_repeats = bool(data.get('allowRepeats', False))
+        adversarial = bool(data.get('adversarial', False))
+        board_count = int(data.get('boardCount', 1))
         
         # 입력 검증
-        if digit_count not in [3, 4, 5]:
+        if not is_supported(digit_count, allow_repeats):
             return JsonResponse({
                 'success': False,
-                'error': '자릿수는 3, 4, 5 중 하나여야 합니다.'
+                'error': f'자릿수는 3~{MAX_DIGITS} 중 하나여야 합니다. (숫자 중복 허용은 7자리까지)'
+            }, status=400)
+        
+        # 악당 수비는 매 추측마다 전체 후보를 피드백 테이블로 나누므로 테이블이 있는 조합만
+        if adversarial and not uses_feedback_table(digit_count, allow_repeats):
+            return JsonResponse({
+                'success': False,
+                'error': '악당 수비 모드는 숫자 중복 없는 3~5자리에서만 가능합니다.'
+            }, status=400)
+        
+        # 여러 판 모드는 판마다 후보 풀을 피드백 테이블로 나누므로 테이블이 있는 조합만
+        if not 1 <= board_count <= MAX_BOARDS:
+            return JsonResponse({
+                'success': False,
+                'error': f'판 수는 1~{MAX_BOARDS} 중 하나여야 합니다.'
+            }, status=400)
+        if board_count > 1 and (adversarial or not uses_feedback_table(digit_count, allow_repeats)):
+            return JsonResponse({
+                'success': False,
+                'error': '여러 판 모드는 숫자 중복 없는 3~5자리에서만 가능합니다. (악당 수비 모드와 함께 쓸 수 없음)'
             }, status=400)
         
         if difficulty not in ['easy', 'normal', 'hard', 'expert']:
@@ -44,12 +102,24 @@ def start_game(request):
         # 고유한 플레이어 ID 생성
         player_id = str(uuid.uuid4())
         
-        # 정답 숫자 생성 (서버에서 관리)
-        secret_number = generate_secret_number(digit_count, difficulty)
+        # 정답 숫자 생성 (서버에서 관리) - 악당 수비 모드는 정답 대신 후보 전체로 시작
+        # 여러 판 모드는 판마다 다른 정답 (secret_number는 첫 판 정답)
+        secret_number = ''
+        board_secrets = []
+        defender_pool = None
+        if adversarial:
+            defender_pool = defender.initial_pool(feedback.get_feedback_table(digit_count))
+        elif board_count > 1:
+            board_secrets = generate_board_secrets(digit_count, board_count)
+            secret_number = board_secrets[0]
+        else:
+            secret_number = generate_secret_number(digit_count, difficulty, allow_repeats)
         
-        # AI 플레이어 초기화
-        ai_player = AdvancedAIPlayer(difficulty)
-        ai_player.initialize_game(digit_count)
+        # AI 플레이어 초기화 (6자리 이상이나 중복 허용 게임은 스트리밍 AI, 여러 판 모드는 전용 AI)
+        if board_count > 1:
+            ai_player = MultiBoardAIPlayer(difficulty, digit_count, board_count)
+        else:
+            ai_player = create_ai_player(difficulty, digit_count, allow_repeats)
         ai_players[player_id] = ai_player
         
         # 게임 생성
@@ -57,10 +127,18 @@ def start_game(request):
             game = BaseballGame.objects.create(
                 secret_number=secret_number,
                 digit_count=digit_count,
+                allow_repeats=allow_repeats,
+                adversarial=adversarial,
+                defender_pool=defender_pool,
+                board_count=board_count,
+                board_secrets=','.join(board_secrets),
+                # 판이 하나 늘 때마다 라운드 6개 추가
+                max_rounds=20 + 6 * (board_count - 1),
                 difficulty=difficulty,
                 game_status='playing',
                 player_id=player_id,
                 ai_opponent=True,
+                ai_state=None if board_count > 1 else ai_player.export_state(),
                 started_at=timezone.now()
             )
         
@@ -69,6 +147,9 @@ def start_game(request):
             'gameId': game.id,
             'playerId': player_id,
             'digitCount': digit_count,
+            'allowRepeats': allow_repeats,
+            'adversarial': adversarial,
+            'boardCount': board_count,
             'difficulty': difficulty,
             'maxRounds': game.max_rounds,
             'message': f'{difficulty} 난이도의 {digit_count}자리 숫자야구 게임이 시작되었습니다!'
@@ -80,15 +161,20 @@ def start_game(request):
             'error': f'게임 시작 실패: {str(e)}'
         }, status=500)
 
+class TurnConflict(Exception):
+    """다른 요청이 같은 라운드를 먼저 기록함"""
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def make_guess(request):
-    """숫자 추측 - 서버에서 모든 검증 및 AI 처리"""
+    """숫자 추측 - 서버에서 모든 검증 및 AI 처리 (플레이어와 AI의 한 턴을 한 트랜잭션으로 기록)"""
     try:
         data = json.loads(request.body)
         game_id = data.get('gameId')
         player_id = data.get('playerId')
         guess_number = data.get('guessNumber')
+        # 클라이언트가 보고 있는 라운드 (재전송 판별용, 선택)
+        round_number = data.get('roundNumber')
         
         # 입력 검증
         if not all([game_id, player_id, guess_number]):
@@ -97,102 +183,63 @@ def make_guess(request):
                 'error': '필수 정보가 누락되었습니다.'
             }, status=400)
         
-        # 게임 조회
-        try:
-            game = BaseballGame.objects.get(id=game_id)
-        except BaseballGame.DoesNotExist:
-            return JsonResponse({
-                'success': False,
-                'error': '게임을 찾을 수 없습니다.'
-            }, status=404)
-        
-        # 게임 상태 확인
-        if game.game_status != 'playing':
-            return JsonResponse({
-                'success': False,
-                'error': '게임이 진행 중이 아닙니다.'
-            }, status=400)
-        
-        # 플레이어 ID 확인
-        if game.player_id != player_id:
-            return JsonResponse({
-                'success': False,
-                'error': '잘못된 플레이어 ID입니다.'
-            }, status=400)
+        if round_number is not None:
+            try:
+                round_number = int(round_number)
+            except (TypeError, ValueError):
+                return JsonResponse({
+                    'success': False,
+                    'error': 'roundNumber는 정수여야 합니다.'
+                }, status=400)
         
-        # 추측 숫자 검증
-        validation_result = validate_guess(guess_number, game.digit_count)
-        if not validation_result['valid']:
+        try:
+            with transaction.atomic():
+                # 게임 조회 (같은 게임의 동시 요청은 행 잠금으로 직렬화)
+                try:
+                    game = BaseballGame.objects.select_for_update().get(id=game_id)
+                except BaseballGame.DoesNotExist:
+                    return JsonResponse({
+                        'success': False,
+                        'error': '게임을 찾을 수 없습니다.'
+                    }, status=404)
+                
+                # 플레이어 ID 확인
+                if game.player_id != player_id:
+                    return JsonResponse({
+                        'success': False,
+                        'error': '잘못된 플레이어 ID입니다.'
+                    }, status=400)
+                
+                # 이미 기록된 라운드를 다시 보낸 요청이면 기록된 결과를 그대로 반환
+                if round_number is not None and round_number != game.current_round:
+                    return replay_turn(game, round_number, guess_number)
+                
+                # 게임 상태 확인
+                if game.game_status != 'playing':
+                    return JsonResponse({
+                        'success': False,
+                        'error': '게임이 진행 중이 아닙니다.'
+                    }, status=400)
+                
+                # 추측 숫자 검증
+                validation_result = validate_guess(guess_number, game.digit_count, game.allow_repeats)
+                if not validation_result['valid']:
+                    return JsonResponse({
+                        'success': False,
+                        'error': validation_result['error']
+                    }, status=400)
+                
+                commit = commit_board_turn if game.board_count > 1 else commit_turn
+                return JsonResponse(commit(game, guess_number))
+        except TurnConflict:
+            # 먼저 기록된 요청 기준으로 AI를 다시 복원하도록 캐시에서 제거
+            stale_player = ai_players.pop(player_id)
+            if stale_player:
+                speculation.cancel(stale_player)
             return JsonResponse({
                 'success': False,
-                'error': validation_result['error']
-            }, status=400)
-        
-        # 추측 결과 계산 (서버에서)
-        strikes, balls = calculate_result(guess_number, game.secret_number)
-        
-        # AI 힌트 생성
-        ai_player = ai_players.get(player_id)
-        ai_hint = ""
-        if ai_player:
-            ai_hint = ai_player.get_hint(guess_number, {'strikes': strikes, 'balls': balls})
-            # AI 지식 업데이트
-            ai_player.update_knowledge(guess_number, {'strikes': strikes, 'balls': balls})
-        
-        # 추측 기록 저장
-        with transaction.atomic():
-            guess = BaseballGuess.objects.create(
-                game=game,
-                guess_number=guess_number,
-                strikes=strikes,
-                balls=balls,
-                round_number=game.current_round,
-                ai_hint=ai_hint
-            )
-            
-            # 게임 상태 업데이트
-            game.current_round += 1
-            
-            # 승리 체크
-            if strikes == game.digit_count:
-                game.game_status = 'finished'
-                game.winner = 'player'
-                game.finished_at = timezone.now()
-            elif game.current_round > game.max_rounds:
-                game.game_status = 'finished'
-                game.winner = 'ai'
-                game.finished_at = timezone.now()
-            
-            game.save()
-        
-        # AI 차례 처리 (자동)
-        ai_guess_result = None
-        if game.game_status == 'playing' and ai_player:
-            ai_guess_result = process_ai_turn(game, ai_player)
-        
-        # 응답 데이터 구성
-        response_data = {
-            'success': True,
-            'strikes': strikes,
-            'balls': balls,
-            'gameOver': game.game_status == 'finished',
-            'winner': game.winner,
-            'currentRound': game.current_round,
-            'aiHint': ai_hint,
-            'difficulty': game.difficulty,
-            'remainingRounds': game.get_remaining_rounds()
-        }
-        
-        # 게임 종료 시 정답 공개
-        if game.game_status == 'finished':
-            response_data['secretNumber'] = game.secret_number
-            response_data['totalRounds'] = game.current_round - 1
-        
-        # AI 추측 결과가 있으면 추가
-        if ai_guess_result:
-            response_data['aiGuess'] = ai_guess_result
-        
-        return JsonResponse(response_data)
+                'error': '이미 처리된 라운드입니다. 게임 상태를 새로 고쳐주세요.'
+            }, status=409)
         
     except Exception as e:
         return JsonResponse({
@@ -200,7 +247,254 @@ def make_guess(request):
             'error': f'추측 처리 실패: {str(e)}'
         }, status=500)
 
-def validate_guess(guess_number: str, digit_count: int) -> dict:
+def commit_turn(game: BaseballGame, guess_number: str) -> dict:
+    """플레이어 추측과 이어지는 AI 추측을 기록하고 응답 데이터 반환
+    
+    호출자가 트랜잭션과 행 잠금을 잡고 있어야 한다. 게임 행은 읽은 라운드가 그대로일 때만
+    갱신하는 조건부 UPDATE 한 번, 추측은 bulk_create 한 번으로 저장한다.
+    AI는 플레이어 추측의 결과까지 반영한 뒤 추측하고, 플레이어의 다음 추측 평가에 쓸 국면 점수
+    분포는 응답 뒤 백그라운드에서 미리 계산해 둔다.
+    """
+    round_number = game.current_round
+    
+    # 추측 결과 계산 (서버에서)
+    strikes, balls, candidates_left = answer_guess(game, guess_number)
+    
+    # 추측 평가 뒤 지식 업데이트와 힌트 생성 (전문가 힌트는 이번 추측까지 반영한 후보 풀을 요약)
+    ai_player = get_ai_player(game) if game.ai_opponent else None
+    ai_hint = ""
+    guess_quality = None
+    if ai_player:
+        guess_quality = rate_guess(game, ai_player, guess_number)
+        ai_player.update_knowledge(guess_number, {'strikes': strikes, 'balls': balls})
+        ai_hint = ai_player.get_hint(guess_number, {'strikes': strikes, 'balls': balls})
+    
+    guesses = [BaseballGuess(
+        game=game,
+        guess_number=guess_number,
+        strikes=strikes,
+        balls=balls,
+        round_number=round_number,
+        ai_hint=ai_hint,
+        candidates_left=candidates_left
+    )]
+    
+    # 게임 상태 업데이트
+    game.current_round += 1
+    
+    # 승리 체크
+    if strikes == game.digit_count:
+        game.game_status = 'finished'
+        game.winner = 'player'
+        game.finished_at = timezone.now()
+    elif game.current_round > game.max_rounds:
+        game.game_status = 'finished'
+        game.winner = 'ai'
+        game.finished_at = timezone.now()
+    
+    # AI 차례 처리 (자동) - 플레이어의 이번 추측까지 반영한 후보 풀로 추측
+    ai_guess_result = None
+    ai_guess_number = next_ai_guess(ai_player) if game.game_status == 'playing' and ai_player else None
+    if ai_guess_number:
+        ai_guess, ai_guess_result = process_ai_turn(game, ai_guess_number)
+        if ai_guess:
+            guesses.append(ai_guess)
+    
+    if ai_player:
+        # 추측하면서 바뀐 난수 상태까지 저장
+        game.ai_state = ai_player.export_state()
+    
+    # 악당 수비 모드는 끝날 때 남은 후보 중 하나로 정답을 확정
+    if game.adversarial and game.game_status == 'finished':
+        commit_defender_secret(game)
+    
+    save_turn(game, round_number, guesses, ai_player)
+    return turn_response(game, strikes, balls, ai_hint, ai_guess_result, candidates_left, guess_quality)
+
+def commit_board_turn(game: BaseballGame, guess_number: str) -> dict:
+    """여러 판 모드의 한 턴 - 추측마다 모든 판의 정답과 비교하고, 모든 판을 먼저 맞힌 쪽이 승리
+    
+    판별 결과는 양쪽 모두에게 공개되므로 AI는 사람과 자신의 추측을 모두 반영한다.
+    기록의 strikes/balls는 모든 판의 합계이고, 판별 결과는 board_results에 둔다.
+    """
+    round_number = game.current_round
+    secrets = game.board_secrets.split(',')
+    results = score_boards(guess_number, secrets)
+    
+    ai_player = get_ai_player(game) if game.ai_opponent else None
+    ai_hint = ""
+    if ai_player:
+        ai_player.update_knowledge(guess_number, results)
+        ai_hint = ai_player.get_hint(guess_number, results)
+    
+    guesses = [board_guess(game, guess_number, results, round_number, ai_hint)]
+    game.current_round += 1
+    
+    if solved_boards(game, secrets, guess_number, is_ai_guess=False) == len(secrets):
+        game.game_status = 'finished'
+        game.winner = 'player'
+        game.finished_at = timezone.now()
+    elif game.current_round > game.max_rounds:
+        game.game_status = 'finished'
+        game.winner = 'ai'
+        game.finished_at = timezone.now()
+    
+    # AI 차례 처리 (자동) - 플레이어의 이번 추측까지 반영한 후보 풀로 추측
+    ai_guess_result = None
+    ai_guess_number = next_ai_guess(ai_player) if game.game_status == 'playing' and ai_player else None
+    if ai_guess_number:
+        ai_results = score_boards(ai_guess_number, secrets)
+        ai_player.update_knowledge(ai_guess_number, ai_results, is_ai_guess=True)
+        ai_guess = board_guess(game, ai_guess_number, ai_results, game.current_round, "AI의 추측입니다.",
+                               is_ai_guess=True)
+        guesses.append(ai_guess)
+        game.current_round += 1
+        
+        if solved_boards(game, secrets, ai_guess_number, is_ai_guess=True) == len(secrets):
+            game.game_status = 'finished'
+            game.winner = 'ai'
+            game.finished_at = timezone.now()
+        elif game.current_round > game.max_rounds:
+            game.game_status = 'finished'
+            game.winner = 'player'
+            game.finished_at = timezone.now()
+        
+        ai_guess_result = {
+            'guess': ai_guess_number,
+            'strikes': ai_guess.strikes,
+            'balls': ai_guess.balls,
+            'boardResults': ai_results,
+            'gameOver': game.game_status == 'finished',
+            'winner': game.winner
+        }
+    
+    save_turn(game, round_number, guesses, ai_player)
+    player_guess = guesses[0]
+    return turn_response(game, player_guess.strikes, player_guess.balls, ai_hint, ai_guess_result,
+                         board_results=results)
+
+def board_guess(game: BaseballGame, guess_number: str, results: list, round_number: int, ai_hint: str,
+                is_ai_guess: bool = False) -> BaseballGuess:
+    """여러 판 모드의 추측 기록 (strikes/balls는 모든 판의 합계)"""
+    return BaseballGuess(
+        game=game,
+        guess_number=guess_number,
+        strikes=sum(strikes for strikes, _ in results),
+        balls=sum(balls for _, balls in results),
+        round_number=round_number,
+        ai_hint=ai_hint,
+        is_ai_guess=is_ai_guess,
+        board_results=[list(result) for result in results]
+    )
+
+def solved_boards(game: BaseballGame, secrets: list, guess_number: str, is_ai_guess: bool) -> int:
+    """한쪽(사람 또는 AI)이 이번 추측까지 맞힌 판 수"""
+    found = set(game.guesses.filter(
+        is_ai_guess=is_ai_guess, guess_number__in=secrets
+    ).values_list('guess_number', flat=True))
+    found.add(guess_number)
+    return sum(secret in found for secret in secrets)
+
+def save_turn(game: BaseballGame, round_number: int, guesses: list, ai_player):
+    """턴 저장 - 조건부 UPDATE와 bulk_create, 종료 통계, 다음 추측 평가용 점수 분포 미리 계산 예약"""
+    updated = BaseballGame.objects.filter(
+        id=game.id, current_round=round_number, game_status='playing'
+    ).update(
+        current_round=game.current_round,
+        game_status=game.game_status,
+        winner=game.winner,
+        finished_at=game.finished_at,
+        ai_state=game.ai_state,
+        secret_number=game.secret_number,
+        defender_pool=game.defender_pool
+    )
+    if not updated:
+        raise TurnConflict(game.id)
+    BaseballGuess.objects.bulk_create(guesses)
+    
+    # 게임이 이번 턴에 끝났으면 난이도별 AI 통계에 반영 (조건부 UPDATE가 성공한 요청만 도달)
+    if game.game_status == 'finished' and game.ai_opponent:
+        AIPlayer.record_game(game.difficulty, game.winner == 'ai', game.current_round - 1)
+        transaction.on_commit(lambda: cache.delete(LEADERBOARD_CACHE_KEY))
+    
+    # 게임이 이어지면 커밋 직후부터 플레이어의 다음 추측 평가에 쓸 국면 점수 분포를 미리 계산
+    if game.game_status == 'playing' and ai_player:
+        transaction.on_commit(lambda: speculation.speculate(ai_player))
+
+def replay_turn(game: BaseballGame, round_number: int, guess_number: str) -> JsonResponse:
+    """재전송된 추측이면 기록된 결과로 응답, 아니면 충돌로 처리"""
+    recorded = {
+        guess.round_number: guess
+        for guess in game.guesses.filter(round_number__in=[round_number, round_number + 1])
+    }
+    player_guess = recorded.get(round_number)
+    if not player_guess or player_guess.is_ai_guess or player_guess.guess_number != guess_number:
+        raise TurnConflict(game.id)
+    
+    ai_guess_result = None
+    ai_guess = recorded.get(round_number + 1)
+    if ai_guess and ai_guess.is_ai_guess:
+        ai_guess_result = {
+            'guess': ai_guess.guess_number,
+            'strikes': ai_guess.strikes,
+            'balls': ai_guess.balls,
+            'gameOver': game.game_status == 'finished',
+            'winner': game.winner
+        }
+        if ai_guess.board_results:
+            ai_guess_result['boardResults'] = ai_guess.board_results
+        if game.adversarial:
+            ai_guess_result['candidatesLeft'] = ai_guess.candidates_left
+    
+    return JsonResponse(turn_response(
+        game, player_guess.strikes, player_guess.balls, player_guess.ai_hint, ai_guess_result,
+        player_guess.candidates_left, board_results=player_guess.board_results))
+
+def turn_response(game: BaseballGame, strikes: int, balls: int, ai_hint: str,
+                  ai_guess_result: Optional[dict], candidates_left: Optional[int] = None,
+                  guess_quality: Optional[dict] = None, board_results: Optional[list] = None) -> dict:
+    """추측 응답 데이터 구성"""
+    response_data = {
+        'success': True,
+        'strikes': strikes,
+        'balls': balls,
+        'gameOver': game.game_status == 'finished',
+        'winner': game.winner,
+        'currentRound': game.current_round,
+        'aiHint': ai_hint,
+        'difficulty': game.difficulty,
+        'remainingRounds': game.get_remaining_rounds()
+    }
+    
+    # 추측 평가 (코칭용 - 재전송 응답에는 없음)
+    if guess_quality:
+        response_data['guessQuality'] = guess_quality
+    
+    # 악당 수비 모드는 답한 뒤 남은 정답 후보 수를 알려준다
+    if game.adversarial:
+        response_data['candidatesLeft'] = candidates_left
+    
+    # 여러 판 모드는 판별 [스트라이크, 볼] (strikes/balls는 합계)
+    if board_results:
+        response_data['boardResults'] = board_results
+    
+    # 게임 종료 시 정답 공개
+    if game.game_status == 'finished':
+        response_data['secretNumber'] = game.secret_number
+        if game.board_count > 1:
+            response_data['boardSecrets'] = game.board_secrets.split(',')
+        if game.adversarial:
+            # 확정한 정답으로 기록된 모든 답을 다시 채점한 감사 결과
+            response_data['answersVerified'] = defender.verify_answers(game.secret_number, game.guesses.all())
+        response_data['totalRounds'] = game.current_round - 1
+    
+    # AI 추측 결과가 있으면 추가
+    if ai_guess_result:
+        response_data['aiGuess'] = ai_guess_result
+    
+    return response_data
+
+def validate_guess(guess_number: str, digit_count: int, allow_repeats: bool = False) -> dict:
     """추측 숫자 검증"""
     if not guess_number.isdigit():
         return {'valid': False, 'error': '숫자만 입력해주세요.'}
@@ -208,7 +502,7 @@ def validate_guess(guess_number: str, digit_count: int) -> dict:
     if len(guess_number) != digit_count:
         return {'valid': False, 'error': f'{digit_count}자리 숫자를 입력해주세요.'}
     
-    if len(set(guess_number)) != len(guess_number):
+    if not allow_repeats and len(set(guess_number)) != len(guess_number):
         return {'valid': False, 'error': '중복되지 않는 숫자를 입력해주세요.'}
     
     if guess_number[0] == '0':
@@ -217,174 +511,131 @@ def validate_guess(guess_number: str, digit_count: int) -> dict:
     return {'valid': True}
 
 def calculate_result(guess: str, secret: str) -> tuple:
-    """스트라이크와 볼 계산"""
-    strikes = 0
-    balls = 0
-    
-    for i in range(len(guess)):
-        if guess[i] == secret[i]:
-            strikes += 1
-        elif guess[i] in secret:
-            balls += 1
-    
-    return strikes, balls
+    """스트라이크와 볼 계산 (자릿수별 피드백 테이블 조회)"""
+    return feedback.calculate_result(guess, secret)
 
-def generate_secret_number(digit_count: int, difficulty: str) -> str:
-    """난이도에 따른 정답 숫자 생성"""
-    if difficulty == 'easy':
-        # 쉬운 난이도: 연속된 숫자나 예측 가능한 패턴
-        if digit_count == 3:
-            patterns = ['123', '234', '345', '456', '567', '678', '789']
-        elif digit_count == 4:
-            patterns = ['1234', '2345', '3456', '4567', '5678', '6789']
-        elif digit_count == 5:
-            patterns = ['12345', '23456', '34567', '45678', '56789']
-        
-        return random.choice(patterns)
-    
-    elif difficulty == 'normal':
-        # 보통 난이도: 랜덤하지만 예측 가능한 패턴
-        return generate_random_number(digit_count)
+def answer_guess(game: BaseballGame, guess: str) -> Tuple[int, int, Optional[int]]:
+    """추측 채점 - (스트라이크, 볼, 남은 정답 후보 수)
     
-    elif difficulty == 'hard':
-        # 어려운 난이도: 복잡한 패턴
-        return generate_complex_number(digit_count)
+    악당 수비 모드는 정답 대신 남은 후보를 가장 많이 남기는 답을 고르고 game.defender_pool을 줄인다
+    (남은 후보 수는 악당 수비 모드에서만, 아니면 None).
+    """
+    if not game.adversarial:
+        strikes, balls = calculate_result(guess, game.secret_number)
+        return strikes, balls, None
     
-    else:  # expert
-        # 전문가 난이도: 가장 복잡한 패턴
-        return generate_expert_number(digit_count)
+    table = feedback.get_feedback_table(game.digit_count)
+    answer = defender.answer_guess(table, defender.unpack_pool(game.defender_pool), guess)
+    game.defender_pool = defender.pack_pool(answer.pool_bits)
+    return answer.strikes, answer.balls, answer.pool_size
 
-def generate_random_number(digit_count: int) -> str:
-    """기본 랜덤 숫자 생성"""
-    numbers = list(range(1, 10))  # 0 제외
-    result = []
-    
-    for _ in range(digit_count):
-        num = random.choice(numbers)
-        result.append(str(num))
-        numbers.remove(num)
+def rate_guess(game: BaseballGame, ai_player: AdvancedAIPlayer, guess: str) -> Optional[dict]:
+    """사람 추측의 정보량 평가 - AI의 후보 풀(지금까지의 기록과 맞는 정답 후보) 기준
     
-    return ''.join(result)
+    모든 합법 추측과 비교해야 하므로 피드백 테이블이 있는 게임(중복 없는 3~5자리)만 평가한다.
+    """
+    if not uses_feedback_table(game.digit_count, game.allow_repeats):
+        return None
+    # 지난 응답 뒤 미리 계산해 둔 국면 점수 분포가 있으면 사용
+    return coaching.score_guess_quality(
+        ai_player.feedback_table, ai_player.candidate_indices(), ai_player.guess_history, guess,
+        ranking=speculation.take_ranking(ai_player))
 
-def generate_complex_number(digit_count: int) -> str:
-    """복잡한 패턴의 숫자 생성"""
-    # 홀수와 짝수를 섞어서 생성
-    odds = [1, 3, 5, 7, 9]
-    evens = [0, 2, 4, 6, 8]
-    
-    result = []
-    for i in range(digit_count):
-        if i == 0:  # 첫 번째는 0이 될 수 없음
-            num = random.choice(odds)
-        else:
-            if random.random() < 0.6:  # 60% 확률로 홀수
-                num = random.choice(odds)
-            else:
-                num = random.choice(evens)
-        
-        if num not in result:
-            result.append(num)
-        else:
-            # 중복되면 다른 숫자 선택
-            available = [n for n in (odds + evens) if n not in result]
-            if available:
-                num = random.choice(available)
-        
-        result.append(num)
-    
-    return ''.join(map(str, result[:digit_count]))
+def commit_defender_secret(game: BaseballGame):
+    """악당 수비 모드의 정답 확정 (남은 후보 중 하나 - 기록된 모든 답과 일치)"""
+    table = feedback.get_feedback_table(game.digit_count)
+    game.secret_number = defender.commit_secret(table, defender.unpack_pool(game.defender_pool))
 
-def generate_expert_number(digit_count: int) -> str:
-    """전문가 난이도 숫자 생성"""
-    # 가장 복잡한 패턴: 소수, 제곱수 등을 활용
-    if digit_count == 3:
-        # 소수 패턴 활용
-        primes = [2, 3, 5, 7]
-        non_primes = [1, 4, 6, 8, 9]
-        
-        result = []
-        for i in range(digit_count):
-            if i == 0:
-                num = random.choice(non_primes)  # 첫 번째는 소수가 아닌 수
-            else:
-                if random.random() < 0.7:  # 70% 확률로 소수
-                    num = random.choice(primes)
-                else:
-                    num = random.choice(non_primes)
-            
-            if num not in result:
-                result.append(num)
-            else:
-                available = [n for n in (primes + non_primes) if n not in result]
-                if available:
-                    num = random.choice(available)
-            
-            result.append(num)
-        
-        return ''.join(map(str, result[:digit_count]))
-    
-    else:
-        # 4자리 이상은 더 복잡한 패턴
-        return generate_complex_number(digit_count)
+def next_ai_guess(ai_player: AdvancedAIPlayer) -> Optional[str]:
+    """AI의 이번 추측 (실패하면 None)"""
+    try:
+        return ai_player.make_guess()
+    except Exception as e:
+        print(f"AI 추측 생성 실패: {e}")
+        return None
 
-def process_ai_turn(game: BaseballGame, ai_player: AdvancedAIPlayer) -> dict:
-    """AI 차례 처리"""
+def process_ai_turn(game: BaseballGame, ai_guess: str) -> Tuple[Optional[BaseballGuess], Optional[dict]]:
+    """AI 차례 처리 - 저장하지 않은 AI 추측과 응답 데이터 반환 (저장은 commit_turn이 함께 처리)"""
     try:
-        # AI가 추측할 숫자 생성
-        ai_guess = ai_player.make_guess()
-        
         # AI 추측 결과 계산
-        strikes, balls = calculate_result(ai_guess, game.secret_number)
-        
-        # AI 추측 기록 저장
-        with transaction.atomic():
-            BaseballGuess.objects.create(
-                game=game,
-                guess_number=ai_guess,
-                strikes=strikes,
-                balls=balls,
-                round_number=game.current_round,
-                ai_hint="AI의 추측입니다."
-            )
-            
-            # 게임 상태 업데이트
-            game.current_round += 1
-            
-            # AI 승리 체크
-            if strikes == game.digit_count:
-                game.game_status = 'finished'
-                game.winner = 'ai'
-                game.finished_at = timezone.now()
-            elif game.current_round > game.max_rounds:
-                game.game_status = 'finished'
-                game.winner = 'player'
-                game.finished_at = timezone.now()
-            
-            game.save()
-        
-        return {
-            'guess': ai_guess,
-            'strikes': strikes,
-            'balls': balls,
-            'gameOver': game.game_status == 'finished',
-            'winner': game.winner
-        }
-        
+        strikes, balls, candidates_left = answer_guess(game, ai_guess)
     except Exception as e:
         print(f"AI 차례 처리 실패: {e}")
-        return None
+        return None, None
+    
+    # AI 추측 기록
+    guess = BaseballGuess(
+        game=game,
+        guess_number=ai_guess,
+        strikes=strikes,
+        balls=balls,
+        round_number=game.current_round,
+        ai_hint="AI의 추측입니다.",
+        is_ai_guess=True,
+        candidates_left=candidates_left
+    )
+    
+    # 게임 상태 업데이트
+    game.current_round += 1
+    
+    # AI 승리 체크
+    if strikes == game.digit_count:
+        game.game_status = 'finished'
+        game.winner = 'ai'
+        game.finished_at = timezone.now()
+    elif game.current_round > game.max_rounds:
+        game.game_status = 'finished'
+        game.winner = 'player'
+        game.finished_at = timezone.now()
+    
+    ai_guess_result = {
+        'guess': ai_guess,
+        'strikes': strikes,
+        'balls': balls,
+        'gameOver': game.game_status == 'finished',
+        'winner': game.winner
+    }
+    # 악당 수비 모드는 AI 추측에 답한 뒤 남은 정답 후보 수도 알려준다
+    if game.adversarial:
+        ai_guess_result['candidatesLeft'] = candidates_left
+    return guess, ai_guess_result
 
 @csrf_exempt
 @require_http_methods(["GET"])
 def game_status(request, game_id):
-    """게임 상태 조회"""
+    """게임 상태 조회
+    
+    since_round를 주면 그 라운드 이후의 추측만 반환한다. 응답에는 (게임, 라운드, 상태)로 만든
+    ETag를 붙이고, If-None-Match가 같으면 추측 테이블을 읽지 않고 304로 응답한다.
+    """
     try:
-        game = BaseballGame.objects.get(id=game_id)
-        guesses = BaseballGuess.objects.filter(game=game).order_by('round_number')
+        try:
+            since_round = int(request.GET.get('since_round', 0))
+        except ValueError:
+            return JsonResponse({
+                'success': False,
+                'error': 'since_round는 정수여야 합니다.'
+            }, status=400)
+        
+        game = BaseballGame.objects.defer('ai_state', 'defender_pool').get(id=game_id)
+        
+        # 추측이 기록되거나 게임이 끝나면 라운드/상태가 바뀌므로 이 값만으로 변경 여부를 판단
+        etag = f'"{game.id}-{game.current_round}-{game.game_status}-{since_round}"'
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            return response
+        
+        guesses = BaseballGuess.objects.filter(
+            game=game, round_number__gt=since_round
+        ).order_by('round_number')
         
         game_data = {
             'id': game.id,
             'digitCount': game.digit_count,
+            'allowRepeats': game.allow_repeats,
+            'adversarial': game.adversarial,
+            'boardCount': game.board_count,
             'difficulty': game.difficulty,
             'gameStatus': game.game_status,
             'currentRound': game.current_round,
@@ -392,6 +643,7 @@ def game_status(request, game_id):
             'remainingRounds': game.get_remaining_rounds(),
             'winner': game.winner,
             'createdAt': game.created_at.isoformat(),
+            'sinceRound': since_round,
             'guesses': []
         }
         
@@ -402,13 +654,19 @@ def game_status(request, game_id):
                 'balls': guess.balls,
                 'roundNumber': guess.round_number,
                 'aiHint': guess.ai_hint,
+                'candidatesLeft': guess.candidates_left,
+                'boardResults': guess.board_results,
                 'createdAt': guess.created_at.isoformat()
             })
         
-        return JsonResponse({
+        response = JsonResponse({
             'success': True,
             'game': game_data
         })
+        response['ETag'] = etag
+        # 폴링 클라이언트가 매번 ETag로 재검증하도록
+        response['Cache-Control'] = 'no-cache'
+        return response
         
     except BaseballGame.DoesNotExist:
         return JsonResponse({
@@ -435,13 +693,17 @@ def restart_game(request):
             old_game = BaseballGame.objects.get(id=game_id)
             if old_game.player_id == player_id:
                 old_game.game_status = 'finished'
+                # 악당 수비 모드를 중간에 그만두어도 정답을 확정해 기록과 맞춰 볼 수 있게 한다
+                if old_game.adversarial and not old_game.secret_number:
+                    commit_defender_secret(old_game)
                 old_game.save()
         except BaseballGame.DoesNotExist:
             pass
         
-        # AI 플레이어 정리
-        if player_id in ai_players:
-            del ai_players[player_id]
+        # AI 플레이어 정리 (미리 계산 중인 작업도 취소)
+        ai_player = ai_players.pop(player_id)
+        if ai_player:
+            speculation.cancel(ai_player)
         
         return JsonResponse({
             'success': True,
@@ -470,7 +732,9 @@ def get_ai_statistics(request):
         
         return JsonResponse({
             'success': True,
-            'aiStatistics': stats
+            'aiStatistics': stats,
+            'registry': ai_players.stats(),
+            'guessCache': guess_cache.stats()
         })
         
     except Exception as e:
@@ -478,3 +742,86 @@ def get_ai_statistics(request):
             'success': False,
             'error': f'AI 통계 조회 실패: {str(e)}'
         }, status=500)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def ai_leaderboard(request):
+    """난이도별 AI 전적 순위 (누적 통계 행만 읽고 결과는 잠시 캐시)"""
+    try:
+        leaderboard = cache.get(LEADERBOARD_CACHE_KEY)
+        if leaderboard is None:
+            ai_players_stats = sorted(
+                AIPlayer.objects.all(),
+                key=lambda ai_player: (-ai_player.win_rate, ai_player.average_rounds)
+            )
+            leaderboard = [{
+                'rank': rank,
+                'name': ai_player.name,
+                'difficulty': ai_player.difficulty,
+                'totalGames': ai_player.total_games,
+                'wins': ai_player.win_count,
+                'losses': ai_player.loss_count,
+                'winRate': ai_player.win_rate,
+                'averageRounds': ai_player.average_rounds
+            } for rank, ai_player in enumerate(ai_players_stats, start=1)]
+            cache.set(LEADERBOARD_CACHE_KEY, leaderboard,
+                      getattr(settings, 'BASEBALL_LEADERBOARD_CACHE_SECONDS', 30))
+        
+        return JsonResponse({
+            'success': True,
+            'leaderboard': leaderboard
+        })
+        
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'error': f'AI 순위 조회 실패: {str(e)}'
+        }, status=500)
+
+@csrf_exempt
+@require_http_methods(["GET"])
+def simulate_ai(request):
+    """내부용 AI 자가 대국 - 난이도별 추측 수 분포를 NDJSON으로 스트리밍 (스태프 전용)
+    
+    요청 안에서 직렬로 돌리므로 BASEBALL_SIMULATION_MAX_GAMES 이하의 작은 표본만 받는다.
+    대량 시뮬레이션은 작업자 프로세스를 쓰는 simulate_baseball 관리 명령으로 실행한다.
+    """
+    if not request.user.is_staff:
+        return JsonResponse({
+            'success': False,
+            'error': '권한이 없습니다.'
+        }, status=403)
+    
+    try:
+        games = int(request.GET.get('games', 10))
+        digit_counts = [int(digit) for digit in request.GET.getlist('digits')] or [3, 4, 5]
+        difficulties = request.GET.getlist('difficulty') or ['easy', 'normal', 'hard', 'expert']
+        mistake_rate = float(request.GET['mistake_rate']) if request.GET.get('mistake_rate') else None
+        seed = int(request.GET.get('seed', 0))
+    except ValueError:
+        return JsonResponse({
+            'success': False,
+            'error': '잘못된 시뮬레이션 인자입니다.'
+        }, status=400)
+    
+    if (any(digit not in [3, 4, 5] for digit in digit_counts) or
+            any(difficulty not in ['easy', 'normal', 'hard', 'expert'] for difficulty in difficulties)):
+        return JsonResponse({
+            'success': False,
+            'error': '잘못된 자릿수 또는 난이도입니다.'
+        }, status=400)
+    
+    max_games = getattr(settings, 'BASEBALL_SIMULATION_MAX_GAMES', 200)
+    total_games = games * len(digit_counts) * len(difficulties)
+    if games < 1 or total_games > max_games:
+        return JsonResponse({
+            'success': False,
+            'error': (f'게임 수 x 자릿수 x 난이도는 1~{max_games} 사이여야 합니다 '
+                      f'(더 큰 시뮬레이션은 simulate_baseball 명령을 사용하세요).')
+        }, status=400)
+    
+    rows = simulate(difficulties, digit_counts, games, seed=seed, mistake_rate=mistake_rate)
+    return StreamingHttpResponse(
+        (json.dumps(row, ensure_ascii=False) + '\n' for row in rows),
+        content_type='application/x-ndjson'
+    )
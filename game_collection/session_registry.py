@@ -0,0 +1,168 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional, Tuple
+
+from django.conf import settings
+
+
+def estimate_size(value: Any) -> int:
+    """항목의 메모리 사용량 추정 (estimate_size()가 있으면 그 값을 사용)"""
+    estimator = getattr(value, 'estimate_size', None)
+    if callable(estimator):
+        return int(estimator())
+    return sys.getsizeof(value)
+
+
+class SessionRegistry:
+    """게임 앱 공용 AI 세션 저장소
+
+    유휴 시간(TTL)이 지난 항목과, 전체 추정 메모리가 상한을 넘을 때 가장 오래 쓰지 않은
+    항목(LRU)을 내보낸다. 내보낸 항목은 각 앱이 DB에서 다시 복원하므로 언제 지워져도 안전하다.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float, max_bytes: int,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, Tuple[Any, int, float]]' = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.RLock()
+        self._counters = {
+            'hits': 0,
+            'misses': 0,
+            'loads': 0,
+            'expired': 0,
+            'evicted': 0,
+        }
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """항목 조회 (조회하면 최근 사용으로 갱신)"""
+        with self._lock:
+            self._expire()
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters['misses'] += 1
+                return default
+
+            value, size, _ = entry
+            self._entries[key] = (value, size, self._clock())
+            self._entries.move_to_end(key)
+            self._counters['hits'] += 1
+            return value
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any],
+                    is_fresh: Optional[Callable[[Any], bool]] = None) -> Any:
+        """항목 조회, 없거나 is_fresh가 거짓이면 loader로 복원해 저장"""
+        value = self.get(key)
+        if value is not None and is_fresh is not None and not is_fresh(value):
+            value = None
+        if value is None:
+            value = loader()
+            if value is not None:
+                with self._lock:
+                    self._counters['loads'] += 1
+                self[key] = value
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        size = estimate_size(value)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, size, self._clock())
+            self._total_bytes += size
+            self._expire()
+            self._evict_to_limit(keep=key)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            self._expire()
+            return key in self._entries
+
+    def __delitem__(self, key: Hashable):
+        with self._lock:
+            if not self._remove(key):
+                raise KeyError(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """항목 제거 후 반환"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._remove(key)
+            return entry[0]
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """살아 있는 항목 목록 (복사본)"""
+        with self._lock:
+            self._expire()
+            return iter([(key, entry[0]) for key, entry in self._entries.items()])
+
+    def clear(self):
+        """모든 항목 제거"""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """항목 수, 추정 메모리, 적중/복원/만료/축출 횟수"""
+        with self._lock:
+            self._expire()
+            lookups = self._counters['hits'] + self._counters['misses']
+            return {
+                'name': self.name,
+                'entries': len(self._entries),
+                'bytes': self._total_bytes,
+                'maxBytes': self.max_bytes,
+                'ttlSeconds': self.ttl_seconds,
+                'hitRate': self._counters['hits'] / lookups if lookups else 0.0,
+                **self._counters,
+            }
+
+    def _remove(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._total_bytes -= entry[1]
+        return True
+
+    def _expire(self):
+        # 최근 사용 순으로 정렬되어 있으므로 앞쪽부터 만료된 항목만 확인하면 된다
+        deadline = self._clock() - self.ttl_seconds
+        while self._entries:
+            key, (_, _, last_used) = next(iter(self._entries.items()))
+            if last_used > deadline:
+                break
+            self._remove(key)
+            self._counters['expired'] += 1
+
+    def _evict_to_limit(self, keep: Optional[Hashable] = None):
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            self._remove(key)
+            self._counters['evicted'] += 1
+
+
+def create_registry(name: str) -> SessionRegistry:
+    """설정(AI_SESSION_TTL, AI_SESSION_MAX_BYTES)에 맞춘 세션 저장소 생성"""
+    return SessionRegistry(
+        name,
+        ttl_seconds=getattr(settings, 'AI_SESSION_TTL', 30 * 60),
+        max_bytes=getattr(settings, 'AI_SESSION_MAX_BYTES', 64 * 1024 * 1024),
+    )
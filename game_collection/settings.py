@@ -78,6 +78,7 @@ WSGI_APPLICATION = 'game_collection.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# SQLite는 파일 전체를 잠그므로 gunicorn 작업자 1개로 운영 (작업자를 늘리려면 서버 DB로 교체, DEPLOYMENT.md 참고)
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -133,6 +134,41 @@ CLAUDE_API_KEY = os.environ.get('CLAUDE_API_KEY', '')
 CLAUDE_API_URL = 'https://api.anthropic.com/v1/messages'
 CLAUDE_MODEL = 'claude-3-5-sonnet-20241022'
 
+# 게임 AI 세션 저장소: 유휴 만료 시간(초)과 앱별 추정 메모리 상한(바이트)
+AI_SESSION_TTL = int(os.environ.get('AI_SESSION_TTL', 30 * 60))
+AI_SESSION_MAX_BYTES = int(os.environ.get('AI_SESSION_MAX_BYTES', 64 * 1024 * 1024))
+
+# 숫자야구 AI 병렬 추측 평가 설정
+# 작업자 수: 0 또는 1이면 직렬, -1이면 CPU 코어 수만큼 사용 (작업자는 forkserver로 시작해 웹 작업자의 스레드와 무관)
+BASEBALL_AI_WORKERS = int(os.environ.get('BASEBALL_AI_WORKERS', 0))
+# (추측 수 x 후보 수)가 이 값 이상일 때만 병렬 평가
+BASEBALL_AI_PARALLEL_THRESHOLD = int(os.environ.get('BASEBALL_AI_PARALLEL_THRESHOLD', 20_000_000))
+
+# 숫자야구 AI 추측 전략: minimax(기본), expected(기대 그룹 크기 최소), entropy(엔트로피 최대)
+BASEBALL_AI_STRATEGY = os.environ.get('BASEBALL_AI_STRATEGY', 'minimax')
+# expected/entropy 전략의 턴당 제한 시간(초, 비우면 제한 없음)과 후보 풀 밖 추측 표본 수(비우면 전체)
+BASEBALL_AI_TIME_BUDGET = float(os.environ['BASEBALL_AI_TIME_BUDGET']) if os.environ.get('BASEBALL_AI_TIME_BUDGET') else None
+BASEBALL_AI_SAMPLE_SIZE = int(os.environ['BASEBALL_AI_SAMPLE_SIZE']) if os.environ.get('BASEBALL_AI_SAMPLE_SIZE') else None
+
+# 숫자야구 AI 국면 캐시 크기 (대칭으로 정규화한 국면 -> 최적 추측, 작업자당)
+BASEBALL_AI_GUESS_CACHE_SIZE = int(os.environ.get('BASEBALL_AI_GUESS_CACHE_SIZE', 50000))
+
+# 숫자야구 AI 순위 캐시 시간 (초, 게임이 끝나면 즉시 무효화)
+BASEBALL_LEADERBOARD_CACHE_SECONDS = int(os.environ.get('BASEBALL_LEADERBOARD_CACHE_SECONDS', 30))
+
+# 숫자야구 AI 시뮬레이션 API의 요청당 최대 게임 수 (모든 난이도/자릿수 합계)
+# 요청 안에서 직렬로 돌리므로 gunicorn 시간 제한(30초) 안에 끝나는 크기로 두고, 대량 실행은 simulate_baseball 명령 사용
+BASEBALL_SIMULATION_MAX_GAMES = int(os.environ.get('BASEBALL_SIMULATION_MAX_GAMES', 200))
+
+# 사람 추측 평가용 국면별 추측 점수 분포 캐시 크기 (작업자당)
+BASEBALL_GUESS_RANKING_CACHE_SIZE = int(os.environ.get('BASEBALL_GUESS_RANKING_CACHE_SIZE', 256))
+
+# 숫자야구 플레이어 추측 평가에 쓸 국면 점수 분포를 요청 사이에 미리 계산하는 스레드 수 (0이면 요청 안에서 계산)
+BASEBALL_AI_SPECULATION_WORKERS = int(os.environ.get('BASEBALL_AI_SPECULATION_WORKERS', 1))
+
+# 숫자야구 피드백 테이블을 미리 만들 자릿수 (쉼표 구분, wsgi 로딩 시 - gunicorn --preload면 작업자끼리 공유)
+BASEBALL_PRELOAD_DIGITS = [int(d) for d in os.environ.get('BASEBALL_PRELOAD_DIGITS', '3,4,5').split(',') if d.strip()]
+
 # Railway 포트 설정
 PORT = int(os.environ.get('PORT', 8000))
 
@@ -0,0 +1,101 @@
+from django.test import TestCase
+
+from .session_registry import SessionRegistry, estimate_size
+
+
+class FakeClock:
+    """테스트에서 직접 움직이는 시계"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class Sized:
+    """추정 크기를 직접 정한 항목"""
+
+    def __init__(self, size: int):
+        self.size = size
+
+    def estimate_size(self) -> int:
+        return self.size
+
+
+class SessionRegistryTests(TestCase):
+    """유휴 시간 만료, 메모리 상한 LRU 축출, 크기 계산과 카운터"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.registry = SessionRegistry('test', ttl_seconds=60, max_bytes=300, clock=self.clock)
+
+    def test_idle_entries_expire(self):
+        self.registry['old'] = Sized(10)
+        self.clock.now = 30
+        self.registry['new'] = Sized(10)
+        self.clock.now = 70
+
+        self.assertNotIn('old', self.registry)
+        self.assertEqual(self.registry.get('new').size, 10)
+        stats = self.registry.stats()
+        self.assertEqual(stats['expired'], 1)
+        self.assertEqual(stats['entries'], 1)
+        self.assertEqual(stats['bytes'], 10)
+
+    def test_lookup_refreshes_idle_time(self):
+        self.registry['kept'] = Sized(10)
+        for now in (50, 100, 150):
+            self.clock.now = now
+            self.assertIsNotNone(self.registry.get('kept'))
+        self.assertEqual(self.registry.stats()['expired'], 0)
+
+    def test_least_recently_used_is_evicted_over_limit(self):
+        for key in ('a', 'b', 'c'):
+            self.registry[key] = Sized(100)
+        self.registry.get('a')
+        self.registry['d'] = Sized(100)
+
+        self.assertEqual([key for key, _ in self.registry.items()], ['c', 'a', 'd'])
+        stats = self.registry.stats()
+        self.assertEqual(stats['evicted'], 1)
+        self.assertEqual(stats['bytes'], 300)
+
+    def test_oversized_entry_is_kept_alone(self):
+        self.registry['a'] = Sized(100)
+        self.registry['big'] = Sized(1000)
+        self.assertEqual([key for key, _ in self.registry.items()], ['big'])
+        self.assertEqual(self.registry.stats()['bytes'], 1000)
+
+    def test_replacing_and_removing_keep_byte_count(self):
+        self.registry['a'] = Sized(100)
+        self.registry['a'] = Sized(40)
+        self.registry['b'] = Sized(60)
+        self.assertEqual(self.registry.stats()['bytes'], 100)
+        self.assertEqual(self.registry.pop('a').size, 40)
+        del self.registry['b']
+        self.assertEqual(self.registry.stats()['bytes'], 0)
+        with self.assertRaises(KeyError):
+            del self.registry['b']
+
+    def test_get_or_load_reloads_missing_and_stale_entries(self):
+        loaded = []
+
+        def loader():
+            loaded.append(len(loaded))
+            return Sized(len(loaded))
+
+        first = self.registry.get_or_load('game', loader)
+        self.assertIs(self.registry.get_or_load('game', loader), first)
+        reloaded = self.registry.get_or_load('game', loader, is_fresh=lambda value: False)
+
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(len(loaded), 2)
+        stats = self.registry.stats()
+        self.assertEqual(stats['loads'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 2)
+
+    def test_size_estimate_falls_back_to_getsizeof(self):
+        self.assertEqual(estimate_size(Sized(1234)), 1234)
+        self.assertGreater(estimate_size('x' * 1000), 1000)
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'game_collection.settings')
 
 application = get_wsgi_application()
+
+# 숫자야구 피드백 테이블을 작업자 fork 전에 만들어 두어 첫 게임 시작 지연과 작업자별 사본을 없앤다
+from django.conf import settings  # noqa: E402
+from baseball.feedback import preload_tables  # noqa: E402
+
+preload_tables(getattr(settings, 'BASEBALL_PRELOAD_DIGITS', ()))
@@ -1,6 +1,9 @@
 import random
 from typing import List, Tuple, Dict, Optional
 import math
+import sys
+
+from .bitboard import Bitboard, DIRECTIONS, bit_index, iter_positions, popcount, run_masks, winning_cells
 
 class AdvancedOmokAI:
     """고급 오목 AI - Minimax + Alpha-Beta Pruning + 전략적 사고"""
@@ -24,8 +27,9 @@ class AdvancedOmokAI:
         self.random_factor = settings['random_factor']
         self.analysis_depth = settings['analysis_depth']
         
-        # 위치 가중치 (중앙일수록 높은 가중치)
+        # 위치 가중치 (중앙일수록 높은 가중치)와 가중치의 비트별 칸 마스크
         self.position_weights = self._create_position_weights()
+        self.weight_planes = self._create_weight_planes()
         
         # 패턴 점수
         self.pattern_scores = {
@@ -37,6 +41,17 @@ class AdvancedOmokAI:
             'open_two': 100,     # 열린 2연속
             'blocked_two': 10    # 막힌 2연속
         }
+        
+        # (이어진 수, 막힘 여부) -> 패턴 점수 (1개는 0점)
+        self.run_scores = {
+            (5, False): self.pattern_scores['win'],
+            (4, False): self.pattern_scores['open_four'],
+            (4, True): self.pattern_scores['blocked_four'],
+            (3, False): self.pattern_scores['open_three'],
+            (3, True): self.pattern_scores['blocked_three'],
+            (2, False): self.pattern_scores['open_two'],
+            (2, True): self.pattern_scores['blocked_two'],
+        }
     
     def _create_position_weights(self) -> List[List[float]]:
         """위치 가중치 생성 (중앙일수록 높음)"""
@@ -52,31 +67,54 @@ class AdvancedOmokAI:
         
         return weights
     
+    def _create_weight_planes(self) -> List[Tuple[int, int]]:
+        """(2의 거듭제곱, 가중치에 그 비트가 켜진 칸들의 마스크) 목록 - 돌 마스크의 가중치 합을 몇 번의 AND로 구함"""
+        planes = []
+        max_weight = int(max(max(row) for row in self.position_weights))
+        for bit in range(max_weight.bit_length()):
+            mask = 0
+            for i in range(self.board_size):
+                for j in range(self.board_size):
+                    if int(self.position_weights[i][j]) >> bit & 1:
+                        mask |= 1 << bit_index(i, j)
+            planes.append((1 << bit, mask))
+        return planes
+    
+    def estimate_size(self) -> int:
+        """세션 저장소용 메모리 사용량 추정 (바이트)"""
+        size = sys.getsizeof(self.__dict__) + sys.getsizeof(self.position_weights)
+        for row in self.position_weights:
+            size += sys.getsizeof(row) + sum(sys.getsizeof(weight) for weight in row)
+        size += sys.getsizeof(self.weight_planes) + sum(sys.getsizeof(mask) for _, mask in self.weight_planes)
+        return size
+    
     def get_best_move(self, board: List[List[str]], player: str) -> Tuple[int, int]:
-        """최적의 수 찾기"""
+        """최적의 수 찾기 (JSON 보드는 여기서 한 번만 비트보드로 변환)"""
+        bitboard = Bitboard.from_board(board)
+        
         # 랜덤 팩터 적용
         if random.random() < self.random_factor:
-            return self._get_random_move(board)
+            return self._get_random_move(bitboard)
         
         # 위험한 상황 체크 (즉시 방어 필요)
-        defensive_move = self._find_critical_defense(board, player)
+        defensive_move = self._find_critical_defense(bitboard, player)
         if defensive_move:
             return defensive_move
         
         # 공격 기회 체크 (즉시 승리 가능)
-        attack_move = self._find_winning_move(board, player)
+        attack_move = self._find_winning_move(bitboard, player)
         if attack_move:
             return attack_move
         
         # Minimax 알고리즘으로 최적 수 찾기
-        best_move = self._minimax_search(board, player)
+        best_move = self._minimax_search(bitboard, player)
         if best_move:
             return best_move
         
         # 차선책: 전략적 위치
-        return self._get_strategic_move(board, player)
+        return self._get_strategic_move(bitboard, player)
     
-    def _get_random_move(self, board: List[List[str]]) -> Tuple[int, int]:
+    def _get_random_move(self, board: Bitboard) -> Tuple[int, int]:
         """랜덤 수 선택"""
         empty_positions = self._get_empty_positions(board)
         if not empty_positions:
@@ -89,36 +127,17 @@ class AdvancedOmokAI:
         
         return random.choice(empty_positions)
     
-    def _find_critical_defense(self, board: List[List[str]], player: str) -> Optional[Tuple[int, int]]:
+    def _find_critical_defense(self, board: Bitboard, player: str) -> Optional[Tuple[int, int]]:
         """치명적인 방어 수 찾기"""
         opponent = 'black' if player == 'white' else 'white'
-        empty_positions = self._get_empty_positions(board)
-        
-        for row, col in empty_positions:
-            # 임시로 상대방 수를 두고 승리 체크
-            board[row][col] = opponent
-            if self._check_winner(board, row, col, opponent):
-                board[row][col] = ''  # 되돌리기
-                return (row, col)  # 이 위치를 막아야 함
-            board[row][col] = ''  # 되돌리기
-        
-        return None
+        return self._find_winning_move(board, opponent)  # 상대가 이기는 자리를 막아야 함
     
-    def _find_winning_move(self, board: List[List[str]], player: str) -> Optional[Tuple[int, int]]:
-        """승리 수 찾기"""
-        empty_positions = self._get_empty_positions(board)
-        
-        for row, col in empty_positions:
-            # 임시로 수를 두고 승리 체크
-            board[row][col] = player
-            if self._check_winner(board, row, col, player):
-                board[row][col] = ''  # 되돌리기
-                return (row, col)  # 승리 수
-            board[row][col] = ''  # 되돌리기
-        
-        return None
+    def _find_winning_move(self, board: Bitboard, player: str) -> Optional[Tuple[int, int]]:
+        """승리 수 찾기 (모든 빈 칸을 한 번에 검사해 행 우선으로 첫 칸)"""
+        cells = winning_cells(board.stones[player], board.empty())
+        return next(iter_positions(cells), None)
     
-    def _minimax_search(self, board: List[List[str]], player: str) -> Optional[Tuple[int, int]]:
+    def _minimax_search(self, board: Bitboard, player: str) -> Optional[Tuple[int, int]]:
         """Minimax 알고리즘으로 최적 수 찾기"""
         empty_positions = self._get_empty_positions(board)
         if not empty_positions:
@@ -130,9 +149,9 @@ class AdvancedOmokAI:
         beta = float('inf')
         
         for row, col in empty_positions:
-            board[row][col] = player
+            board.place(row, col, player)
             score = self._minimax(board, self.max_depth - 1, False, player, alpha, beta)
-            board[row][col] = ''  # 되돌리기
+            board.remove(row, col, player)  # 되돌리기
             
             if score > best_score:
                 best_score = score
@@ -144,7 +163,7 @@ class AdvancedOmokAI:
         
         return best_move
     
-    def _minimax(self, board: List[List[str]], depth: int, is_maximizing: bool, 
+    def _minimax(self, board: Bitboard, depth: int, is_maximizing: bool, 
                  player: str, alpha: float, beta: float) -> float:
         """Minimax 알고리즘 재귀 함수"""
         if depth == 0:
@@ -157,9 +176,9 @@ class AdvancedOmokAI:
         if is_maximizing:
             max_score = -float('inf')
             for row, col in empty_positions:
-                board[row][col] = player
+                board.place(row, col, player)
                 score = self._minimax(board, depth - 1, False, player, alpha, beta)
-                board[row][col] = ''
+                board.remove(row, col, player)
                 max_score = max(max_score, score)
                 alpha = max(alpha, score)
                 if alpha >= beta:
@@ -169,98 +188,50 @@ class AdvancedOmokAI:
             min_score = float('inf')
             opponent = 'black' if player == 'white' else 'white'
             for row, col in empty_positions:
-                board[row][col] = opponent
+                board.place(row, col, opponent)
                 score = self._minimax(board, depth - 1, True, player, alpha, beta)
-                board[row][col] = ''
+                board.remove(row, col, opponent)
                 min_score = min(min_score, score)
                 beta = min(beta, score)
                 if alpha >= beta:
                     break
             return min_score
     
-    def _evaluate_board(self, board: List[List[str]], player: str) -> float:
-        """보드 상태 평가"""
+    def _evaluate_board(self, board: Bitboard, player: str) -> float:
+        """보드 상태 평가 - 패턴별 돌 마스크를 가중치 마스크와 AND해 개수만 센다"""
         score = 0
         opponent = 'black' if player == 'white' else 'white'
         
-        # 각 위치별 평가
-        for i in range(self.board_size):
-            for j in range(self.board_size):
-                if board[i][j] == player:
-                    score += self._evaluate_position(board, i, j, player) * self.position_weights[i][j]
-                elif board[i][j] == opponent:
-                    score -= self._evaluate_position(board, i, j, opponent) * self.position_weights[i][j]
+        for colour, sign in ((player, 1), (opponent, -1)):
+            for pattern_score, mask in self._stone_patterns(board, colour):
+                weighted = sum(value * popcount(mask & plane) for value, plane in self.weight_planes)
+                score += sign * pattern_score * weighted
         
         return score
     
-    def _evaluate_position(self, board: List[List[str]], row: int, col: int, player: str) -> float:
+    def _evaluate_position(self, board: Bitboard, row: int, col: int, player: str) -> float:
         """특정 위치의 가치 평가"""
-        score = 0
-        directions = [(0, 1), (1, 0), (1, 1), (1, -1)]
-        
-        for dr, dc in directions:
-            # 한 방향으로 연속된 돌 분석
-            pattern_info = self._analyze_line(board, row, col, dr, dc, player)
-            score += self._score_pattern(pattern_info)
-            
-            # 반대 방향으로 연속된 돌 분석
-            pattern_info = self._analyze_line(board, row, col, -dr, -dc, player)
-            score += self._score_pattern(pattern_info)
-        
-        return score
+        bit = 1 << bit_index(row, col)
+        return sum(pattern_score for pattern_score, mask in self._stone_patterns(board, player) if mask & bit)
     
-    def _analyze_line(self, board: List[List[str]], row: int, col: int, 
-                      dr: int, dc: int, player: str) -> Dict[str, int]:
-        """한 방향의 돌 패턴 분석"""
-        count = 1
-        blocked = 0
-        
-        # 현재 위치에서 한 방향으로 이동
-        r, c = row + dr, col + dc
-        while 0 <= r < self.board_size and 0 <= c < self.board_size:
-            if board[r][c] == player:
-                count += 1
-            elif board[r][c] == '':
-                break
-            else:
-                blocked += 1
-                break
-            r += dr
-            c += dc
+    def _stone_patterns(self, board: Bitboard, player: str) -> List[Tuple[float, int]]:
+        """player 돌들의 (패턴 점수, 그 패턴인 돌 마스크) 목록 - 네 방향의 양쪽을 각각 센다
         
-        return {
-            'count': count,
-            'blocked': blocked,
-            'open': blocked == 0
-        }
-    
-    def _score_pattern(self, pattern_info: Dict[str, int]) -> float:
-        """패턴 점수 계산"""
-        count = pattern_info['count']
-        blocked = pattern_info['blocked']
-        is_open = pattern_info['open']
-        
-        if count >= 5:
-            return self.pattern_scores['win']
-        elif count == 4:
-            if is_open:
-                return self.pattern_scores['open_four']
-            else:
-                return self.pattern_scores['blocked_four']
-        elif count == 3:
-            if is_open:
-                return self.pattern_scores['open_three']
-            else:
-                return self.pattern_scores['blocked_three']
-        elif count == 2:
-            if is_open:
-                return self.pattern_scores['open_two']
-            else:
-                return self.pattern_scores['blocked_two']
-        
-        return 0
+        돌마다 한 방향으로 이어진 자기 돌 수와 끝이 상대 돌로 막혔는지를 시프트 AND로 한꺼번에 구한다.
+        """
+        opponent = 'black' if player == 'white' else 'white'
+        stones = board.stones[player]
+        blockers = board.stones[opponent]
+        patterns = []
+        for step in DIRECTIONS:
+            for amount in (step, -step):
+                for key, mask in run_masks(stones, blockers, amount).items():
+                    pattern_score = self.run_scores.get(key, 0)
+                    if pattern_score and mask:
+                        patterns.append((pattern_score, mask))
+        return patterns
     
-    def _get_strategic_move(self, board: List[List[str]], player: str) -> Tuple[int, int]:
+    def _get_strategic_move(self, board: Bitboard, player: str) -> Tuple[int, int]:
         """전략적 위치 찾기"""
         empty_positions = self._get_empty_positions(board)
         if not empty_positions:
@@ -279,59 +250,28 @@ class AdvancedOmokAI:
         
         return random.choice(empty_positions)
     
-    def _get_empty_positions(self, board: List[List[str]]) -> List[Tuple[int, int]]:
-        """빈 위치 목록 반환"""
-        positions = []
-        for i in range(self.board_size):
-            for j in range(self.board_size):
-                if board[i][j] == '':
-                    positions.append((i, j))
-        return positions
+    def _get_empty_positions(self, board: Bitboard) -> List[Tuple[int, int]]:
+        """빈 위치 목록 반환 (행 우선 순서)"""
+        return list(iter_positions(board.empty()))
     
-    def _check_winner(self, board: List[List[str]], row: int, col: int, player: str) -> bool:
+    def _check_winner(self, board: Bitboard, row: int, col: int, player: str) -> bool:
         """승리 조건 체크"""
-        directions = [
-            [(0, 1), (0, -1)],   # 가로
-            [(1, 0), (-1, 0)],   # 세로
-            [(1, 1), (-1, -1)],  # 대각선 ↘↖
-            [(1, -1), (-1, 1)]   # 대각선 ↙↗
-        ]
-        
-        for dir_pair in directions:
-            count = 1  # 현재 위치 포함
-            
-            for dr, dc in dir_pair:
-                r, c = row + dr, col + dc
-                while 0 <= r < self.board_size and 0 <= c < self.board_size and board[r][c] == player:
-                    count += 1
-                    r += dr
-                    c += dc
-            
-            if count >= 5:
-                return True
-        
-        return False
+        return board.wins_at(row, col, player)
     
     def get_move_analysis(self, board: List[List[str]], row: int, col: int, player: str) -> str:
         """수에 대한 AI 분석"""
-        # 수를 두기 전 상태 저장
-        original_board = [row[:] for row in board]
-        
-        # 임시로 수를 두고 분석
-        board[row][col] = player
+        bitboard = Bitboard.from_board(board)
+        opponent = 'black' if player == 'white' else 'white'
         
-        # 공격 가치 평가
-        attack_value = self._evaluate_position(board, row, col, player)
+        # 공격 가치 평가 (임시로 수를 두고 분석)
+        bitboard.remove(row, col, opponent)
+        bitboard.place(row, col, player)
+        attack_value = self._evaluate_position(bitboard, row, col, player)
         
         # 방어 가치 평가 (상대방이 이 위치에 둘 경우)
-        opponent = 'black' if player == 'white' else 'white'
-        board[row][col] = opponent
-        defense_value = self._evaluate_position(board, row, col, opponent)
-        board[row][col] = player
-        
-        # 보드 복원
-        for i in range(len(board)):
-            board[i] = original_board[i][:]
+        bitboard.remove(row, col, player)
+        bitboard.place(row, col, opponent)
+        defense_value = self._evaluate_position(bitboard, row, col, opponent)
         
         # 분석 결과 생성
         if attack_value >= 10000:
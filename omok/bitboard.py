@@ -0,0 +1,156 @@
+from typing import Dict, Iterator, List, Tuple
+
+BOARD_SIZE = 15
+
+# 행마다 빈 경계 칸을 하나 두어 (한 행 = 16비트) 가로/대각선 시프트가 다음 행으로 넘어가지 않게 한다
+STRIDE = BOARD_SIZE + 1
+
+# 방향별 시프트 양 - 가로, 세로, 대각선 ↘, 대각선 ↙
+DIRECTIONS = (1, STRIDE, STRIDE + 1, STRIDE - 1)
+
+# 보드 칸 전체 (경계 칸 제외)
+BOARD_MASK = sum(1 << (row * STRIDE + col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE))
+
+# 이어진 돌 수를 세는 최대 길이 (5 이상은 모두 승리)
+MAX_RUN = 5
+
+
+def bit_index(row: int, col: int) -> int:
+    """칸의 비트 번호"""
+    return row * STRIDE + col
+
+
+def position(index: int) -> Tuple[int, int]:
+    """비트 번호의 (행, 열)"""
+    return divmod(index, STRIDE)
+
+
+def iter_positions(mask: int) -> Iterator[Tuple[int, int]]:
+    """마스크에 켜진 칸을 비트 번호 순서(행 우선)로"""
+    while mask:
+        low = mask & -mask
+        yield position(low.bit_length() - 1)
+        mask ^= low
+
+
+def _count_bits(mask: int) -> int:
+    return bin(mask).count('1')
+
+
+# 켜진 비트 수 (Python 3.10+는 int.bit_count)
+popcount = getattr(int, 'bit_count', _count_bits)
+
+
+def _shift(mask: int, amount: int) -> int:
+    """양수면 앞쪽(비트 번호가 큰 쪽) 칸의 값을 끌어오고, 음수면 뒤쪽 칸의 값을 끌어온다"""
+    return mask >> amount if amount >= 0 else (mask << -amount) & BOARD_MASK
+
+
+def five_starts(stones: int, step: int) -> int:
+    """step 방향으로 5개 이상 이어진 줄의 시작 칸들 (시프트 AND 네 번)"""
+    pairs = stones & (stones >> step)
+    fours = pairs & (pairs >> 2 * step)
+    return fours & (stones >> 4 * step)
+
+
+def winning_cells(stones: int, empty: int) -> int:
+    """빈 칸 중 돌을 놓으면 5개 이상 이어지는 칸들
+
+    방향마다 5칸 줄의 k번째 칸만 빼고 나머지 네 칸이 자기 돌인 시작 칸을 구해 k번째 칸으로 옮긴다.
+    """
+    cells = 0
+    for step in DIRECTIONS:
+        shifted = [stones >> offset * step for offset in range(MAX_RUN)]
+        for gap in range(MAX_RUN):
+            starts = BOARD_MASK
+            for offset in range(MAX_RUN):
+                if offset != gap:
+                    starts &= shifted[offset]
+            cells |= starts << gap * step
+    return cells & empty
+
+
+def _window_masks() -> Dict[int, List[int]]:
+    """방향마다 칸별로, 그 칸을 지나는 5칸 줄이 시작될 수 있는 칸들의 마스크"""
+    windows = {}
+    for step in DIRECTIONS:
+        masks = []
+        for index in range(BOARD_SIZE * STRIDE):
+            mask = 0
+            for back in range(MAX_RUN):
+                start = index - back * step
+                if start >= 0:
+                    mask |= 1 << start
+            masks.append(mask & BOARD_MASK)
+        windows[step] = masks
+    return windows
+
+
+WINDOW_MASKS = _window_masks()
+
+
+def run_masks(stones: int, blockers: int, amount: int) -> Dict[Tuple[int, bool], int]:
+    """돌마다 한 방향(amount)으로 이어진 자기 돌 수와 그 끝이 상대 돌로 막혔는지
+
+    키는 (이어진 수, 막힘 여부), 값은 그런 돌들의 마스크다. 이어진 수는 자기 자신을 포함하며
+    5 이상은 5로 모은다. 보드 가장자리는 막힘으로 치지 않는다.
+    """
+    runs = {}
+    reach = stones
+    for length in range(1, MAX_RUN):
+        longer = reach & _shift(stones, amount * length)
+        exact = reach & ~longer
+        if exact:
+            blocked = exact & _shift(blockers, amount * length)
+            runs[(length, True)] = blocked
+            runs[(length, False)] = exact & ~blocked
+        reach = longer
+    if reach:
+        runs[(MAX_RUN, False)] = reach
+    return runs
+
+
+class Bitboard:
+    """흑/백 돌을 색마다 정수 비트마스크로 담은 15x15 보드
+
+    JSON board_state(List[List[str]])와는 from_board/to_board로만 변환한다.
+    """
+
+    __slots__ = ('stones',)
+
+    def __init__(self, black: int = 0, white: int = 0):
+        self.stones = {'black': black, 'white': white}
+
+    @classmethod
+    def from_board(cls, board: List[List[str]]) -> 'Bitboard':
+        """JSON 보드 상태에서 변환"""
+        bitboard = cls()
+        for row, cells in enumerate(board):
+            for col, cell in enumerate(cells):
+                if cell:
+                    bitboard.stones[cell] |= 1 << bit_index(row, col)
+        return bitboard
+
+    def to_board(self) -> List[List[str]]:
+        """JSON 보드 상태로 변환"""
+        board = [['' for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+        for colour, stones in self.stones.items():
+            for row, col in iter_positions(stones):
+                board[row][col] = colour
+        return board
+
+    def empty(self) -> int:
+        """빈 칸 마스크"""
+        return BOARD_MASK & ~(self.stones['black'] | self.stones['white'])
+
+    def place(self, row: int, col: int, colour: str):
+        self.stones[colour] |= 1 << bit_index(row, col)
+
+    def remove(self, row: int, col: int, colour: str):
+        self.stones[colour] &= ~(1 << bit_index(row, col))
+
+    def wins_at(self, row: int, col: int, colour: str) -> bool:
+        """(row, col)을 지나는 5개 이상 이어진 줄이 있는지"""
+        stones = self.stones[colour]
+        index = bit_index(row, col)
+        return any(five_starts(stones, step) & WINDOW_MASKS[step][index] for step in DIRECTIONS)
@@ -1,3 +1,147 @@
+import random
+from typing import List, Optional, Tuple
+
 from django.test import TestCase
 
-# Create your tests here.
+from .advanced_ai import AdvancedOmokAI
+from .bitboard import BOARD_SIZE, Bitboard
+from .views import check_winner
+
+DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+
+class ListBoardReference:
+    """비트보드 전의 2차원 리스트 보드 평가 (칸마다 방향별로 한 칸씩 걸어가며 셈) - 비교 기준"""
+
+    def __init__(self, ai: AdvancedOmokAI):
+        self.pattern_scores = ai.pattern_scores
+        self.position_weights = ai.position_weights
+
+    def evaluate_board(self, board: List[List[str]], player: str) -> float:
+        score = 0
+        opponent = 'black' if player == 'white' else 'white'
+        for i in range(BOARD_SIZE):
+            for j in range(BOARD_SIZE):
+                if board[i][j] == player:
+                    score += self.evaluate_position(board, i, j, player) * self.position_weights[i][j]
+                elif board[i][j] == opponent:
+                    score -= self.evaluate_position(board, i, j, opponent) * self.position_weights[i][j]
+        return score
+
+    def evaluate_position(self, board: List[List[str]], row: int, col: int, player: str) -> float:
+        score = 0
+        for dr, dc in DIRECTIONS:
+            score += self.score_pattern(*self.analyze_line(board, row, col, dr, dc, player))
+            score += self.score_pattern(*self.analyze_line(board, row, col, -dr, -dc, player))
+        return score
+
+    def analyze_line(self, board: List[List[str]], row: int, col: int,
+                     dr: int, dc: int, player: str) -> Tuple[int, bool]:
+        """(이어진 돌 수, 상대 돌로 막힘 여부)"""
+        count = 1
+        r, c = row + dr, col + dc
+        while 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE:
+            if board[r][c] == player:
+                count += 1
+            elif board[r][c] == '':
+                return count, False
+            else:
+                return count, True
+            r += dr
+            c += dc
+        return count, False
+
+    def score_pattern(self, count: int, blocked: bool) -> float:
+        if count >= 5:
+            return self.pattern_scores['win']
+        names = {4: 'four', 3: 'three', 2: 'two'}
+        if count not in names:
+            return 0
+        return self.pattern_scores[('blocked_' if blocked else 'open_') + names[count]]
+
+    def check_winner(self, board: List[List[str]], row: int, col: int, player: str) -> bool:
+        for dr, dc in DIRECTIONS:
+            count = 1
+            for sign in (1, -1):
+                r, c = row + sign * dr, col + sign * dc
+                while 0 <= r < BOARD_SIZE and 0 <= c < BOARD_SIZE and board[r][c] == player:
+                    count += 1
+                    r += sign * dr
+                    c += sign * dc
+            if count >= 5:
+                return True
+        return False
+
+    def find_winning_move(self, board: List[List[str]], player: str) -> Optional[Tuple[int, int]]:
+        for row in range(BOARD_SIZE):
+            for col in range(BOARD_SIZE):
+                if board[row][col] == '':
+                    board[row][col] = player
+                    wins = self.check_winner(board, row, col, player)
+                    board[row][col] = ''
+                    if wins:
+                        return row, col
+        return None
+
+
+def random_board(rng: random.Random, stones: int) -> List[List[str]]:
+    """흑백을 번갈아 무작위 칸에 놓은 보드"""
+    board = [['' for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+    cells = rng.sample([(row, col) for row in range(BOARD_SIZE) for col in range(BOARD_SIZE)], stones)
+    for turn, (row, col) in enumerate(cells):
+        board[row][col] = 'black' if turn % 2 == 0 else 'white'
+    return board
+
+
+def random_boards(seed: int, count: int) -> List[List[List[str]]]:
+    """빈 보드부터 5목이 여럿 생기는 빽빽한 보드까지 섞은 무작위 보드들"""
+    rng = random.Random(seed)
+    return [random_board(rng, rng.choice([0, 5, 20, 60, 120, 200])) for _ in range(count)]
+
+
+class BitboardEvaluationTests(TestCase):
+    """비트보드 평가가 리스트 보드 기준 구현과 같은 결과를 내는지"""
+
+    def setUp(self):
+        self.ai = AdvancedOmokAI('hard')
+        self.reference = ListBoardReference(self.ai)
+
+    def test_board_round_trip(self):
+        for board in random_boards(1, 30):
+            self.assertEqual(Bitboard.from_board(board).to_board(), board)
+
+    def test_winner_check_matches_reference(self):
+        for board in random_boards(2, 40):
+            bitboard = Bitboard.from_board(board)
+            for row in range(BOARD_SIZE):
+                for col in range(BOARD_SIZE):
+                    player = board[row][col]
+                    if not player:
+                        continue
+                    expected = self.reference.check_winner(board, row, col, player)
+                    with self.subTest(row=row, col=col):
+                        self.assertEqual(bitboard.wins_at(row, col, player), expected)
+                        self.assertEqual(check_winner(board, row, col, player), expected)
+
+    def test_position_and_board_scores_match_reference(self):
+        for board in random_boards(3, 40):
+            bitboard = Bitboard.from_board(board)
+            for player in ('black', 'white'):
+                self.assertAlmostEqual(self.ai._evaluate_board(bitboard, player),
+                                       self.reference.evaluate_board(board, player))
+            for row in range(BOARD_SIZE):
+                for col in range(BOARD_SIZE):
+                    player = board[row][col]
+                    if player:
+                        self.assertEqual(self.ai._evaluate_position(bitboard, row, col, player),
+                                         self.reference.evaluate_position(board, row, col, player))
+
+    def test_winning_and_defending_moves_match_reference(self):
+        for board in random_boards(4, 60):
+            bitboard = Bitboard.from_board(board)
+            for player in ('black', 'white'):
+                opponent = 'black' if player == 'white' else 'white'
+                self.assertEqual(self.ai._find_winning_move(bitboard, player),
+                                 self.reference.find_winning_move(board, player))
+                self.assertEqual(self.ai._find_critical_defense(bitboard, player),
+                                 self.reference.find_winning_move(board, opponent))
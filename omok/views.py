@@ -9,9 +9,17 @@ from typing import List, Optional, Tuple
 
 from .models import OmokGame, OmokMove
 from .advanced_ai import AdvancedOmokAI
+from .bitboard import Bitboard
+from game_collection.session_registry import create_registry
 
-# AI 인스턴스들을 저장하는 전역 딕셔너리
-ai_instances = {}
+# AI 인스턴스 세션 저장소 (유휴/메모리 초과 시 축출, 필요하면 게임 정보로 다시 생성)
+ai_instances = create_registry('omok')
+
+def get_omok_ai(game: OmokGame) -> Optional[AdvancedOmokAI]:
+    """게임의 AI 인스턴스 조회 - 축출되었으면 게임 설정으로 복원"""
+    if game.game_mode != 'ai':
+        return None
+    return ai_instances.get_or_load(game.id, lambda: AdvancedOmokAI(game.difficulty))
 
 def index(request):
     """오목 게임 메인 페이지"""
@@ -107,8 +115,9 @@ def make_move(request):
         
         # AI 분석 결과 생성
         ai_analysis = ""
-        if game.game_mode == 'ai' and game.id in ai_instances:
-            ai_analysis = ai_instances[game.id].get_move_analysis(board, row, col, player)
+        ai = get_omok_ai(game)
+        if ai:
+            ai_analysis = ai.get_move_analysis(board, row, col, player)
         
         OmokMove.objects.create(
             game=game,
@@ -146,8 +155,8 @@ def make_move(request):
                 # AI 수 기록
                 round_num += 1
                 ai_analysis = ""
-                if game.id in ai_instances:
-                    ai_analysis = ai_instances[game.id].get_move_analysis(board, ai_row, ai_col, 'white')
+                if ai:
+                    ai_analysis = ai.get_move_analysis(board, ai_row, ai_col, 'white')
                 
                 OmokMove.objects.create(
                     game=game,
@@ -199,10 +208,10 @@ def make_move(request):
 def process_ai_turn(game: OmokGame, board: List[List[str]]) -> Optional[Tuple[int, int]]:
     """AI 차례 처리"""
     try:
-        if game.id not in ai_instances:
+        ai = get_omok_ai(game)
+        if ai is None:
             return None
         
-        ai = ai_instances[game.id]
         ai_move = ai.get_best_move(board, 'white')
         
         return ai_move
@@ -218,28 +227,8 @@ def game_history(request):
 
 # 승리 조건 체크
 def check_winner(board, row, col, player):
-    """오목 승리 조건 체크"""
-    directions = [
-        [(0, 1), (0, -1)],   # 가로
-        [(1, 0), (-1, 0)],   # 세로
-        [(1, 1), (-1, -1)],  # 대각선 ↘↖
-        [(1, -1), (-1, 1)]   # 대각선 ↙↗
-    ]
-    
-    for dir_pair in directions:
-        count = 1  # 현재 위치 포함
-        
-        for dr, dc in dir_pair:
-            r, c = row + dr, col + dc
-            while 0 <= r < 15 and 0 <= c < 15 and board[r][c] == player:
-                count += 1
-                r += dr
-                c += dc
-        
-        if count >= 5:
-            return True
-    
-    return False
+    """오목 승리 조건 체크 (JSON 보드를 비트보드로 바꿔 시프트 AND로 검사)"""
+    return Bitboard.from_board(board).wins_at(row, col, player)
 
 @csrf_exempt
 @require_http_methods(["GET"])